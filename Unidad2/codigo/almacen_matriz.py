@@ -0,0 +1,156 @@
+import json
+import os
+import numpy as np
+from config import (
+    ARCHIVO_ALMACEN_MATRIZ,
+    TIPO_DATO_MATRIZ,
+    FACTOR_COMBUSTIBLE_POR_KM,
+    ENCODING_ARCHIVO
+)
+from generar_matriz_distancias import calcular_distancias_ubicaciones
+
+
+class AlmacenMatrizCostos:
+    # Matriz de costos combinada que se actualiza por tienda en lugar de
+    # regenerarse completa. Se guarda en un .npy de capacidad x capacidad
+    # (mas grande que el numero de ubicaciones) abierto mapeado en memoria;
+    # cada ubicacion ocupa una ranura (su fila y su columna) y un indice JSON
+    # junto al .npy guarda la ranura y coordenadas de cada nombre y las
+    # ranuras libres.
+    #   - ubicacion nueva: se calculan solo su fila y su columna, O(N)
+    #   - ubicacion retirada: su ranura queda libre para la siguiente, O(1)
+    #   - sin ranuras libres se duplica la capacidad (copia completa, rara)
+    # El costo de combustible de una ubicacion nueva se estima como
+    # distancia * factor_combustible (no hay datos de combustible para ella).
+
+    def __init__(self, archivo=ARCHIVO_ALMACEN_MATRIZ, tipo_dato=TIPO_DATO_MATRIZ):
+        self.archivo = archivo
+        self.archivo_indice = archivo + '.indice.json'
+        self.tipo_dato = np.dtype(tipo_dato).name
+        self.indice = None
+        self._matriz = None
+
+    def existe(self):
+        return os.path.exists(self.archivo) and os.path.exists(self.archivo_indice)
+
+    def _abrir(self):
+        if self.indice is None:
+            with open(self.archivo_indice, 'r', encoding=ENCODING_ARCHIVO) as f:
+                self.indice = json.load(f)
+            self._matriz = np.load(self.archivo, mmap_mode='r+')
+        return self._matriz
+
+    def _guardar_indice(self):
+        temporal = self.archivo_indice + '.tmp'
+        with open(temporal, 'w', encoding=ENCODING_ARCHIVO) as f:
+            json.dump(self.indice, f, indent=2)
+        os.replace(temporal, self.archivo_indice)
+
+    @staticmethod
+    def _ubicaciones(datos_df):
+        return (datos_df['Nombre'].astype(str).tolist(),
+                datos_df['Latitud_WGS84'].to_numpy(dtype=np.float64),
+                datos_df['Longitud_WGS84'].to_numpy(dtype=np.float64))
+
+    def inicializar(self, datos_df, distancias, combustible, factor_combustible=FACTOR_COMBUSTIBLE_POR_KM):
+        # Primera carga desde las matrices completas (filas en el orden de datos_df)
+        distancias = np.asarray(distancias, dtype=np.float64)
+        combustible = np.asarray(combustible, dtype=np.float64)
+        if factor_combustible is None:
+            # Mediana del combustible por km entre las ubicaciones existentes
+            con_distancia = distancias > 0
+            factor_combustible = (float(np.median(combustible[con_distancia] / distancias[con_distancia]))
+                                  if con_distancia.any() else 0.0)
+
+        nombres, latitudes, longitudes = self._ubicaciones(datos_df)
+        n = len(nombres)
+        capacidad = max(n + n // 4, 16)
+        temporal = self.archivo + '.tmp'
+        matriz = np.lib.format.open_memmap(temporal, mode='w+', dtype=self.tipo_dato,
+                                           shape=(capacidad, capacidad))
+        matriz[:n, :n] = distancias + combustible
+        matriz.flush()
+        del matriz
+        os.replace(temporal, self.archivo)
+
+        self.indice = {
+            'tipo_dato': self.tipo_dato,
+            'factor_combustible': factor_combustible,
+            'ubicaciones': {
+                nombre: {'ranura': ranura, 'latitud': float(latitudes[ranura]), 'longitud': float(longitudes[ranura])}
+                for ranura, nombre in enumerate(nombres)
+            },
+            'libres': list(range(n, capacidad))
+        }
+        self._guardar_indice()
+        self._matriz = np.load(self.archivo, mmap_mode='r+')
+
+    def _ampliar(self, necesarias):
+        # Nueva capacidad al menos el doble; las ranuras ocupadas conservan su lugar
+        matriz = self._abrir()
+        capacidad = len(matriz)
+        nueva_capacidad = max(2 * capacidad, capacidad + necesarias)
+        temporal = self.archivo + '.tmp'
+        ampliada = np.lib.format.open_memmap(temporal, mode='w+', dtype=matriz.dtype,
+                                             shape=(nueva_capacidad, nueva_capacidad))
+        ampliada[:capacidad, :capacidad] = matriz
+        ampliada.flush()
+        del ampliada
+        self._matriz = None
+        del matriz
+        os.replace(temporal, self.archivo)
+        self._matriz = np.load(self.archivo, mmap_mode='r+')
+        self.indice['libres'].extend(range(capacidad, nueva_capacidad))
+
+    def sincronizar(self, datos_df, metodo_distancias=None):
+        # Ajusta el almacen a las ubicaciones de datos_df (por nombre; si una
+        # cambio de coordenadas se recalcula). Devuelve el numero de
+        # ubicaciones (agregadas, retiradas, movidas)
+        self._abrir()
+        nombres, latitudes, longitudes = self._ubicaciones(datos_df)
+        ubicaciones = self.indice['ubicaciones']
+        actuales = set(nombres)
+
+        retiradas = [nombre for nombre in ubicaciones if nombre not in actuales]
+        nuevas = [
+            fila for fila, nombre in enumerate(nombres)
+            if nombre not in ubicaciones or
+            (ubicaciones[nombre]['latitud'], ubicaciones[nombre]['longitud']) !=
+            (float(latitudes[fila]), float(longitudes[fila]))
+        ]
+        movidas = [nombres[fila] for fila in nuevas if nombres[fila] in ubicaciones]
+        for nombre in retiradas + movidas:
+            self.indice['libres'].append(ubicaciones.pop(nombre)['ranura'])
+
+        if nuevas:
+            if len(nuevas) > len(self.indice['libres']):
+                self._ampliar(len(nuevas) - len(self.indice['libres']))
+            # Las ranuras mas bajas primero: la matriz usada se mantiene compacta
+            self.indice['libres'].sort(reverse=True)
+            for fila in nuevas:
+                ubicaciones[nombres[fila]] = {
+                    'ranura': self.indice['libres'].pop(),
+                    'latitud': float(latitudes[fila]),
+                    'longitud': float(longitudes[fila])
+                }
+
+            ranuras = np.array([ubicaciones[nombre]['ranura'] for nombre in nombres])
+            ranuras_nuevas = ranuras[nuevas]
+            salida, llegada = calcular_distancias_ubicaciones(
+                latitudes[nuevas], longitudes[nuevas], latitudes, longitudes, metodo=metodo_distancias
+            )
+            factor = 1.0 + self.indice['factor_combustible']
+            self._matriz[ranuras_nuevas[:, None], ranuras[None, :]] = salida * factor
+            self._matriz[ranuras[:, None], ranuras_nuevas[None, :]] = (llegada * factor).T
+            self._matriz[ranuras_nuevas, ranuras_nuevas] = 0.0
+            self._matriz.flush()
+
+        if nuevas or retiradas:
+            self._guardar_indice()
+        return len(nuevas) - len(movidas), len(retiradas), len(movidas)
+
+    def matriz(self, nombres):
+        # Matriz N x N en el orden de nombres (el de datos_df)
+        self._abrir()
+        ranuras = np.array([self.indice['ubicaciones'][str(nombre)]['ranura'] for nombre in nombres])
+        return np.array(self._matriz[np.ix_(ranuras, ranuras)], dtype=TIPO_DATO_MATRIZ)
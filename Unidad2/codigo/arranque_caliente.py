@@ -0,0 +1,107 @@
+import os
+import re
+from utils import ResultadosManager
+from heuristicas_constructivas import HeuristicasConstructivas
+from config import (
+    ARCHIVO_RESULTADOS,
+    ARCHIVO_RESULTADOS_JSON,
+    ENCODING_ARCHIVO,
+    COLUMNAS_ESPERADAS,
+    MOSTRAR_PROGRESO
+)
+
+
+class ArranqueCaliente:
+    # Rutas iniciales a partir de los resultados de una ejecucion anterior.
+    # La red cambia pocas tiendas por dia: se conserva el orden previo de las
+    # tiendas que siguen en la zona, se descartan las que ya no estan y las
+    # nuevas se agregan por insercion mas barata. El recocido parte de esa
+    # ruta con una temperatura baja.
+
+    PATRON_ZONA = re.compile(r'ZONA: (.*?)\n.*?Ruta: (.*?)\n', re.DOTALL)
+    SEPARADOR_RUTA = ' → '
+
+    @staticmethod
+    def archivo_por_defecto():
+        # El JSON de resultados si existe; si no, el reporte de texto
+        if os.path.exists(ARCHIVO_RESULTADOS_JSON):
+            return ARCHIVO_RESULTADOS_JSON
+        return ARCHIVO_RESULTADOS
+
+    @classmethod
+    def leer_rutas_archivo(cls, archivo=None):
+        # {nombre del centro: [nombres en orden de visita]} del JSON de
+        # resultados o, para archivos de texto, con la expresion regular
+        archivo = archivo or cls.archivo_por_defecto()
+        if archivo.endswith('.json'):
+            resultados = ResultadosManager.cargar_resultados_json(archivo)
+            if resultados is None:
+                return {}
+            return {zona['centro']: zona['ruta_nombres'] for zona in resultados['zonas']}
+        try:
+            with open(archivo, 'r', encoding=ENCODING_ARCHIVO) as f:
+                contenido = f.read()
+        except FileNotFoundError:
+            return {}
+        return {
+            centro.strip(): [nombre.strip() for nombre in ruta.split(cls.SEPARADOR_RUTA)]
+            for centro, ruta in cls.PATRON_ZONA.findall(contenido)
+        }
+
+    @staticmethod
+    def rutas_a_indices(rutas_nombres, datos_df):
+        # Traduce nombres a indices de nodo; los nombres que ya no existen se descartan
+        indice_por_nombre = {
+            nombre: indice for indice, nombre in enumerate(datos_df[COLUMNAS_ESPERADAS['nombre']])
+        }
+        rutas = {}
+        for centro, nombres in rutas_nombres.items():
+            if centro not in indice_por_nombre:
+                continue
+            rutas[indice_por_nombre[centro]] = [
+                indice_por_nombre[nombre] for nombre in nombres if nombre in indice_por_nombre
+            ]
+        return rutas
+
+    @classmethod
+    def reparar_ruta(cls, ruta_previa, centro_id, tiendas_ids, matriz_costos):
+        # Devuelve (ruta, conservadas, nuevas) con las tiendas actuales de la zona
+        tiendas = set(tiendas_ids)
+        vistas = set()
+        ruta = [centro_id]
+        for nodo in ruta_previa:
+            # El centro puede repetirse entre vehiculos si la ruta previa era CVRP
+            if nodo in tiendas and nodo not in vistas:
+                ruta.append(nodo)
+                vistas.add(nodo)
+        ruta.append(centro_id)
+        conservadas = len(vistas)
+
+        nuevas = sorted(tiendas - vistas)
+        for nodo in nuevas:
+            HeuristicasConstructivas.insertar_mas_barato(ruta, nodo, matriz_costos)
+        return ruta, conservadas, len(nuevas)
+
+    @classmethod
+    def preparar_rutas_iniciales(cls, tiendas_por_zona, datos_df, matriz_costos, archivo=None):
+        # tiendas_por_zona: {zona_id: [indices de tiendas]}. Devuelve
+        # {zona_id: ruta inicial} solo para las zonas con ruta previa.
+        archivo = archivo or cls.archivo_por_defecto()
+        if not os.path.exists(archivo):
+            print(f"    Arranque en caliente: no existe '{archivo}', se parte de rutas aleatorias")
+            return {}
+
+        rutas_previas = cls.rutas_a_indices(cls.leer_rutas_archivo(archivo), datos_df)
+        rutas_iniciales = {}
+        for zona_id, tiendas_ids in tiendas_por_zona.items():
+            if zona_id not in rutas_previas or not tiendas_ids:
+                continue
+            previas = sum(1 for nodo in rutas_previas[zona_id] if nodo != zona_id)
+            ruta, conservadas, nuevas = cls.reparar_ruta(
+                rutas_previas[zona_id], zona_id, tiendas_ids, matriz_costos
+            )
+            rutas_iniciales[zona_id] = ruta
+            if MOSTRAR_PROGRESO:
+                print(f"    Zona {zona_id + 1}: {conservadas} tiendas conservadas, "
+                      f"{previas - conservadas} retiradas, {nuevas} nuevas")
+        return rutas_iniciales
@@ -0,0 +1,81 @@
+import argparse
+import os
+import re
+import time
+import tempfile
+import numpy as np
+from generar_mapa_rutas_optimizadas import GeneradorMapaRutasOptimizadas
+from benchmark_optimizacion import generar_red
+
+# Compara los dos modos del mapa con redes sinteticas de distinto tamaño:
+# tamaño del HTML, segundos para construirlo y guardarlo, y objetos que
+# Leaflet crea al abrir la pagina (marcadores, polilineas y DivIcons), que es
+# lo que domina el tiempo de dibujo en el navegador. Uso:
+#   python benchmark_mapa.py [tiendas ...]
+
+TAMANOS_PRUEBA = [500, 2000, 5000]
+NUM_CENTROS_PRUEBA = 5
+
+
+def generar_rutas(datos_df, num_centros=NUM_CENTROS_PRUEBA):
+    # Cada tienda al centro mas cercano; dentro de la zona se visitan por angulo
+    coordenadas = datos_df[['Latitud_WGS84', 'Longitud_WGS84']].to_numpy()
+    centros, tiendas = coordenadas[:num_centros], coordenadas[num_centros:]
+    zona_de = np.argmin(((tiendas[:, None, :] - centros[None, :, :]) ** 2).sum(axis=2), axis=1)
+    rutas = {}
+    for zona in range(num_centros):
+        filas = np.flatnonzero(zona_de == zona)
+        angulos = np.arctan2(*(tiendas[filas] - centros[zona]).T)
+        nodos = (filas[np.argsort(angulos)] + num_centros).tolist()
+        rutas[zona] = {
+            'centro': datos_df['Nombre'].iloc[zona],
+            'num_tiendas': len(nodos),
+            'costo': 0.0,
+            'capacidad': int(datos_df['Capacidad_Venta'].iloc[nodos].sum()),
+            'ruta_completa': '',
+            'recorridos': [nodos],
+            'nodos': nodos
+        }
+    return rutas
+
+
+def medir(modo, datos_df, rutas, num_centros=NUM_CENTROS_PRUEBA):
+    generador = GeneradorMapaRutasOptimizadas(modo)
+    generador.datos_df = datos_df
+    generador.centros_distribucion = datos_df.iloc[:num_centros]
+    generador.tiendas = datos_df.iloc[num_centros:]
+    generador.rutas_optimizadas = rutas
+
+    with tempfile.TemporaryDirectory() as directorio:
+        archivo = os.path.join(directorio, 'mapa.html')
+        inicio = time.perf_counter()
+        generador.construir_mapa()
+        generador.mapa.save(archivo)
+        segundos = time.perf_counter() - inicio
+        with open(archivo, 'r', encoding='utf-8') as file:
+            html = file.read()
+
+    # En modo escalable los marcadores de tiendas se crean al abrir un grupo
+    # del cluster, asi que no aparecen aqui
+    objetos = len(re.findall(r'L\.(?:marker|circleMarker|polyline|divIcon)\(', html))
+    return len(html.encode('utf-8')) / 1e6, segundos, objetos
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de los modos del mapa de rutas')
+    parser.add_argument('tamanos', type=int, nargs='*', default=TAMANOS_PRUEBA,
+                        help='numero de tiendas de cada red sintetica')
+    tamanos = parser.parse_args().tamanos
+
+    print("=== BENCHMARK DEL MAPA DE RUTAS ===")
+    print(f"{'Tiendas':>8} {'Modo':<10} {'HTML (MB)':>10} {'Segundos':>9} {'Objetos Leaflet':>16}")
+    for num_tiendas in tamanos:
+        datos_df = generar_red(num_tiendas, NUM_CENTROS_PRUEBA)
+        rutas = generar_rutas(datos_df)
+        for modo in ('detallado', 'escalable'):
+            megabytes, segundos, objetos = medir(modo, datos_df, rutas)
+            print(f"{num_tiendas:>8} {modo:<10} {megabytes:>10.2f} {segundos:>9.2f} {objetos:>16,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+import argparse
+import json
+import os
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+import numpy as np
+import pandas as pd
+import config
+from route_optimizer import RouteOptimizer
+from utils import ResultadosManager
+from cota_inferior import CotaInferior
+from cache_matrices import CacheMatrizCostos
+from generar_matriz_distancias import calcular_matriz_haversine
+
+try:
+    from generar_mapa_rutas_optimizadas import GeneradorMapaRutasOptimizadas
+except ImportError:
+    # folium es opcional: sin el se omite la etapa del mapa
+    GeneradorMapaRutasOptimizadas = None
+
+# Mide el flujo completo de optimizacion con redes sinteticas de distinto
+# tamaño y guarda los tiempos por etapa y la calidad de las rutas en JSON,
+# para comparar entre versiones del codigo. Cada red se genera y se resuelve
+# en un directorio temporal, con los mismos nombres de archivo que main.py:
+#   carga              lectura de datos_distribucion_tiendas.xlsx
+#   matriz_sintetica   matriz de costos de prueba (haversine + combustible
+#                      sintetico); no es parte del flujo de main.py
+#   matriz_xlsx        DataLoader.cargar_matrices_costos en el primer arranque:
+#                      lee las matrices .xlsx y escribe la cache binaria
+#   matriz_cache       DataLoader.cargar_matrices_costos con la cache valida
+#   asignacion         separacion de ubicaciones y asignacion de zonas
+#   recocido           optimizar_rutas_por_zonas (con el detalle por zona)
+#   reporte            reporte de texto y JSON de resultados
+#   mapa               mapa HTML desde los resultados (requiere folium)
+# Escribir N x N celdas en Excel toma minutos con miles de ubicaciones: por
+# encima de UBICACIONES_MAXIMAS_XLSX no se mide matriz_xlsx y matriz_cache
+# carga la cache con CacheMatrizCostos directamente (la validez de la cache
+# solo revisa tamaño y fecha de las fuentes, no depende de su contenido). Uso:
+#   python benchmark_optimizacion.py --tamanos 100 1000 --tiempo-limite 60
+
+TAMANOS_PRUEBA = [100, 1000]
+NUM_CENTROS_PRUEBA = 10
+ARCHIVO_BENCHMARK = 'benchmark_optimizacion.json'
+UBICACIONES_MAXIMAS_XLSX = 500
+ETAPAS = ('carga', 'matriz_sintetica', 'matriz_xlsx', 'matriz_cache', 'asignacion',
+          'recocido', 'reporte', 'mapa')
+# Alrededor de las ubicaciones de datos_distribucion_tiendas.xlsx: 100
+# ubicaciones en ~0.2 grados por lado; el area crece con el numero de
+# ubicaciones para conservar la densidad
+LATITUD_BASE, LONGITUD_BASE = 24.8, -107.4
+GRADOS_POR_100_UBICACIONES = 0.2
+
+
+def generar_red(num_tiendas, num_centros=NUM_CENTROS_PRUEBA, semilla=0):
+    # Ubicaciones con el esquema de datos_distribucion_tiendas.xlsx; los centros van primero
+    generador = np.random.default_rng(semilla)
+    total = num_centros + num_tiendas
+    lado = GRADOS_POR_100_UBICACIONES * np.sqrt(total / 100)
+    return pd.DataFrame({
+        'Tipo': [config.TIPO_CENTRO_DISTRIBUCION] * num_centros + [config.TIPO_TIENDA] * num_tiendas,
+        'Nombre': [f'{config.TIPO_CENTRO_DISTRIBUCION} {i + 1}' for i in range(num_centros)] +
+                  [f'{config.TIPO_TIENDA} {i + 1}' for i in range(num_tiendas)],
+        'Latitud_WGS84': LATITUD_BASE + (generador.random(total) - 0.5) * lado,
+        'Longitud_WGS84': LONGITUD_BASE + (generador.random(total) - 0.5) * lado,
+        'Capacidad_Venta': generador.integers(5000, 27000, total),
+        'Capacidad_Almacenamiento': generador.integers(3000, 50000, total),
+        'Nivel_Tienda': [None] * num_centros + generador.choice(['A', 'B', 'C'], num_tiendas).tolist()
+    })
+
+
+def generar_matriz_costos(datos_df, semilla=0):
+    # Distancias haversine mas un costo de combustible simetrico proporcional
+    # a la distancia: entre 5% y 30% segun un factor aleatorio de cada extremo.
+    # Se opera en el lugar para no duplicar la matriz con 10000 ubicaciones
+    matriz = calcular_matriz_haversine(
+        datos_df['Latitud_WGS84'], datos_df['Longitud_WGS84'], tipo_dato=config.TIPO_DATO_MATRIZ
+    )
+    factores = np.random.default_rng(semilla).random(len(matriz))
+    combustible = np.add.outer(factores, factores).astype(matriz.dtype, copy=False)
+    combustible *= 0.125
+    combustible += 1.05
+    matriz *= combustible
+    return matriz
+
+
+def medir_carga_matriz(cargador, matriz, max_xlsx=UBICACIONES_MAXIMAS_XLSX):
+    # Segundos de la carga de produccion de la matriz ({etapa: segundos}) y
+    # la matriz cargada. Las fuentes se escriben fuera de la medicion
+    etapas = {}
+    if len(matriz) <= max_xlsx:
+        distancias = calcular_matriz_haversine(
+            cargador.datos_df['Latitud_WGS84'], cargador.datos_df['Longitud_WGS84']
+        )
+        pd.DataFrame(distancias).to_excel(config.ARCHIVO_MATRIZ_DISTANCIAS, index=False)
+        pd.DataFrame(matriz - distancias).to_excel(config.ARCHIVO_MATRIZ_COMBUSTIBLE, index=False)
+        for etapa in ('matriz_xlsx', 'matriz_cache'):
+            inicio = time.perf_counter()
+            if not cargador.cargar_matrices_costos():
+                return etapas, None
+            etapas[etapa] = time.perf_counter() - inicio
+        return etapas, cargador.costo_total_matrix
+
+    cache = CacheMatrizCostos([config.ARCHIVO_DATOS_TIENDAS], tipo_dato=config.TIPO_DATO_MATRIZ)
+    cache.guardar(matriz)
+    inicio = time.perf_counter()
+    cargada = cache.cargar(memoria_mapeada=config.MATRIZ_MEMORIA_MAPEADA)
+    etapas['matriz_cache'] = time.perf_counter() - inicio
+    return etapas, cargada
+
+
+def version_codigo():
+    # Commit actual (None fuera de un repositorio git)
+    try:
+        salida = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, check=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+        return salida.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def medir_red(num_tiendas, num_centros, semilla, opciones_recocido, con_mapa=True,
+              max_xlsx=UBICACIONES_MAXIMAS_XLSX):
+    etapas = {}
+    tamano_mapa_mb = None
+    directorio_original = os.getcwd()
+    with tempfile.TemporaryDirectory() as directorio:
+        os.chdir(directorio)
+        try:
+            datos_df = generar_red(num_tiendas, num_centros, semilla)
+            datos_df.to_excel(config.ARCHIVO_DATOS_TIENDAS, index=False)
+            optimizador = RouteOptimizer()
+            cargador = optimizador.data_loader
+
+            inicio = time.perf_counter()
+            if not cargador.cargar_datos_ubicaciones():
+                return None
+            etapas['carga'] = time.perf_counter() - inicio
+
+            inicio = time.perf_counter()
+            matriz = generar_matriz_costos(cargador.datos_df, semilla)
+            etapas['matriz_sintetica'] = time.perf_counter() - inicio
+
+            etapas_matriz, cargador.costo_total_matrix = medir_carga_matriz(cargador, matriz, max_xlsx)
+            etapas.update(etapas_matriz)
+            if cargador.costo_total_matrix is None:
+                return None
+            del matriz
+
+            inicio = time.perf_counter()
+            if not (cargador.separar_ubicaciones() and cargador.asignar_tiendas_a_zonas()):
+                return None
+            etapas['asignacion'] = time.perf_counter() - inicio
+
+            inicio = time.perf_counter()
+            resultados, costo_total = optimizador.optimizar_rutas_por_zonas(semilla=semilla, **opciones_recocido)
+            etapas['recocido'] = time.perf_counter() - inicio
+
+            inicio = time.perf_counter()
+            ResultadosManager.guardar_resultados_archivo(
+                resultados, costo_total, cargador.datos_df, segundos_total=optimizador.segundos_totales
+            )
+            etapas['reporte'] = time.perf_counter() - inicio
+
+            if con_mapa and GeneradorMapaRutasOptimizadas is not None:
+                inicio = time.perf_counter()
+                GeneradorMapaRutasOptimizadas().generar_mapa_completo()
+                etapas['mapa'] = time.perf_counter() - inicio
+                tamano_mapa_mb = os.path.getsize(config.ARCHIVO_MAPA) / 1e6
+        finally:
+            os.chdir(directorio_original)
+
+    zonas = []
+    for zona_id, resultado in resultados.items():
+        zonas.append({
+            'zona_id': int(zona_id),
+            'tiendas': int(resultado['tiendas_count']),
+            'costo': float(resultado['costo']),
+            'costo_inicial': resultado.get('costo_inicial'),
+            'segundos': resultado.get('segundos'),
+            'cota_inferior': resultado.get('cota_inferior'),
+            'brecha': CotaInferior.brecha(resultado['costo'], resultado.get('cota_inferior'))
+        })
+    cotas = [zona['cota_inferior'] for zona in zonas]
+    cota_total = sum(cotas) if zonas and None not in cotas else None
+    return {
+        'tiendas': num_tiendas,
+        'centros': num_centros,
+        'semilla': semilla,
+        'segundos_etapas': etapas,
+        # Arranque con la cache de la matriz valida, como el de main.py
+        'segundos_total': sum(segundos for etapa, segundos in etapas.items()
+                              if etapa not in ('matriz_sintetica', 'matriz_xlsx')),
+        'mapa_mb': tamano_mapa_mb,
+        'costo_total': float(costo_total),
+        'cota_inferior_total': cota_total,
+        'brecha_total': CotaInferior.brecha(costo_total, cota_total),
+        'zonas': zonas
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark del flujo de optimizacion de rutas')
+    parser.add_argument('--tamanos', type=int, nargs='+', default=TAMANOS_PRUEBA,
+                        help='numero de tiendas de cada red sintetica (100 a 10000)')
+    parser.add_argument('--centros', type=int, default=NUM_CENTROS_PRUEBA)
+    parser.add_argument('--semilla', type=int, default=0)
+    parser.add_argument('--tiempo-limite', type=float, default=None,
+                        help='segundos de recocido por red (por defecto TIEMPO_LIMITE_TOTAL)')
+    parser.add_argument('--modo-ejecucion', default='secuencial', choices=['secuencial', 'procesos'])
+    parser.add_argument('--sin-mapa', action='store_true')
+    parser.add_argument('--max-xlsx', type=int, default=UBICACIONES_MAXIMAS_XLSX,
+                        help='ubicaciones maximas para medir la carga desde las matrices .xlsx')
+    parser.add_argument('--salida', default=ARCHIVO_BENCHMARK)
+    argumentos = parser.parse_args()
+
+    opciones_recocido = {
+        'modo_ejecucion': argumentos.modo_ejecucion,
+        'tiempo_limite': argumentos.tiempo_limite
+    }
+    redes = []
+    for num_tiendas in argumentos.tamanos:
+        print(f"\n=== BENCHMARK: {num_tiendas} tiendas, {argumentos.centros} centros ===")
+        medicion = medir_red(num_tiendas, argumentos.centros, argumentos.semilla,
+                             opciones_recocido, con_mapa=not argumentos.sin_mapa,
+                             max_xlsx=argumentos.max_xlsx)
+        if medicion is None:
+            print(f"Error: no se pudo preparar la red de {num_tiendas} tiendas")
+            continue
+        redes.append(medicion)
+
+    resultados = {
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'commit': version_codigo(),
+        'parametros': {
+            'modo_ejecucion': argumentos.modo_ejecucion,
+            'tiempo_limite': argumentos.tiempo_limite,
+            'modo_cadenas': config.MODO_CADENAS,
+            'modo_ruteo': config.MODO_RUTEO,
+            'backend_recocido': config.BACKEND_RECOCIDO,
+            'heuristica_inicial': config.HEURISTICA_INICIAL,
+            'metodo_asignacion': config.METODO_ASIGNACION_ZONAS,
+            'usar_cache_matriz': config.USAR_CACHE_MATRIZ,
+            'actualizacion_incremental_matriz': config.ACTUALIZACION_INCREMENTAL_MATRIZ,
+            'max_xlsx': argumentos.max_xlsx
+        },
+        'redes': redes
+    }
+    with open(argumentos.salida, 'w', encoding=config.ENCODING_ARCHIVO) as f:
+        json.dump(resultados, f, ensure_ascii=False, indent=1)
+
+    print("\n=== RESUMEN ===")
+    print(f"{'Tiendas':>8} {'Costo':>12} {'Brecha':>8} " +
+          ' '.join(f"{etapa:>16}" for etapa in ETAPAS))
+    for red in redes:
+        brecha = '-' if red['brecha_total'] is None else f"{red['brecha_total']:.2%}"
+        tiempos = ' '.join(
+            f"{red['segundos_etapas'][etapa]:>16.2f}" if etapa in red['segundos_etapas'] else f"{'-':>16}"
+            for etapa in ETAPAS
+        )
+        print(f"{red['tiendas']:>8} {red['costo_total']:>12.2f} {brecha:>8} {tiempos}")
+    print(f"Resultados guardados en: {argumentos.salida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+import hashlib
+import json
+import os
+import numpy as np
+from config import ARCHIVO_CACHE_MATRIZ, ENCODING_ARCHIVO
+
+
+class CacheMatrizCostos:
+    # Cache binaria (.npy) de la matriz de costos combinada. Junto al .npy se
+    # guarda un archivo de metadatos con tamaño, fecha de modificacion y
+    # SHA-256 de cada archivo fuente; la cache solo es valida si las fuentes
+    # no cambiaron. La matriz puede abrirse mapeada en memoria (solo lectura)
+    # para compartirla entre procesos sin copiarla.
+
+    TAM_LECTURA_HASH = 1 << 20
+
+    def __init__(self, archivos_fuente, archivo_cache=None, tipo_dato='float64'):
+        self.archivos_fuente = list(archivos_fuente)
+        self.archivo_cache = archivo_cache or ARCHIVO_CACHE_MATRIZ
+        self.tipo_dato = np.dtype(tipo_dato).name
+        self.archivo_metadatos = self.archivo_cache + '.meta.json'
+
+    @classmethod
+    def calcular_hash(cls, ruta_archivo):
+        sha = hashlib.sha256()
+        with open(ruta_archivo, 'rb') as f:
+            for bloque in iter(lambda: f.read(cls.TAM_LECTURA_HASH), b''):
+                sha.update(bloque)
+        return sha.hexdigest()
+
+    @classmethod
+    def huella_archivo(cls, ruta_archivo, calcular_hash=True):
+        estado = os.stat(ruta_archivo)
+        huella = {
+            'tamano': estado.st_size,
+            'modificacion': estado.st_mtime_ns
+        }
+        if calcular_hash:
+            huella['sha256'] = cls.calcular_hash(ruta_archivo)
+        return huella
+
+    def _leer_metadatos(self):
+        try:
+            with open(self.archivo_metadatos, 'r', encoding=ENCODING_ARCHIVO) as f:
+                metadatos = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        return metadatos if isinstance(metadatos, dict) else None
+
+    def _escribir_metadatos(self, fuentes):
+        temporal = self.archivo_metadatos + '.tmp'
+        with open(temporal, 'w', encoding=ENCODING_ARCHIVO) as f:
+            json.dump({'tipo_dato': self.tipo_dato, 'fuentes': fuentes}, f, indent=2)
+        os.replace(temporal, self.archivo_metadatos)
+
+    def es_valida(self):
+        metadatos = self._leer_metadatos()
+        if metadatos is None or not os.path.exists(self.archivo_cache):
+            return False
+        if metadatos.get('tipo_dato') != self.tipo_dato:
+            return False
+
+        fuentes_guardadas = metadatos.get('fuentes')
+        if not isinstance(fuentes_guardadas, dict) or set(fuentes_guardadas) != set(self.archivos_fuente):
+            return False
+
+        fechas_actualizadas = False
+        for ruta_archivo in self.archivos_fuente:
+            guardada = fuentes_guardadas[ruta_archivo]
+            # Metadatos incompletos (escritos a mano o por otra version): se regenera
+            if not isinstance(guardada, dict) or not {'tamano', 'modificacion', 'sha256'} <= set(guardada):
+                return False
+            actual = self.huella_archivo(ruta_archivo, calcular_hash=False)
+
+            # Mismo tamaño y fecha: no hace falta leer el archivo
+            if (actual['tamano'] == guardada['tamano'] and
+                    actual['modificacion'] == guardada['modificacion']):
+                continue
+
+            # La fecha cambio pero el contenido puede ser el mismo (copia, checkout)
+            if (actual['tamano'] != guardada['tamano'] or
+                    self.calcular_hash(ruta_archivo) != guardada['sha256']):
+                return False
+
+            guardada.update(actual)
+            fechas_actualizadas = True
+
+        if fechas_actualizadas:
+            self._escribir_metadatos(fuentes_guardadas)
+        return True
+
+    def cargar(self, memoria_mapeada=False):
+        if not self.es_valida():
+            return None
+        try:
+            return np.load(self.archivo_cache, mmap_mode='r' if memoria_mapeada else None)
+        except (OSError, ValueError):
+            return None
+
+    def guardar(self, matriz):
+        # Escritura atomica: primero a un temporal y luego se reemplaza
+        temporal = self.archivo_cache + '.tmp'
+        with open(temporal, 'wb') as f:
+            np.save(f, np.asarray(matriz, dtype=self.tipo_dato))
+        os.replace(temporal, self.archivo_cache)
+
+        fuentes = {
+            ruta_archivo: self.huella_archivo(ruta_archivo)
+            for ruta_archivo in self.archivos_fuente
+        }
+        self._escribir_metadatos(fuentes)
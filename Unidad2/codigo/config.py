@@ -3,6 +3,71 @@ ARCHIVO_DATOS_TIENDAS = 'datos_distribucion_tiendas.xlsx'
 ARCHIVO_MATRIZ_DISTANCIAS = 'matriz_distancias.xlsx'
 ARCHIVO_MATRIZ_COMBUSTIBLE = 'matriz_costos_combustible.xlsx'
 ARCHIVO_RESULTADOS = 'resultados_optimizacion_zonas.txt'
+# Los mismos resultados en JSON (indices de nodo, costos y tiempos) para el
+# mapa y el arranque en caliente; se escribe junto al reporte de texto
+ARCHIVO_RESULTADOS_JSON = 'resultados_optimizacion_zonas.json'
+
+# Cache binaria de la matriz de costos combinada; se regenera solo cuando
+# cambian los archivos .xlsx de origen
+USAR_CACHE_MATRIZ = True
+ARCHIVO_CACHE_MATRIZ = 'costo_total_matrix.npy'
+# Abrir la matriz mapeada en memoria (solo lectura) desde el archivo de cache:
+# no se carga completa en RAM y los procesos trabajadores comparten sus paginas
+MATRIZ_MEMORIA_MAPEADA = False
+# 'float64' o 'float32' (la mitad de memoria)
+TIPO_DATO_MATRIZ = 'float64'
+# Actualizacion incremental: la matriz combinada vive en ARCHIVO_ALMACEN_MATRIZ
+# (una ranura por ubicacion, indice en ARCHIVO_ALMACEN_MATRIZ + '.indice.json').
+# Se crea una vez desde los .xlsx; despues, al cargar los datos, solo se
+# calculan la fila y columna de las tiendas nuevas (con METODO_DISTANCIAS) y se
+# liberan las de las retiradas, sin volver a generar ni leer los .xlsx.
+# Solo en MODO_COSTOS 'estatico'; reemplaza a la cache y a la matriz mapeada
+ACTUALIZACION_INCREMENTAL_MATRIZ = False
+ARCHIVO_ALMACEN_MATRIZ = 'almacen_costos.npy'
+# Combustible por km de las tiendas nuevas (None = mediana de la matriz de
+# combustible con que se creo el almacen)
+FACTOR_COMBUSTIBLE_POR_KM = None
+
+# Distancias de matriz_distancias.xlsx (generar_matriz_distancias.py):
+#   'haversine'  linea recta sobre la esfera
+#   'red_vial'   camino mas corto por calles en un extracto local de
+#                OpenStreetMap (ARCHIVO_RED_VIAL, .osm en XML); sin conexion a
+#                internet. El grafo leido se guarda en ARCHIVO_RED_VIAL + '.npz'
+METODO_DISTANCIAS = 'haversine'
+ARCHIVO_RED_VIAL = 'red_vial.osm'
+# Valores de la etiqueta highway de OSM que se consideran calles transitables
+TIPOS_VIA_RED_VIAL = [
+    'motorway', 'motorway_link', 'trunk', 'trunk_link', 'primary', 'primary_link',
+    'secondary', 'secondary_link', 'tertiary', 'tertiary_link',
+    'unclassified', 'residential', 'living_street', 'service', 'road'
+]
+# Origenes por cada Dijkstra en bloque: cada bloque usa una matriz temporal de
+# FUENTES_POR_BLOQUE_DIJKSTRA x nodos del grafo (los procesos son NUM_PROCESOS)
+FUENTES_POR_BLOQUE_DIJKSTRA = 32
+
+# Costos que minimiza el recocido:
+#   'estatico'  matriz de costos combinada (distancias + combustible)
+#   'horario'   minutos de viaje segun la hora de salida de cada arista: tensor
+#               franjas x N x N en ARCHIVO_TENSOR_HORARIO (puede ser asimetrico).
+#               Si no existe o matriz_distancias.xlsx es mas reciente se genera
+#               con VELOCIDADES_POR_FRANJA (km/h, una por franja). Solo en modo de ruteo 'tsp'
+MODO_COSTOS = 'estatico'
+ARCHIVO_TENSOR_HORARIO = 'tiempos_por_franja.npy'
+TIPO_DATO_TENSOR_HORARIO = 'float32'
+MINUTOS_POR_FRANJA = 60
+VELOCIDADES_POR_FRANJA = [
+    50, 50, 50, 50, 50, 45,   # 00:00 - 05:59
+    35, 20, 20, 30, 35, 35,   # 06:00 - 11:59
+    30, 30, 35, 35, 30, 20,   # 12:00 - 17:59
+    20, 30, 40, 45, 50, 50    # 18:00 - 23:59
+]
+# Hora de salida desde el centro y minutos de servicio en cada tienda
+HORA_SALIDA = 7.0
+MINUTOS_SERVICIO_TIENDA = 15
+# Franjas del tensor que se mantienen en memoria a la vez (el resto se lee
+# del archivo mapeado cuando se necesita). Conviene que cubra las horas que
+# dura una ruta; si no, las franjas se vuelven a leer durante el recocido
+FRANJAS_EN_MEMORIA = 8
 
 # Parámetros del algoritmo de recocido simulado
 TEMPERATURA_INICIAL = 5000
@@ -10,6 +75,154 @@ TASA_ENFRIAMIENTO = 0.995
 TEMP_FINAL = 0.001
 L_ITERACIONES = 50
 
+# Programa de enfriamiento
+# Calibrar la temperatura inicial de cada zona con una muestra de movimientos:
+# T0 tal que el empeoramiento promedio se acepte con ACEPTACION_INICIAL_OBJETIVO.
+# Activado, TEMPERATURA_INICIAL (y temp_inicial de optimizar_rutas_por_zonas)
+# solo se usa en zonas donde no se puede calibrar
+CALIBRAR_TEMPERATURA_INICIAL = False
+ACEPTACION_INICIAL_OBJETIVO = 0.8
+MUESTRAS_CALIBRACION = 200
+# Enfriamiento adaptativo segun la tasa de aceptacion de cada nivel:
+#   > ACEPTACION_ALTA          TASA_ENFRIAMIENTO^FACTOR_ENFRIAMIENTO_RAPIDO
+#   entre BAJA y ALTA          TASA_ENFRIAMIENTO^FACTOR_ENFRIAMIENTO_LENTO
+#   < ACEPTACION_BAJA          TASA_ENFRIAMIENTO
+# Activado, TASA_ENFRIAMIENTO (y tasa_enfriamiento de optimizar_rutas_por_zonas)
+# solo es la tasa exacta en los niveles con aceptacion baja
+ENFRIAMIENTO_ADAPTATIVO = False
+ACEPTACION_ALTA = 0.8
+ACEPTACION_BAJA = 0.02
+FACTOR_ENFRIAMIENTO_RAPIDO = 4
+FACTOR_ENFRIAMIENTO_LENTO = 0.5
+# Terminar la zona tras N niveles de temperatura sin nueva mejor solucion (0 = nunca)
+PASOS_SIN_MEJORA_MAX = 300
+
+# Evaluacion incremental del costo (delta de las aristas afectadas)
+# Cada cuantos movimientos aplicados se recalcula el costo completo (0 = nunca)
+INTERVALO_VERIFICACION_COSTO = 0
+TOLERANCIA_VERIFICACION_COSTO = 1e-6
+
+# Operadores de vecindario disponibles: 'swap', '2opt', 'or_opt', '3opt'
+OPERADORES_VECINDARIO = ['2opt', 'or_opt', 'swap', '3opt']
+# Seleccion adaptativa: favorece los operadores que produjeron mejoras recientes
+SELECCION_ADAPTATIVA_OPERADORES = True
+FACTOR_REACCION_OPERADORES = 0.1
+PESO_MINIMO_OPERADOR = 0.05
+# Listas de candidatos: los movimientos solo conectan cada tienda con sus k
+# vecinos de menor costo (0 = movimientos aleatorios sin restriccion).
+# Se usan en zonas con mas de 2k tiendas
+NUM_VECINOS_CANDIDATOS = 10
+
+# Ruta inicial de cada zona:
+#   'aleatoria'         permutacion aleatoria de las tiendas
+#   'vecino_cercano'    siempre a la tienda no visitada mas barata
+#   'insercion_barata'  inserta la tienda con la insercion mas barata
+#   'insercion_lejana'  inserta primero la tienda mas alejada de la ruta
+#   'arista_voraz'      aristas de menor costo sin grado 3 ni subciclos
+HEURISTICA_INICIAL = 'aleatoria'
+# Con una ruta construida la temperatura inicial se calibra para aceptar solo
+# esta fraccion de los movimientos que empeoran, para no deshacer la ruta
+ACEPTACION_HEURISTICA_INICIAL = 0.3
+
+# Cota inferior del costo optimo de cada zona (Held-Karp con subgradiente;
+# arbol de expansion minima en modo cvrp) para reportar la brecha de optimalidad
+CALCULAR_COTA_INFERIOR = True
+ITERACIONES_COTA_INFERIOR = 100
+# Cada iteracion del subgradiente es un arbol de expansion minima O(n^2); en
+# zonas con mas tiendas que esto la cota 'tsp' es un solo 1-arbol (mas floja)
+TIENDAS_MAXIMAS_COTA_HELD_KARP = 300
+# Detener el recocido de una zona cuando (costo - cota) / cota <= BRECHA_PARADA
+# (p. ej. 0.01 = 1%; None = no detener). Solo en modo de ruteo 'tsp'
+BRECHA_PARADA = None
+
+# Zonas (y vehiculos en modo cvrp) con hasta este numero de tiendas se
+# resuelven de forma exacta con Held-Karp en lugar de recocido (0 = nunca).
+# Memoria y tiempo crecen como 2^n: 15 tiendas toman unos 40 ms y 4 MB
+UMBRAL_SOLUCION_EXACTA = 15
+
+# Implementacion del bucle interno del recocido:
+#   'python'     listas de Python (sin dependencias adicionales)
+#   'compilado'  ruta en arreglo int32 y nucleo compilado con Numba; sin Numba
+#                el mismo nucleo corre en Python puro con resultados identicos
+BACKEND_RECOCIDO = 'python'
+
+# Ejecucion de las zonas: 'secuencial' o 'procesos' (una zona por proceso).
+# 'procesos' levanta un pool, un Manager y memoria compartida: conviene con
+# muchas zonas grandes, no con la muestra de 100 ubicaciones
+MODO_EJECUCION = 'secuencial'
+NUM_PROCESOS = None  # None = todos los nucleos disponibles
+# Cadenas de recocido por zona:
+#   'simple'            una cadena
+#   'multiarranque'     NUM_CADENAS cadenas independientes (repartidas entre procesos), se conserva la mejor
+#   'templado_paralelo' NUM_CADENAS replicas con temperaturas T, T*r, T*r^2... que intercambian rutas
+MODO_CADENAS = 'simple'
+NUM_CADENAS = 4
+RAZON_TEMPERATURAS_REPLICAS = 0.5
+
+# Arranque en caliente: cada zona parte de su ruta en los resultados previos
+# (ARCHIVO_RUTAS_PREVIAS, por defecto ARCHIVO_RESULTADOS_JSON o, si no existe,
+# ARCHIVO_RESULTADOS) sin las tiendas retiradas y con las nuevas por insercion
+# mas barata. La temperatura inicial se calibra para aceptar solo
+# ACEPTACION_ARRANQUE_CALIENTE de los movimientos que empeoran. Solo en modo de ruteo 'tsp'.
+ARRANQUE_CALIENTE = False
+ARCHIVO_RUTAS_PREVIAS = None
+ACEPTACION_ARRANQUE_CALIENTE = 0.1
+
+# Limite de tiempo de reloj en segundos (None = sin limite). El total se
+# reparte entre zonas en proporcion a sus tiendas; al vencer el plazo cada
+# zona devuelve la mejor ruta encontrada. Con limite de tiempo el resultado
+# deja de ser reproducible aunque haya semilla.
+TIEMPO_LIMITE_TOTAL = None
+TIEMPO_LIMITE_ZONA = None
+# Minimo de segundos entre eventos de progreso de una misma cadena
+INTERVALO_PROGRESO_SEGUNDOS = 0.5
+# Estadisticas del recocido de cada zona (EstadisticasRecocido): movimientos
+# propuestos, aceptados, aceptados que empeoran y mejoras, segundos por nivel
+# de temperatura y trayectoria del costo. Se guardan por zona en
+# ARCHIVO_RESULTADOS_JSON. Solo en modo de ruteo 'tsp' con una cadena o
+# multiarranque (las de la mejor cadena)
+ESTADISTICAS_RECOCIDO = False
+# La trayectoria guarda uno de cada N niveles (0 = solo los totales)
+MUESTREO_ESTADISTICAS = 10
+
+# Modo de ruteo:
+#   'tsp'   una sola ruta por zona
+#   'cvrp'  varios vehiculos por zona sin exceder CAPACIDAD_VEHICULO (suma de
+#           Capacidad_Venta de sus tiendas): ahorros de Clarke-Wright + recocido
+MODO_RUTEO = 'tsp'
+CAPACIDAD_VEHICULO = 100000
+# Vecinos cercanos por tienda considerados al calcular los ahorros
+VECINOS_AHORROS_CVRP = 40
+# Temperatura inicial de los recocidos que parten de las rutas de ahorros
+# (entre vehiculos y dentro de cada vehiculo)
+TEMP_INICIAL_MEJORA_CVRP = 10
+# Semilla para resultados reproducibles (None = aleatorio en cada ejecucion)
+SEMILLA_ALEATORIA = None
+
+# Asignacion de tiendas a zonas:
+#   'proximidad'  centro mas cercano en latitud/longitud
+#   'balanceada'  minimo costo real (costo_total_matrix) con un tope de
+#                 Capacidad_Venta por centro de
+#                 capacidad_total/centros * (1 + TOLERANCIA_BALANCE_ZONAS)
+METODO_ASIGNACION_ZONAS = 'proximidad'
+TOLERANCIA_BALANCE_ZONAS = 0.15
+
+# Mapa de rutas (generar_mapa_rutas_optimizadas.py):
+#   'detallado'  marcador numerado por tienda, segmentos punteados y flechas
+#   'escalable'  para miles de tiendas: una capa GeoJSON por zona con la ruta
+#                simplificada segun el zoom, tiendas agrupadas con MarkerCluster
+#                y dibujo en canvas
+MODO_MAPA = 'detallado'
+ARCHIVO_MAPA = 'mapa_rutas_optimizadas.html'
+# Zooms en que cambia el detalle de las rutas del modo 'escalable'. En cada
+# rango la ruta se simplifica (Douglas-Peucker) para desviarse a lo mas
+# TOLERANCIA_PIXELES_MAPA pixeles al zoom mayor del rango; desde el ultimo
+# corte se dibuja completa
+CORTES_ZOOM_RUTAS = [8, 11, 14]
+TOLERANCIA_PIXELES_MAPA = 1.5
+# Decimales de las coordenadas en el HTML (5 = aprox. 1 m)
+DECIMALES_COORDENADAS_MAPA = 5
+
 # Configuración de salida
 MOSTRAR_PROGRESO = True
 PROGRESO_CADA_PORCENTAJE = 25
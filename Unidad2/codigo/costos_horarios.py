@@ -0,0 +1,128 @@
+import os
+from collections import OrderedDict
+import numpy as np
+from config import (
+    ARCHIVO_TENSOR_HORARIO,
+    TIPO_DATO_TENSOR_HORARIO,
+    MINUTOS_POR_FRANJA,
+    HORA_SALIDA,
+    MINUTOS_SERVICIO_TIENDA,
+    FRANJAS_EN_MEMORIA
+)
+
+
+class CostosPorHora:
+    # Minutos de viaje entre ubicaciones segun la franja horaria de salida:
+    # tensor (franjas x N x N) guardado como .npy y abierto mapeado en memoria.
+    # Solo las franjas consultadas se copian a RAM y se conservan como mucho
+    # franjas_en_memoria a la vez (las menos usadas recientemente se liberan),
+    # asi la memoria queda acotada a franjas_en_memoria * N * N valores.
+    # Las franjas pueden ser asimetricas y el dia es ciclico: despues de la
+    # ultima franja vuelve la primera.
+    # El reloj de una ruta parte del centro a hora_salida; en cada tienda se
+    # suman minutos_servicio antes de salir hacia la siguiente. El costo de la
+    # ruta es la suma de los minutos de viaje (sin el tiempo de servicio).
+
+    def __init__(self, archivo=ARCHIVO_TENSOR_HORARIO, minutos_por_franja=MINUTOS_POR_FRANJA,
+                 hora_salida=HORA_SALIDA, minutos_servicio=MINUTOS_SERVICIO_TIENDA,
+                 franjas_en_memoria=FRANJAS_EN_MEMORIA):
+        self.archivo = archivo
+        self.minutos_por_franja = minutos_por_franja
+        self.minuto_salida = hora_salida * 60
+        self.minutos_servicio = minutos_servicio
+        self.franjas_en_memoria = max(1, franjas_en_memoria)
+        self._abrir()
+
+    def _abrir(self):
+        self._tensor = np.load(self.archivo, mmap_mode='r')
+        if self._tensor.ndim != 3 or self._tensor.shape[1] != self._tensor.shape[2]:
+            raise ValueError(f"Tensor horario con forma invalida: {self._tensor.shape}")
+        self.num_franjas = self._tensor.shape[0]
+        self._franjas = OrderedDict()
+
+    def __getstate__(self):
+        # Los procesos trabajadores reciben la ruta del archivo y lo vuelven a
+        # mapear; las franjas cargadas no se copian
+        estado = self.__dict__.copy()
+        del estado['_tensor'], estado['_franjas']
+        return estado
+
+    def __setstate__(self, estado):
+        self.__dict__.update(estado)
+        self._abrir()
+
+    @property
+    def num_ubicaciones(self):
+        return self._tensor.shape[1]
+
+    def indice_franja(self, minuto):
+        # minuto: minutos desde la medianoche del primer dia
+        return int(minuto // self.minutos_por_franja) % self.num_franjas
+
+    def franja(self, indice):
+        # Matriz N x N de la franja, leida del archivo la primera vez (con el
+        # tipo de dato del tensor; quien la usa convierte cada valor con float())
+        matriz = self._franjas.get(indice)
+        if matriz is None:
+            matriz = np.array(self._tensor[indice])
+            self._franjas[indice] = matriz
+            if len(self._franjas) > self.franjas_en_memoria:
+                self._franjas.popitem(last=False)
+        else:
+            self._franjas.move_to_end(indice)
+        return matriz
+
+    def tiempo_arista(self, origen, destino, minuto):
+        return float(self.franja(self.indice_franja(minuto))[origen, destino])
+
+    def llegadas(self, ruta):
+        # Minuto de llegada a cada posicion de la ruta (la primera es la salida)
+        minuto = self.minuto_salida
+        llegadas = [minuto]
+        for p in range(len(ruta) - 1):
+            if p > 0:
+                minuto += self.minutos_servicio
+            minuto += self.tiempo_arista(ruta[p], ruta[p + 1], minuto)
+            llegadas.append(minuto)
+        return llegadas
+
+    def costo_ruta(self, ruta):
+        if len(ruta) < 2:
+            return 0.0
+        servicio = self.minutos_servicio * (len(ruta) - 2)
+        return self.llegadas(ruta)[-1] - self.minuto_salida - servicio
+
+    def subtensor(self, nodos):
+        # Todas las franjas restringidas a pocos nodos (franjas x m x m)
+        nodos = np.asarray(nodos)
+        return np.array(self._tensor[:, nodos[:, None], nodos[None, :]], dtype=np.float64)
+
+    def matriz_referencia(self):
+        # Franja de la hora de salida: para heuristicas, candidatos y simetria
+        return self.franja(self.indice_franja(self.minuto_salida))
+
+    def minimo_por_arista(self):
+        # Minimo de cada arista sobre todas las franjas (cota inferior valida
+        # del costo de cualquier ruta). Se recorre franja por franja.
+        minimo = np.array(self._tensor[0], dtype=np.float64)
+        for indice in range(1, self.num_franjas):
+            np.minimum(minimo, self._tensor[indice], out=minimo)
+        return minimo
+
+    @staticmethod
+    def generar_desde_distancias(distancias_km, velocidades_kmh, archivo=ARCHIVO_TENSOR_HORARIO,
+                                 tipo_dato=TIPO_DATO_TENSOR_HORARIO):
+        # Sin datos de trafico por hora: minutos = km / velocidad de la franja.
+        # Se escribe franja por franja sobre el .npy mapeado y luego se
+        # reemplaza el archivo, sin tener el tensor completo en memoria.
+        distancias_km = np.asarray(distancias_km, dtype=np.float64)
+        n = len(distancias_km)
+        temporal = archivo + '.tmp'
+        tensor = np.lib.format.open_memmap(
+            temporal, mode='w+', dtype=tipo_dato, shape=(len(velocidades_kmh), n, n)
+        )
+        for indice, velocidad in enumerate(velocidades_kmh):
+            tensor[indice] = distancias_km * (60.0 / velocidad)
+        tensor.flush()
+        del tensor
+        os.replace(temporal, archivo)
@@ -0,0 +1,122 @@
+import numpy as np
+from heuristicas_constructivas import HeuristicasConstructivas
+from config import ITERACIONES_COTA_INFERIOR, TIENDAS_MAXIMAS_COTA_HELD_KARP
+
+
+class CotaInferior:
+    # Cotas inferiores del costo optimo de una zona, para medir la brecha
+    # de optimalidad de la ruta encontrada.
+    # La matriz puede ser asimetrica: una ruta usa cada arista en un solo
+    # sentido, asi que con c(i, j) = min(c_ij, c_ji) cualquier cota del
+    # problema simetrico lo es tambien del original.
+
+    @staticmethod
+    def _costos_simetricos(matriz_costos, nodos):
+        costos = HeuristicasConstructivas.submatriz(matriz_costos, nodos)
+        return np.minimum(costos, costos.T)
+
+    @staticmethod
+    def arbol_expansion_minima(costos):
+        # Prim sobre la matriz densa: devuelve (peso, grado de cada nodo)
+        n = len(costos)
+        grados = np.zeros(n, dtype=np.int64)
+        if n <= 1:
+            return 0.0, grados
+        en_arbol = np.zeros(n, dtype=bool)
+        en_arbol[0] = True
+        distancia = costos[0].copy()
+        distancia[0] = np.inf
+        padre = np.zeros(n, dtype=np.int64)
+        peso = 0.0
+        for _ in range(n - 1):
+            j = int(np.argmin(distancia))
+            peso += distancia[j]
+            grados[j] += 1
+            grados[padre[j]] += 1
+            en_arbol[j] = True
+            distancia[j] = np.inf
+            actualizar = ~en_arbol & (costos[j] < distancia)
+            distancia[actualizar] = costos[j][actualizar]
+            padre[actualizar] = j
+        return float(peso), grados
+
+    @classmethod
+    def uno_arbol(cls, costos):
+        # Arbol de expansion minima sobre las tiendas mas las dos aristas mas
+        # baratas del centro (nodo 0). Toda ruta es un 1-arbol, y un 1-arbol
+        # con todos los grados en 2 es una ruta.
+        peso, grados_tiendas = cls.arbol_expansion_minima(costos[1:, 1:])
+        dos_menores = np.argpartition(costos[0, 1:], 1)[:2]
+        grados = np.zeros(len(costos), dtype=np.int64)
+        grados[1:] = grados_tiendas
+        grados[0] = 2
+        grados[dos_menores + 1] += 1
+        return peso + float(costos[0, 1:][dos_menores].sum()), grados
+
+    @classmethod
+    def held_karp(cls, costos, cota_superior, iteraciones=ITERACIONES_COTA_INFERIOR):
+        # Cota de Held-Karp: maximiza con subgradiente sobre las penalizaciones
+        # pi el valor del 1-arbol minimo con costos c_ij + pi_i + pi_j menos
+        # 2 * sum(pi). El paso es lambda * (cota_superior - L) / |g|^2 con
+        # g = grados - 2, y lambda se reduce a la mitad cuando la cota deja de
+        # subir durante varias iteraciones.
+        m = len(costos)
+        penalizaciones = np.zeros(m)
+        # Un solo buffer para los costos penalizados de todas las iteraciones
+        penalizados = np.empty_like(costos, dtype=np.float64)
+        mejor = -np.inf
+        paso = 2.0
+        sin_mejora = 0
+        for _ in range(iteraciones):
+            np.add(costos, penalizaciones[:, None], out=penalizados)
+            np.add(penalizados, penalizaciones[None, :], out=penalizados)
+            peso, grados = cls.uno_arbol(penalizados)
+            cota = peso - 2 * penalizaciones.sum()
+            if cota > mejor + 1e-9:
+                mejor = cota
+                sin_mejora = 0
+            else:
+                sin_mejora += 1
+                if sin_mejora >= 5:
+                    paso /= 2
+                    sin_mejora = 0
+            subgradiente = grados - 2
+            norma = float(subgradiente @ subgradiente)
+            # Todos los grados en 2: el 1-arbol es una ruta optima
+            if norma == 0 or paso < 1e-6:
+                break
+            penalizaciones += paso * max(cota_superior - cota, 0.0) / norma * subgradiente
+        return mejor
+
+    @classmethod
+    def calcular(cls, matriz_costos, centro_id, tiendas_ids, modo_ruteo='tsp',
+                 iteraciones=ITERACIONES_COTA_INFERIOR):
+        # 'tsp': cota de Held-Karp de la ruta unica de la zona.
+        # 'cvrp': peso del arbol de expansion minima; los vehiculos forman un
+        # recorrido conexo que pasa varias veces por el centro, asi que el
+        # 1-arbol no aplica pero el arbol si.
+        nodos = [centro_id] + list(tiendas_ids)
+        if len(nodos) <= 1:
+            return 0.0
+        if modo_ruteo == 'tsp' and len(nodos) <= 3:
+            # Con una o dos tiendas la ruta es unica salvo el sentido
+            costos = HeuristicasConstructivas.submatriz(matriz_costos, nodos)
+            orden = list(range(len(nodos))) + [0]
+            return float(min(costos[orden[:-1], orden[1:]].sum(),
+                             costos[orden[1:], orden[:-1]].sum()))
+        costos = cls._costos_simetricos(matriz_costos, nodos)
+        if modo_ruteo == 'cvrp':
+            return cls.arbol_expansion_minima(costos)[0]
+        if len(tiendas_ids) > TIENDAS_MAXIMAS_COTA_HELD_KARP:
+            # Zona grande: un solo 1-arbol sin penalizaciones en lugar del subgradiente
+            return cls.uno_arbol(costos)[0]
+        orden = HeuristicasConstructivas.vecino_mas_cercano(costos) + [0]
+        cota_superior = float(costos[orden[:-1], orden[1:]].sum())
+        return max(cls.held_karp(costos, cota_superior, iteraciones), 0.0)
+
+    @staticmethod
+    def brecha(costo, cota):
+        # (costo - cota) / cota; None si no hay cota util
+        if cota is None or cota <= 0:
+            return None
+        return max(costo - cota, 0.0) / cota
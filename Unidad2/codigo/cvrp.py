@@ -0,0 +1,249 @@
+import math
+import random
+import time
+import numpy as np
+from simulated_annealing import SimulatedAnnealing
+from vecinos_candidatos import calcular_vecinos_candidatos
+from config import (
+    MOSTRAR_PROGRESO,
+    COLUMNAS_ESPERADAS,
+    VECINOS_AHORROS_CVRP,
+    TEMP_INICIAL_MEJORA_CVRP
+)
+
+
+class RuteoCapacitado:
+    # Ruteo con varios vehiculos de capacidad limitada por zona (CVRP).
+    # 1. Construccion por ahorros de Clarke-Wright.
+    # 2. Recocido entre rutas: reubicar o intercambiar tiendas entre vehiculos
+    #    respetando la capacidad (delta y capacidad en O(1)).
+    # 3. Recocido corto y frio dentro de cada ruta con los operadores de
+    #    SimulatedAnnealing (las rutas ya parten de una buena solucion).
+    # La solucion se devuelve como una sola ruta que vuelve al centro entre
+    # vehiculos: [c, t1, t2, c, t3, t4, c].
+
+    @staticmethod
+    def separar_rutas(ruta_concatenada, centro_id):
+        # [c, a, b, c, d, c] -> [[c, a, b, c], [c, d, c]]
+        rutas = []
+        actual = [centro_id]
+        for nodo in ruta_concatenada[1:]:
+            actual.append(nodo)
+            if nodo == centro_id:
+                if len(actual) > 2:
+                    rutas.append(actual)
+                actual = [centro_id]
+        return rutas
+
+    @staticmethod
+    def unir_rutas(rutas, centro_id):
+        ruta_concatenada = [centro_id]
+        for ruta in rutas:
+            ruta_concatenada.extend(ruta[1:])
+        return ruta_concatenada
+
+    @staticmethod
+    def construir_rutas_ahorros(matriz_costos, centro_id, tiendas_ids, demandas, capacidad,
+                                num_vecinos=VECINOS_AHORROS_CVRP):
+        # Ahorro de unir el final de la ruta de i con el inicio de la de j:
+        # s(i, j) = c(i, centro) + c(centro, j) - c(i, j)
+        # Solo se evaluan pares (i, j) con j entre los vecinos cercanos de i,
+        # asi el numero de ahorros crece como n*k en lugar de n^2
+        nodos = np.asarray(tiendas_ids)
+        simetrica = True
+
+        rutas = {nodo: [nodo] for nodo in tiendas_ids}
+        ruta_de = {nodo: nodo for nodo in tiendas_ids}
+        cargas = {nodo: demandas[nodo] for nodo in tiendas_ids}
+
+        candidatos = calcular_vecinos_candidatos(matriz_costos, nodos, num_vecinos)
+        if candidatos:
+            origen = np.repeat(nodos, [len(candidatos[nodo]) for nodo in tiendas_ids])
+            destino = np.concatenate([candidatos[nodo] for nodo in tiendas_ids])
+            costo_directo = np.asarray(matriz_costos[origen, destino], dtype=np.float64)
+            # Con costos asimetricos no se puede invertir una ruta al unirla
+            simetrica = (np.allclose(costo_directo, matriz_costos[destino, origen]) and
+                         np.allclose(matriz_costos[centro_id, nodos], matriz_costos[nodos, centro_id]))
+            ahorros = (np.asarray(matriz_costos[origen, centro_id], dtype=np.float64) +
+                       np.asarray(matriz_costos[centro_id, destino], dtype=np.float64) -
+                       costo_directo)
+            positivos = ahorros > 0
+            origen, destino, ahorros = origen[positivos], destino[positivos], ahorros[positivos]
+            orden = np.argsort(-ahorros, kind='stable')
+            pares = zip(origen[orden].tolist(), destino[orden].tolist())
+        else:
+            pares = []
+
+        for i, j in pares:
+            ri, rj = ruta_de[i], ruta_de[j]
+            if ri == rj or cargas[ri] + cargas[rj] > capacidad:
+                continue
+
+            ruta_i, ruta_j = rutas[ri], rutas[rj]
+            if ruta_i[-1] == i and ruta_j[0] == j:
+                nueva = ruta_i + ruta_j
+            elif not simetrica:
+                continue
+            elif ruta_i[0] == i and ruta_j[-1] == j:
+                nueva = ruta_j + ruta_i
+            elif ruta_i[-1] == i and ruta_j[-1] == j:
+                nueva = ruta_i + ruta_j[::-1]
+            elif ruta_i[0] == i and ruta_j[0] == j:
+                nueva = ruta_i[::-1] + ruta_j
+            else:
+                # i o j ya son interiores en su ruta
+                continue
+
+            # Se conserva el identificador de la ruta mas larga
+            conservar, absorber = (ri, rj) if len(ruta_i) >= len(ruta_j) else (rj, ri)
+            for nodo in rutas[absorber]:
+                ruta_de[nodo] = conservar
+            rutas[conservar] = nueva
+            cargas[conservar] += cargas.pop(absorber)
+            del rutas[absorber]
+
+        return [[centro_id] + ruta + [centro_id] for ruta in rutas.values()]
+
+    @staticmethod
+    def recocido_entre_rutas(matriz_costos, rutas, demandas, capacidad,
+                             temp_inicial, tasa_enfriamiento, temp_final=0.001, L=50,
+                             fecha_limite=None, progreso=None):
+        # Movimientos: reubicar una tienda en otra ruta o intercambiar dos
+        # tiendas de rutas distintas. Las rutas vacias desaparecen.
+        rutas = [ruta[:] for ruta in rutas]
+        cargas = [sum(demandas[nodo] for nodo in ruta[1:-1]) for ruta in rutas]
+        m = matriz_costos
+        t = temp_inicial
+
+        costo_actual = RuteoCapacitado.costo_rutas(rutas, matriz_costos)
+        costo_mejor = costo_actual
+        rutas_mejor = [ruta[:] for ruta in rutas]
+
+        while t > temp_final and len(rutas) > 1:
+            if fecha_limite is not None and time.monotonic() >= fecha_limite:
+                break
+            for _ in range(L):
+                a, b = random.sample(range(len(rutas)), 2)
+                ruta_a, ruta_b = rutas[a], rutas[b]
+                p = random.randint(1, len(ruta_a) - 2)
+                x = ruta_a[p]
+                anterior_x, siguiente_x = ruta_a[p - 1], ruta_a[p + 1]
+
+                if random.random() < 0.5:
+                    # Reubicar x entre ruta_b[q] y ruta_b[q + 1]
+                    if cargas[b] + demandas[x] > capacidad:
+                        continue
+                    q = random.randint(0, len(ruta_b) - 2)
+                    destino_a, destino_b = ruta_b[q], ruta_b[q + 1]
+                    delta = (m[anterior_x, siguiente_x] - m[anterior_x, x] - m[x, siguiente_x] +
+                             m[destino_a, x] + m[x, destino_b] - m[destino_a, destino_b])
+                    if delta >= 0 and random.random() >= math.exp(-delta / t):
+                        continue
+                    del ruta_a[p]
+                    ruta_b.insert(q + 1, x)
+                    cargas[a] -= demandas[x]
+                    cargas[b] += demandas[x]
+                    if len(ruta_a) == 2:
+                        del rutas[a]
+                        del cargas[a]
+                else:
+                    # Intercambiar x con y = ruta_b[q]
+                    q = random.randint(1, len(ruta_b) - 2)
+                    y = ruta_b[q]
+                    if (cargas[a] - demandas[x] + demandas[y] > capacidad or
+                            cargas[b] - demandas[y] + demandas[x] > capacidad):
+                        continue
+                    anterior_y, siguiente_y = ruta_b[q - 1], ruta_b[q + 1]
+                    delta = (m[anterior_x, y] + m[y, siguiente_x] - m[anterior_x, x] - m[x, siguiente_x] +
+                             m[anterior_y, x] + m[x, siguiente_y] - m[anterior_y, y] - m[y, siguiente_y])
+                    if delta >= 0 and random.random() >= math.exp(-delta / t):
+                        continue
+                    ruta_a[p], ruta_b[q] = y, x
+                    cargas[a] += demandas[y] - demandas[x]
+                    cargas[b] += demandas[x] - demandas[y]
+
+                costo_actual += float(delta)
+                if costo_actual < costo_mejor:
+                    costo_mejor = costo_actual
+                    rutas_mejor = [ruta[:] for ruta in rutas]
+                if len(rutas) == 1:
+                    break
+
+            t *= tasa_enfriamiento
+            if progreso is not None:
+                progreso(costo_mejor, t)
+
+        return rutas_mejor
+
+    @staticmethod
+    def costo_rutas(rutas, matriz_costos):
+        return sum(SimulatedAnnealing.calcular_costo_ruta(ruta, matriz_costos) for ruta in rutas)
+
+    @classmethod
+    def optimizar_zona_cvrp(cls, matriz_costos, centro_id, tiendas_zona, capacidad,
+                            temp_inicial, tasa_enfriamiento, temp_final=0.001, L=50,
+                            fecha_limite=None, progreso=None, estadisticas=None, **opciones):
+        # estadisticas: EstadisticasRecocido que recibe el costo de las rutas
+        # de ahorros (inicial) y el final; no se pasa al recocido de cada vehiculo
+        if len(tiendas_zona) == 0:
+            return [centro_id, centro_id], 0
+        inicio = time.perf_counter()
+
+        demandas = tiendas_zona[COLUMNAS_ESPERADAS['capacidad']].to_dict()
+        excedidas = [nodo for nodo, demanda in demandas.items() if demanda > capacidad]
+        if excedidas:
+            print(f"    Advertencia: {len(excedidas)} tiendas de la zona {centro_id + 1} superan "
+                  f"la capacidad del vehiculo y se atienden en rutas individuales")
+
+        rutas = cls.construir_rutas_ahorros(
+            matriz_costos, centro_id, list(tiendas_zona.index), demandas, capacidad
+        )
+        costo_ahorros = cls.costo_rutas(rutas, matriz_costos)
+
+        # Con plazo, la mitad del tiempo restante es para el recocido entre
+        # rutas y la otra mitad para pulir cada vehiculo
+        plazo_entre_rutas = None
+        if fecha_limite is not None:
+            plazo_entre_rutas = time.monotonic() + (fecha_limite - time.monotonic()) / 2
+        # Las rutas de ahorros ya son buenas: el recocido entre rutas parte frio
+        # para mejorarlas en lugar de desordenarlas
+        temp_mejora = min(temp_inicial, TEMP_INICIAL_MEJORA_CVRP)
+        rutas = cls.recocido_entre_rutas(
+            matriz_costos, rutas, demandas, capacidad,
+            temp_mejora, tasa_enfriamiento, temp_final, L,
+            plazo_entre_rutas, progreso
+        )
+
+        # Mejorar el orden de visita de cada vehiculo por separado, con
+        # iteraciones por temperatura proporcionales al tamaño de la ruta.
+        # Sin calibrar la temperatura: las rutas ya son buenas y no deben recalentarse.
+        # Sin mensajes por vehiculo: el resumen de la zona se imprime al final
+        mostrar_progreso = opciones.get('mostrar_progreso', MOSTRAR_PROGRESO)
+        opciones = dict(opciones, calibrar_temperatura=False, mostrar_progreso=False)
+        rutas_mejoradas = []
+        tiendas_pendientes = sum(len(ruta) - 2 for ruta in rutas)
+        for ruta in rutas:
+            if len(ruta) > 4:
+                # Cada vehiculo recibe una parte del tiempo restante proporcional a sus tiendas
+                plazo_ruta = None
+                if fecha_limite is not None:
+                    restante = max(0.0, fecha_limite - time.monotonic())
+                    plazo_ruta = time.monotonic() + restante * (len(ruta) - 2) / tiendas_pendientes
+                ruta, _ = SimulatedAnnealing.optimizar_zona(
+                    matriz_costos, centro_id, ruta[1:-1],
+                    temp_mejora, tasa_enfriamiento,
+                    temp_final, min(L, max(10, len(ruta) - 2)), ruta_inicial=ruta,
+                    fecha_limite=plazo_ruta, **opciones
+                )
+            tiendas_pendientes -= len(ruta) - 2
+            rutas_mejoradas.append(ruta)
+
+        costo = cls.costo_rutas(rutas_mejoradas, matriz_costos)
+        if estadisticas is not None:
+            estadisticas.registrar_costos(centro_id, len(tiendas_zona), costo_ahorros, costo,
+                                          time.perf_counter() - inicio, f"cvrp, {len(rutas_mejoradas)} vehiculos")
+        if mostrar_progreso:
+            print(f"        CVRP zona {centro_id + 1}: {len(rutas_mejoradas)} vehiculos, "
+                  f"ahorros {costo_ahorros:.2f} -> final {costo:.2f}")
+
+        return cls.unir_rutas(rutas_mejoradas, centro_id), costo
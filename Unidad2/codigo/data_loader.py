@@ -1,5 +1,8 @@
+import os
 import pandas as pd
 import numpy as np
+from scipy import sparse
+from scipy.optimize import linprog
 from scipy.spatial.distance import cdist
 from config import (
     ARCHIVO_DATOS_TIENDAS,
@@ -7,8 +10,20 @@ from config import (
     ARCHIVO_MATRIZ_COMBUSTIBLE,
     TIPO_CENTRO_DISTRIBUCION,
     TIPO_TIENDA,
-    COLUMNAS_ESPERADAS
+    COLUMNAS_ESPERADAS,
+    USAR_CACHE_MATRIZ,
+    MATRIZ_MEMORIA_MAPEADA,
+    TIPO_DATO_MATRIZ,
+    ACTUALIZACION_INCREMENTAL_MATRIZ,
+    METODO_ASIGNACION_ZONAS,
+    TOLERANCIA_BALANCE_ZONAS,
+    MODO_COSTOS,
+    ARCHIVO_TENSOR_HORARIO,
+    VELOCIDADES_POR_FRANJA
 )
+from cache_matrices import CacheMatrizCostos
+from almacen_matriz import AlmacenMatrizCostos
+from costos_horarios import CostosPorHora
 
 class DataLoader:
     
@@ -17,6 +32,8 @@ class DataLoader:
         self.centros_distribucion = None
         self.tiendas = None
         self.costo_total_matrix = None
+        # CostosPorHora en MODO_COSTOS 'horario'
+        self.costos_horarios = None
     
     def cargar_datos_ubicaciones(self):
         try:
@@ -28,19 +45,103 @@ class DataLoader:
             return False
     
     def cargar_matrices_costos(self):
+        if ACTUALIZACION_INCREMENTAL_MATRIZ:
+            return self.cargar_matriz_incremental()
+        
+        cache = None
+        # La matriz mapeada en memoria se respalda en el archivo de la cache
+        if USAR_CACHE_MATRIZ or MATRIZ_MEMORIA_MAPEADA:
+            try:
+                cache = CacheMatrizCostos(
+                    [ARCHIVO_MATRIZ_DISTANCIAS, ARCHIVO_MATRIZ_COMBUSTIBLE],
+                    tipo_dato=TIPO_DATO_MATRIZ
+                )
+                matriz = cache.cargar(memoria_mapeada=MATRIZ_MEMORIA_MAPEADA)
+            except FileNotFoundError:
+                print("Error: No se encontraron las matrices de costos")
+                return False
+            
+            if matriz is not None:
+                self.costo_total_matrix = matriz
+                print("Matriz de costos cargada desde cache binaria")
+                return True
+        
         try:
             distancias_df = pd.read_excel(ARCHIVO_MATRIZ_DISTANCIAS)
             costos_combustible_df = pd.read_excel(ARCHIVO_MATRIZ_COMBUSTIBLE)
             
             # Combinar matrices de costo
             costo_total_df = distancias_df + costos_combustible_df
-            self.costo_total_matrix = costo_total_df.to_numpy()
+            self.costo_total_matrix = costo_total_df.to_numpy(dtype=TIPO_DATO_MATRIZ)
             
             print("Matrices de costos cargadas y combinadas")
-            return True
         except FileNotFoundError:
             print("Error: No se encontraron las matrices de costos")
             return False
+        
+        # Regenerar la cache para los siguientes arranques
+        if cache is not None:
+            try:
+                cache.guardar(self.costo_total_matrix)
+                if MATRIZ_MEMORIA_MAPEADA:
+                    self.costo_total_matrix = cache.cargar(memoria_mapeada=True)
+            except OSError as e:
+                print(f"Advertencia: no se pudo guardar la cache de la matriz: {e}")
+        return True
+    
+    def cargar_matriz_incremental(self):
+        almacen = AlmacenMatrizCostos()
+        try:
+            if almacen.existe():
+                agregadas, retiradas, movidas = almacen.sincronizar(self.datos_df)
+                if agregadas or retiradas or movidas:
+                    print(f"Almacen de matriz actualizado: {agregadas} agregadas, "
+                          f"{retiradas} retiradas, {movidas} con nuevas coordenadas")
+            else:
+                # Primera vez: las matrices .xlsx deben corresponder a los datos actuales
+                distancias = pd.read_excel(ARCHIVO_MATRIZ_DISTANCIAS).to_numpy(dtype=np.float64)
+                combustible = pd.read_excel(ARCHIVO_MATRIZ_COMBUSTIBLE).to_numpy(dtype=np.float64)
+                if len(distancias) != len(self.datos_df) or len(combustible) != len(self.datos_df):
+                    print("Error: las matrices de costos no corresponden a los datos de ubicaciones")
+                    return False
+                almacen.inicializar(self.datos_df, distancias, combustible)
+                print("Almacen de matriz creado desde las matrices de costos")
+        except FileNotFoundError as e:
+            print(f"Error: No se encontró '{e.filename}'")
+            return False
+        except ValueError as e:
+            print(f"Error: {e}")
+            return False
+        
+        self.costo_total_matrix = almacen.matriz(self.datos_df['Nombre'])
+        print("Matriz de costos cargada desde el almacen incremental")
+        return True
+    
+    def cargar_costos_horarios(self):
+        # Tensor de minutos de viaje por franja; se (re)genera desde la matriz
+        # de distancias si no existe o si la matriz es mas reciente
+        try:
+            if (not os.path.exists(ARCHIVO_TENSOR_HORARIO) or
+                    (os.path.exists(ARCHIVO_MATRIZ_DISTANCIAS) and
+                     os.path.getmtime(ARCHIVO_MATRIZ_DISTANCIAS) > os.path.getmtime(ARCHIVO_TENSOR_HORARIO))):
+                distancias = pd.read_excel(ARCHIVO_MATRIZ_DISTANCIAS).to_numpy(dtype=np.float64)
+                CostosPorHora.generar_desde_distancias(distancias, VELOCIDADES_POR_FRANJA)
+                print(f"Tensor horario generado con {len(VELOCIDADES_POR_FRANJA)} franjas")
+            self.costos_horarios = CostosPorHora()
+        except FileNotFoundError:
+            print(f"Error: No se encontró '{ARCHIVO_TENSOR_HORARIO}' ni la matriz de distancias")
+            return False
+        except ValueError as e:
+            print(f"Error: {e}")
+            return False
+        
+        if self.datos_df is not None and self.costos_horarios.num_ubicaciones != len(self.datos_df):
+            print(f"Error: el tensor horario tiene {self.costos_horarios.num_ubicaciones} "
+                  f"ubicaciones y los datos {len(self.datos_df)}")
+            return False
+        print(f"Costos por hora cargados: {self.costos_horarios.num_franjas} franjas "
+              f"(hasta {self.costos_horarios.franjas_en_memoria} en memoria)")
+        return True
     
     def separar_ubicaciones(self):
         if self.datos_df is None:
@@ -59,11 +160,23 @@ class DataLoader:
         print(f"{len(self.tiendas)} tiendas identificadas")
         return True
     
-    def asignar_tiendas_a_zonas(self):
+    def asignar_tiendas_a_zonas(self, metodo=None):
         if self.centros_distribucion is None or self.tiendas is None:
             print("Error: Ubicaciones no separadas")
             return False
         
+        metodo = metodo or METODO_ASIGNACION_ZONAS
+        if metodo == 'balanceada':
+            asignaciones_zona = self.asignar_zonas_balanceadas()
+            if asignaciones_zona is not None:
+                self.tiendas['zona'] = asignaciones_zona
+                print("Tiendas asignadas a zonas balanceadas por costo")
+                return True
+            print("Advertencia: asignación balanceada no disponible, se usa proximidad")
+        elif metodo != 'proximidad':
+            print(f"Error: método de asignación desconocido '{metodo}'")
+            return False
+        
         # Obtener coordenadas
         coordenadas_centros = self.centros_distribucion[
             [COLUMNAS_ESPERADAS['latitud'], COLUMNAS_ESPERADAS['longitud']]
@@ -81,6 +194,63 @@ class DataLoader:
         print("Tiendas asignadas a zonas por proximidad")
         return True
     
+    def asignar_zonas_balanceadas(self, tolerancia=None):
+        # Asignacion generalizada: cada tienda va a un centro, la suma de
+        # Capacidad_Venta de las tiendas de un centro no pasa de
+        # capacidad_total/centros * (1 + tolerancia) y se minimiza el costo
+        # real tienda-centro de costo_total_matrix.
+        # Con capacidades distintas el simplex puede repartir algunas tiendas
+        # entre centros (a lo mas una por centro con el tope lleno). Esas
+        # tiendas se reparan despues: al centro mas barato con espacio.
+        if self.costo_total_matrix is None:
+            return None
+        
+        tolerancia = TOLERANCIA_BALANCE_ZONAS if tolerancia is None else tolerancia
+        indices_tiendas = self.tiendas.index.to_numpy()
+        indices_centros = self.centros_distribucion.index.to_numpy()
+        costos = np.asarray(
+            self.costo_total_matrix[np.ix_(indices_tiendas, indices_centros)], dtype=np.float64
+        )
+        n_tiendas, n_centros = costos.shape
+        if n_tiendas == 0:
+            return np.zeros(0, dtype=int)
+        
+        capacidades = self.tiendas[COLUMNAS_ESPERADAS['capacidad']].to_numpy(dtype=np.float64)
+        tope = capacidades.sum() / n_centros * (1 + tolerancia)
+        
+        # Variables x[t, c] aplanadas por filas
+        una_zona_por_tienda = sparse.kron(sparse.identity(n_tiendas), np.ones((1, n_centros)), format='csr')
+        tope_por_centro = sparse.kron(capacidades[None, :], sparse.identity(n_centros), format='csr')
+        
+        resultado = linprog(
+            costos.ravel(),
+            A_ub=tope_por_centro, b_ub=np.full(n_centros, tope),
+            A_eq=una_zona_por_tienda, b_eq=np.ones(n_tiendas),
+            bounds=(0, 1), method='highs-ds'
+        )
+        if not resultado.success:
+            return None
+        
+        x = resultado.x.reshape(n_tiendas, n_centros)
+        asignaciones = x.argmax(axis=1)
+        fraccionarias = np.flatnonzero(x.max(axis=1) < 1 - 1e-9)
+        if len(fraccionarias):
+            enteras = np.ones(n_tiendas, dtype=bool)
+            enteras[fraccionarias] = False
+            carga = np.bincount(asignaciones[enteras], weights=capacidades[enteras], minlength=n_centros)
+            # Las tiendas grandes primero, mientras hay mas espacio
+            for tienda in fraccionarias[np.argsort(-capacidades[fraccionarias])]:
+                con_espacio = np.flatnonzero(carga + capacidades[tienda] <= tope)
+                if len(con_espacio):
+                    centro = con_espacio[np.argmin(costos[tienda, con_espacio])]
+                else:
+                    # Ningun centro tiene espacio: el que queda menos excedido
+                    centro = int(np.argmin(carga))
+                asignaciones[tienda] = centro
+                carga[centro] += capacidades[tienda]
+        
+        return asignaciones
+    
     def cargar_todos_los_datos(self):
         print("=== CARGANDO Y PREPARANDO DATOS ===")
         
@@ -91,6 +261,13 @@ class DataLoader:
         if not self.cargar_matrices_costos():
             return False
         
+        if MODO_COSTOS == 'horario':
+            if not self.cargar_costos_horarios():
+                return False
+        elif MODO_COSTOS != 'estatico':
+            print(f"Error: modo de costos desconocido '{MODO_COSTOS}'")
+            return False
+        
         # Preparar datos
         if not self.separar_ubicaciones():
             return False
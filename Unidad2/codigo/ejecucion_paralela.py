@@ -0,0 +1,325 @@
+import os
+import queue
+import random
+import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from multiprocessing import shared_memory, Manager
+from simulated_annealing import SimulatedAnnealing
+from cvrp import RuteoCapacitado
+from costos_horarios import CostosPorHora
+from estadisticas_recocido import EstadisticasRecocido
+from config import (
+    MODO_CADENAS,
+    NUM_CADENAS,
+    MODO_RUTEO,
+    CAPACIDAD_VEHICULO,
+    INTERVALO_PROGRESO_SEGUNDOS,
+    ACEPTACION_ARRANQUE_CALIENTE,
+    MUESTREO_ESTADISTICAS
+)
+
+# Estado de cada proceso trabajador: la matriz de costos se adjunta una sola
+# vez (memoria compartida o archivo mapeado) en lugar de serializarse en cada
+# tarea; los costos por hora se reciben como objeto y mapean su propio tensor.
+# Los eventos de progreso se envian al proceso principal por una cola.
+_memoria_worker = None
+_matriz_worker = None
+_cola_progreso = None
+
+
+def _inicializar_worker(nombre_memoria, forma, tipo_dato, archivo_mapeado=None, cola_progreso=None,
+                        costos_horarios=None):
+    global _memoria_worker, _matriz_worker, _cola_progreso
+    _cola_progreso = cola_progreso
+    if costos_horarios is not None:
+        _matriz_worker = costos_horarios
+        return
+    if archivo_mapeado is not None:
+        _matriz_worker = np.load(archivo_mapeado, mmap_mode='r')
+        return
+    _memoria_worker = shared_memory.SharedMemory(name=nombre_memoria)
+    _matriz_worker = np.ndarray(forma, dtype=tipo_dato, buffer=_memoria_worker.buf)
+
+
+def crear_estrategia(modo_cadenas=None, num_cadenas=None, modo_ruteo=None, capacidad_vehiculo=None):
+    # Opciones que deciden como se resuelve cada zona (independientes de los
+    # parametros de temperatura del recocido)
+    estrategia = {
+        'modo_cadenas': modo_cadenas or MODO_CADENAS,
+        'num_cadenas': num_cadenas or NUM_CADENAS,
+        'modo_ruteo': modo_ruteo or MODO_RUTEO,
+        'capacidad_vehiculo': capacidad_vehiculo or CAPACIDAD_VEHICULO
+    }
+    if estrategia['modo_cadenas'] not in ('simple', 'multiarranque', 'templado_paralelo'):
+        raise ValueError(f"Modo de cadenas desconocido: '{estrategia['modo_cadenas']}'")
+    if estrategia['modo_ruteo'] not in ('tsp', 'cvrp'):
+        raise ValueError(f"Modo de ruteo desconocido: '{estrategia['modo_ruteo']}'")
+    if estrategia['modo_ruteo'] == 'cvrp' and estrategia['modo_cadenas'] == 'templado_paralelo':
+        raise ValueError("El templado paralelo no está disponible en modo de ruteo 'cvrp'")
+    return estrategia
+
+
+def cadenas_por_zona(estrategia):
+    # Solo el multiarranque reparte cadenas en tareas separadas; el templado
+    # paralelo necesita todas sus replicas en el mismo proceso
+    if estrategia['modo_cadenas'] == 'multiarranque':
+        return max(1, estrategia['num_cadenas'])
+    return 1
+
+
+def evento_progreso(zona_id, costo_mejor, cadena=None, temperatura=None, terminada=False):
+    return {
+        'zona': zona_id,
+        'cadena': cadena,
+        'costo_mejor': float(costo_mejor),
+        'temperatura': None if temperatura is None else float(temperatura),
+        'terminada': terminada
+    }
+
+
+class NotificadorProgreso:
+    # Se pasa al recocido como progreso(costo_mejor, temperatura). Solo
+    # reenvia un evento cuando el mejor costo bajo y han pasado al menos
+    # INTERVALO_PROGRESO_SEGUNDOS desde el anterior de la misma cadena.
+
+    def __init__(self, destino, zona_id, cadena=0, intervalo=INTERVALO_PROGRESO_SEGUNDOS):
+        self.destino = destino
+        self.zona_id = zona_id
+        self.cadena = cadena
+        self.intervalo = intervalo
+        self.ultimo_costo = float('inf')
+        self.ultimo_envio = float('-inf')
+
+    def __call__(self, costo_mejor, temperatura):
+        ahora = time.monotonic()
+        if costo_mejor >= self.ultimo_costo or ahora - self.ultimo_envio < self.intervalo:
+            return
+        self.ultimo_costo = costo_mejor
+        self.ultimo_envio = ahora
+        self.destino(evento_progreso(self.zona_id, costo_mejor, self.cadena, temperatura))
+
+
+def calcular_fecha_limite(segundos=None, fecha_limite_global=None):
+    # Plazo de una cadena: sus segundos desde ahora, sin pasar del plazo global
+    limites = [limite for limite in (
+        None if segundos is None else time.monotonic() + segundos,
+        fecha_limite_global
+    ) if limite is not None]
+    return min(limites) if limites else None
+
+
+def repartir_tiempo(tareas, cadenas, tiempo_limite=None, tiempo_limite_zona=None, procesos=1):
+    # Segundos por cadena de cada zona. Con `procesos` trabajando a la vez hay
+    # procesos * tiempo_limite segundos de computo, repartidos en proporcion al
+    # numero de tiendas; ninguna cadena pasa del tiempo total ni del de la zona.
+    if tiempo_limite is None and tiempo_limite_zona is None:
+        return {}
+    total_tiendas = sum(len(tiendas_zona) for _, tiendas_zona in tareas) * cadenas
+    segundos = {}
+    for zona_id, tiendas_zona in tareas:
+        limites = [] if tiempo_limite_zona is None else [tiempo_limite_zona]
+        if tiempo_limite is not None:
+            limites.append(min(tiempo_limite, tiempo_limite * procesos * len(tiendas_zona) / total_tiendas))
+        segundos[zona_id] = min(limites)
+    return segundos
+
+
+def optimizar_cadena(matriz_costos, zona_id, tiendas_zona, parametros, estrategia,
+                     semilla=None, cadena=0, segundos=None, fecha_limite_global=None,
+                     notificar=None):
+    # Con semilla fija cada (zona, cadena) usa su propio flujo aleatorio, asi
+    # el resultado no depende del orden ni del proceso en que se ejecute
+    # (salvo que un limite de tiempo corte la cadena antes)
+    if semilla is not None:
+        random.seed(f"{semilla}:{zona_id}:{cadena}")
+    opciones = dict(parametros)
+    # Arranque en caliente: la zona parte de su ruta reparada con una
+    # temperatura calibrada para aceptar pocos movimientos que empeoran
+    ruta_inicial = opciones.pop('rutas_iniciales', {}).get(zona_id)
+    if ruta_inicial is not None and estrategia['modo_ruteo'] == 'tsp':
+        opciones.update(
+            ruta_inicial=ruta_inicial,
+            calibrar_temperatura=True,
+            aceptacion_inicial=ACEPTACION_ARRANQUE_CALIENTE
+        )
+    # La cota inferior de la zona permite detenerse al alcanzar BRECHA_PARADA;
+    # en cvrp la cota es de toda la zona y no de cada vehiculo
+    cota_inferior = opciones.pop('cotas_inferiores', {}).get(zona_id)
+    if cota_inferior is not None and estrategia['modo_ruteo'] == 'tsp':
+        opciones['cota_inferior'] = cota_inferior
+    fecha_limite = calcular_fecha_limite(segundos, fecha_limite_global)
+    if fecha_limite is not None:
+        opciones['fecha_limite'] = fecha_limite
+    if notificar is not None:
+        opciones['progreso'] = NotificadorProgreso(notificar, zona_id, cadena)
+    # Devuelve (ruta, costo, estadisticas). Las estadisticas siempre llevan
+    # los costos inicial y final; la trayectoria por nivel solo si se pidieron
+    # (en cvrp y templado paralelo no hay contadores por nivel)
+    estadisticas = EstadisticasRecocido(MUESTREO_ESTADISTICAS if opciones.pop('estadisticas', False) else 0)
+    opciones['estadisticas'] = estadisticas
+
+    if estrategia['modo_ruteo'] == 'cvrp':
+        ruta, costo = RuteoCapacitado.optimizar_zona_cvrp(
+            matriz_costos, zona_id, tiendas_zona, estrategia['capacidad_vehiculo'], **opciones
+        )
+    elif estrategia['modo_cadenas'] == 'templado_paralelo':
+        ruta, costo = SimulatedAnnealing.optimizar_zona_templado_paralelo(
+            matriz_costos, zona_id, tiendas_zona, num_replicas=estrategia['num_cadenas'], **opciones
+        )
+    else:
+        ruta, costo = SimulatedAnnealing.optimizar_zona(
+            matriz_costos, zona_id, tiendas_zona, **opciones
+        )
+    return ruta, costo, estadisticas
+
+
+def mejor_solucion(soluciones):
+    # Menor costo; a igual costo gana la primera cadena (resultado determinista)
+    return min(soluciones, key=lambda solucion: solucion[1])
+
+
+def optimizar_zona_con_semilla(matriz_costos, zona_id, tiendas_zona, parametros, estrategia,
+                               semilla=None, segundos=None, fecha_limite_global=None,
+                               notificar=None):
+    # Las cadenas corren una tras otra: cada una recibe una parte igual de los
+    # segundos de la zona. Devuelve (ruta, costo, estadisticas) de la mejor
+    cadenas = cadenas_por_zona(estrategia)
+    segundos_cadena = None if segundos is None else segundos / cadenas
+    return mejor_solucion([
+        optimizar_cadena(matriz_costos, zona_id, tiendas_zona, parametros, estrategia,
+                         semilla, cadena, segundos_cadena, fecha_limite_global, notificar)
+        for cadena in range(cadenas)
+    ])
+
+
+def _optimizar_cadena_worker(zona_id, tiendas_zona, parametros, estrategia, semilla, cadena,
+                             segundos=None, fecha_limite_global=None):
+    # Devuelve (ruta, costo, segundos de reloj de la cadena, estadisticas)
+    notificar = None if _cola_progreso is None else _cola_progreso.put
+    inicio = time.monotonic()
+    ruta, costo, estadisticas = optimizar_cadena(_matriz_worker, zona_id, tiendas_zona, parametros,
+                                                 estrategia, semilla, cadena, segundos,
+                                                 fecha_limite_global, notificar)
+    return ruta, costo, time.monotonic() - inicio, estadisticas
+
+
+class EjecutorZonasParalelo:
+    # Ejecuta zonas independientes (y las cadenas de multiarranque de cada
+    # zona) en un pool de procesos. La matriz de costos se copia una vez a
+    # memoria compartida y cada tarea solo lleva los indices de su zona. Si la
+    # matriz ya esta mapeada desde un archivo, los trabajadores abren el mismo
+    # archivo y no se copia nada; lo mismo con CostosPorHora.
+
+    def __init__(self, matriz_costos, num_procesos=None):
+        self.costos_horarios = matriz_costos if isinstance(matriz_costos, CostosPorHora) else None
+        self.archivo_mapeado = getattr(matriz_costos, 'filename', None)
+        if self.archivo_mapeado is None and self.costos_horarios is None:
+            matriz_costos = np.ascontiguousarray(matriz_costos)
+        self.matriz_costos = matriz_costos
+        self.num_procesos = num_procesos or os.cpu_count() or 1
+        self.memoria = None
+        # {zona_id: segundos de la cadena mas lenta} de la ultima ejecucion
+        self.segundos_zona = {}
+        # {zona_id: EstadisticasRecocido de la mejor cadena} si se pidieron
+        self.estadisticas_zona = {}
+
+    def __enter__(self):
+        if self.archivo_mapeado is not None or self.costos_horarios is not None:
+            return self
+        self.memoria = shared_memory.SharedMemory(create=True, size=max(self.matriz_costos.nbytes, 1))
+        matriz_compartida = np.ndarray(
+            self.matriz_costos.shape, dtype=self.matriz_costos.dtype, buffer=self.memoria.buf
+        )
+        matriz_compartida[:] = self.matriz_costos
+        return self
+
+    def __exit__(self, tipo_excepcion, excepcion, traza):
+        if self.memoria is not None:
+            self.memoria.close()
+            self.memoria.unlink()
+            self.memoria = None
+
+    def ejecutar(self, tareas, parametros, estrategia, semilla=None,
+                 tiempo_limite=None, tiempo_limite_zona=None, notificar=None):
+        # tareas: lista de (zona_id, tiendas_zona). Devuelve {zona_id: (ruta, costo)}
+        # en el mismo orden de las tareas, sin importar cual termine primero.
+        # notificar(evento) recibe en este proceso los eventos de progreso de
+        # los trabajadores y uno final (terminada=True) por zona.
+        self.segundos_zona = {}
+        self.estadisticas_zona = {}
+        if not tareas:
+            return {}
+
+        cadenas = cadenas_por_zona(estrategia)
+        num_procesos = min(self.num_procesos, len(tareas) * cadenas)
+        fecha_limite_global = None if tiempo_limite is None else time.monotonic() + tiempo_limite
+        segundos = repartir_tiempo(tareas, cadenas, tiempo_limite, tiempo_limite_zona, num_procesos)
+        forma, tipo_dato = None, None
+        if self.costos_horarios is None:
+            forma, tipo_dato = self.matriz_costos.shape, self.matriz_costos.dtype.str
+        administrador = Manager() if notificar is not None else None
+        cola_progreso = administrador.Queue() if administrador is not None else None
+        try:
+            with ProcessPoolExecutor(
+                max_workers=num_procesos,
+                initializer=_inicializar_worker,
+                initargs=(
+                    self.memoria.name if self.memoria is not None else None,
+                    forma,
+                    tipo_dato,
+                    self.archivo_mapeado,
+                    cola_progreso,
+                    self.costos_horarios
+                )
+            ) as pool:
+                # Las zonas mas grandes se envian primero para equilibrar la carga
+                futuros = {}
+                for zona_id, tiendas_zona in sorted(tareas, key=lambda tarea: len(tarea[1]), reverse=True):
+                    futuros[zona_id] = [
+                        pool.submit(_optimizar_cadena_worker, zona_id, tiendas_zona, parametros,
+                                    estrategia, semilla, cadena, segundos.get(zona_id),
+                                    fecha_limite_global)
+                        for cadena in range(cadenas)
+                    ]
+                if notificar is not None:
+                    self._esperar_con_progreso(futuros, cola_progreso, notificar)
+                soluciones = {}
+                for zona_id, _ in tareas:
+                    resultados = [futuro.result() for futuro in futuros[zona_id]]
+                    ruta, costo, _, estadisticas = mejor_solucion(resultados)
+                    soluciones[zona_id] = (ruta, costo)
+                    if estadisticas is not None:
+                        self.estadisticas_zona[zona_id] = estadisticas
+                    self.segundos_zona[zona_id] = max(resultado[2] for resultado in resultados)
+                return soluciones
+        finally:
+            if administrador is not None:
+                administrador.shutdown()
+
+    @staticmethod
+    def _esperar_con_progreso(futuros, cola_progreso, notificar):
+        # Reenvia los eventos de la cola mientras las cadenas trabajan y
+        # anuncia cada zona cuando terminan todas sus cadenas
+        pendientes = {futuro for lista in futuros.values() for futuro in lista}
+        zonas_abiertas = set(futuros)
+        while zonas_abiertas:
+            if pendientes:
+                _, pendientes = wait(pendientes, timeout=INTERVALO_PROGRESO_SEGUNDOS,
+                                     return_when=FIRST_COMPLETED)
+            # Las zonas terminadas se toman antes de vaciar la cola: sus eventos
+            # ya estan en ella y deben llegar antes que el evento final
+            terminadas = [
+                zona_id for zona_id in zonas_abiertas
+                if all(futuro.done() for futuro in futuros[zona_id])
+            ]
+            while True:
+                try:
+                    notificar(cola_progreso.get_nowait())
+                except queue.Empty:
+                    break
+            for zona_id in terminadas:
+                zonas_abiertas.discard(zona_id)
+                if all(futuro.exception() is None for futuro in futuros[zona_id]):
+                    costo = mejor_solucion([futuro.result() for futuro in futuros[zona_id]])[1]
+                    notificar(evento_progreso(zona_id, costo, terminada=True))
@@ -0,0 +1,136 @@
+import time
+from config import MUESTREO_ESTADISTICAS
+
+
+class EstadisticasRecocido:
+    # Contadores del recocido de una zona, para ajustar su programa de
+    # temperatura. Se pasa a SimulatedAnnealing.optimizar_zona(estadisticas=...)
+    # y se llena durante la ejecucion:
+    #   - totales: movimientos propuestos (evaluados), aceptados, aceptados
+    #     que empeoran (de cuantos propuestos que empeoran), mejoras de la
+    #     mejor solucion, niveles y segundos
+    #   - segundos_por_nivel: duracion de cada nivel, de todos los niveles
+    #   - trayectoria: uno de cada `muestreo` niveles con su temperatura,
+    #     segundos, costo actual y mejor, y los contadores de ese nivel
+    #     (0 = solo totales)
+    # Los totales salen de los acumulados que ya lleva la cadena. Cada nivel
+    # lee el reloj dos veces; solo los muestreados leen sus contadores, asi
+    # que el muestreo adelgaza la trayectoria pero no los tiempos. El bucle
+    # interno del recocido no cambia.
+
+    COLUMNAS_TRAYECTORIA = (
+        'nivel', 'temperatura', 'segundos', 'costo', 'costo_mejor',
+        'propuestos', 'aceptados', 'peores_propuestos', 'peores_aceptados', 'mejoras'
+    )
+
+    def __init__(self, muestreo=MUESTREO_ESTADISTICAS):
+        self.muestreo = muestreo
+        self.zona = None
+        self.tiendas = 0
+        self.razon = None
+        self.temperatura_inicial = None
+        self.costo_inicial = None
+        self.costo_final = None
+        self.niveles = 0
+        self.propuestos = 0
+        self.aceptados = 0
+        self.peores_propuestos = 0
+        self.peores_aceptados = 0
+        self.mejoras = 0
+        self.segundos_total = 0.0
+        self.segundos_por_nivel = []
+        self.trayectoria = {columna: [] for columna in self.COLUMNAS_TRAYECTORIA}
+        self._inicio = None
+        self._inicio_nivel = None
+        self._base = None
+        self._previos = None
+        self._muestreado = False
+
+    @staticmethod
+    def _contadores(cadena):
+        return (cadena.propuestos, cadena.movimientos_aplicados, cadena.peores_propuestos,
+                cadena.peores_aceptados, cadena.mejoras)
+
+    def iniciar(self, zona, tiendas, cadena, temperatura_inicial):
+        self.zona = zona
+        self.tiendas = tiendas
+        self.temperatura_inicial = float(temperatura_inicial)
+        self.costo_inicial = float(cadena.costo_mejor)
+        self._inicio = time.perf_counter()
+        self._base = self._contadores(cadena)
+
+    def iniciar_nivel(self, cadena):
+        # Se llama antes de cada nivel, y registrar_nivel al terminarlo
+        self.niveles += 1
+        self._muestreado = bool(self.muestreo) and (self.niveles - 1) % self.muestreo == 0
+        if self._muestreado:
+            self._previos = self._contadores(cadena)
+        self._inicio_nivel = time.perf_counter()
+
+    def registrar_nivel(self, cadena, temperatura):
+        segundos = time.perf_counter() - self._inicio_nivel
+        self.segundos_por_nivel.append(segundos)
+        if not self._muestreado:
+            return
+        fila = (self.niveles, float(temperatura), segundos, float(cadena.costo), float(cadena.costo_mejor))
+        fila += tuple(int(actual - previo) for actual, previo in zip(self._contadores(cadena), self._previos))
+        for columna, valor in zip(self.COLUMNAS_TRAYECTORIA, fila):
+            self.trayectoria[columna].append(valor)
+
+    def finalizar(self, cadena, costo_final, razon):
+        if self._base is not None:
+            (self.propuestos, self.aceptados, self.peores_propuestos,
+             self.peores_aceptados, self.mejoras) = (
+                int(actual - base) for actual, base in zip(self._contadores(cadena), self._base)
+            )
+            self.segundos_total = time.perf_counter() - self._inicio
+        self.costo_final = float(costo_final)
+        self.razon = razon
+
+    def registrar_costos(self, zona, tiendas, costo_inicial, costo_final, segundos, razon):
+        # Templado paralelo y cvrp: costos de la zona, sin contadores por nivel
+        self.zona = zona
+        self.tiendas = tiendas
+        self.costo_inicial = float(costo_inicial)
+        self.costo_final = float(costo_final)
+        self.segundos_total = segundos
+        self.razon = razon
+
+    def registrar_exacta(self, zona, tiendas, costo_inicial, costo, segundos):
+        # Zona resuelta con Held-Karp: sin niveles ni movimientos
+        self.zona = zona
+        self.tiendas = tiendas
+        self.costo_inicial = float(costo_inicial)
+        self.costo_final = float(costo)
+        self.segundos_total = segundos
+        self.razon = "solucion exacta"
+
+    @property
+    def tasa_aceptacion(self):
+        return self.aceptados / self.propuestos if self.propuestos else 0.0
+
+    @property
+    def tasa_aceptacion_peores(self):
+        return self.peores_aceptados / self.peores_propuestos if self.peores_propuestos else 0.0
+
+    def a_dict(self):
+        return {
+            'zona': self.zona,
+            'tiendas': self.tiendas,
+            'razon': self.razon,
+            'temperatura_inicial': self.temperatura_inicial,
+            'costo_inicial': self.costo_inicial,
+            'costo_final': self.costo_final,
+            'niveles': self.niveles,
+            'propuestos': self.propuestos,
+            'aceptados': self.aceptados,
+            'peores_propuestos': self.peores_propuestos,
+            'peores_aceptados': self.peores_aceptados,
+            'mejoras': self.mejoras,
+            'tasa_aceptacion': self.tasa_aceptacion,
+            'tasa_aceptacion_peores': self.tasa_aceptacion_peores,
+            'segundos_total': self.segundos_total,
+            'segundos_por_nivel': self.segundos_por_nivel,
+            'muestreo': self.muestreo,
+            'trayectoria': self.trayectoria
+        }
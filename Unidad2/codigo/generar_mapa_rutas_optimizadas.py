@@ -1,12 +1,54 @@
 import pandas as pd
 import folium
+from folium.plugins import FastMarkerCluster
+from branca.element import MacroElement
+from jinja2 import Template
 import numpy as np
 import re
+import json
 import config
 from scipy.spatial.distance import cdist
 
+
+class SelectorDetalleRutas(MacroElement):
+    # Cada capa GeoJSON de ruta trae una linea por rango de zoom (propiedades
+    # zoom_min y zoom_max, null = sin tope); al cambiar el zoom solo queda
+    # agregada a su capa la linea del rango actual
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+        (function() {
+            var mapa = {{ this._parent.get_name() }};
+            var lineas = [];
+            [{% for capa in this.capas %}{{ capa.get_name() }}{% if not loop.last %}, {% endif %}{% endfor %}].forEach(function(capa) {
+                capa.eachLayer(function(linea) { lineas.push([capa, linea]); });
+            });
+            function actualizar() {
+                var zoom = mapa.getZoom();
+                lineas.forEach(function(par) {
+                    var p = par[1].feature.properties;
+                    var visible = zoom >= p.zoom_min && (p.zoom_max === null || zoom < p.zoom_max);
+                    if (visible && !par[0].hasLayer(par[1])) { par[0].addLayer(par[1]); }
+                    if (!visible && par[0].hasLayer(par[1])) { par[0].removeLayer(par[1]); }
+                });
+            }
+            mapa.on('zoomend', actualizar);
+            actualizar();
+        })();
+        {% endmacro %}
+    """)
+
+    def __init__(self, capas):
+        super().__init__()
+        self._name = 'SelectorDetalleRutas'
+        self.capas = capas
+
+
 class GeneradorMapaRutasOptimizadas:
-    def __init__(self):
+    def __init__(self, modo_mapa=None):
+        # modo_mapa: 'detallado' o 'escalable' (ver config.MODO_MAPA)
+        self.modo_mapa = modo_mapa or config.MODO_MAPA
+        if self.modo_mapa not in ('detallado', 'escalable'):
+            raise ValueError(f"Modo de mapa desconocido: '{self.modo_mapa}'")
         self.datos_df = None
         self.centros_distribucion = None
         self.tiendas = None
@@ -40,8 +82,77 @@ class GeneradorMapaRutasOptimizadas:
         except FileNotFoundError:
             return False
     
-    # Parsear resultados del archivo de texto
+    # Cargar resultados: JSON estructurado si existe, si no el archivo de texto
     def parsear_resultados_optimizacion(self):
+        if self.cargar_resultados_json():
+            print(f"Costo total: {self.costo_total:.2f}")
+            return True
+        return self.parsear_resultados_texto()
+    
+    def cargar_resultados_json(self):
+        try:
+            with open(config.ARCHIVO_RESULTADOS_JSON, 'r', encoding='utf-8') as file:
+                resultados = json.load(file)
+        except (FileNotFoundError, ValueError):
+            return False
+
+        fila_por_nombre = {nombre: fila for fila, nombre in enumerate(self.datos_df['Nombre'])}
+        zona_por_centro = {nombre: zona for zona, nombre in enumerate(self.centros_distribucion['Nombre'])}
+        rutas_optimizadas = {}
+        for zona in resultados['zonas']:
+            filas = self.resolver_ruta_json(zona['ruta'], zona['ruta_nombres'], fila_por_nombre)
+            if filas is None:
+                print(f"Las rutas de '{config.ARCHIVO_RESULTADOS_JSON}' no coinciden con los datos "
+                      "actuales, se usa el reporte de texto")
+                return False
+            # Fila de datos_df de cada nodo guardado; un recorrido por vehiculo
+            fila_de = dict(zip(zona['ruta'], filas))
+            vehiculos = zona.get('rutas_vehiculos') or [zona['ruta']]
+            if any(nodo not in fila_de for vehiculo in vehiculos for nodo in vehiculo):
+                return False
+            recorridos = self.separar_recorridos(
+                [fila_de[nodo] for vehiculo in vehiculos for nodo in vehiculo], filas[0]
+            )
+            rutas_optimizadas[zona_por_centro.get(zona['centro'], zona['zona_id'])] = {
+                'centro': zona['centro'],
+                'num_tiendas': zona['tiendas'],
+                'costo': zona['costo'],
+                'capacidad': zona['capacidad'],
+                'ruta_completa': ' → '.join(zona['ruta_nombres']),
+                'recorridos': recorridos,
+                'nodos': [nodo for recorrido in recorridos for nodo in recorrido]
+            }
+        self.costo_total = resultados['costo_total']
+        self.rutas_optimizadas = rutas_optimizadas
+        return True
+
+    def resolver_ruta_json(self, ruta, ruta_nombres, fila_por_nombre):
+        # Filas de datos_df de una ruta guardada. Los indices solo se usan tal
+        # cual si siguen apuntando a las mismas ubicaciones; si los datos
+        # cambiaron se resuelven por nombre. None si algun nombre ya no existe
+        nombres = self.datos_df['Nombre'].to_numpy()
+        if (len(ruta) == len(ruta_nombres) and all(0 <= nodo < len(nombres) for nodo in ruta)
+                and nombres[ruta].tolist() == ruta_nombres):
+            return list(ruta)
+        if len(ruta) != len(ruta_nombres) or any(nombre not in fila_por_nombre for nombre in ruta_nombres):
+            return None
+        return [fila_por_nombre[nombre] for nombre in ruta_nombres]
+
+    @staticmethod
+    def separar_recorridos(filas, centro):
+        # Filas de datos_df en orden de visita -> una lista de tiendas por cada
+        # salida del centro: [c, a, b, c, d, c] -> [[a, b], [d]]
+        recorridos = [[]]
+        for fila in filas:
+            if fila == centro:
+                if recorridos[-1]:
+                    recorridos.append([])
+            else:
+                recorridos[-1].append(fila)
+        return [recorrido for recorrido in recorridos if recorrido] or [[]]
+    
+    # Parsear resultados del archivo de texto
+    def parsear_resultados_texto(self):
         archivo_resultados = 'resultados_optimizacion_zonas.txt'
         try:
             with open(archivo_resultados, 'r', encoding='utf-8') as file:
@@ -51,19 +162,27 @@ class GeneradorMapaRutasOptimizadas:
             if match_costo:
                 self.costo_total = float(match_costo.group(1))
             
-            zonas = re.findall(r'ZONA: (.*?)\nTiendas: (\d+)\nCosto: ([\d.]+)\nCapacidad: ([\d,]+)\nRuta: (.*?)(?=\n--)', contenido, re.DOTALL)
+            zonas = re.findall(r'ZONA: (.*?)\nTiendas: (\d+)\n(?:Costo inicial: [^\n]*\n)?Costo: ([\d.]+)\n(?:Cota inferior: [^\n]*\n)?Capacidad: ([\d,]+)\nRuta: (.*?)(?=\n--)', contenido, re.DOTALL)
+            
+            fila_por_nombre = {nombre: fila for fila, nombre in enumerate(self.datos_df['Nombre'])}
+            zona_por_centro = {nombre: zona for zona, nombre in enumerate(self.centros_distribucion['Nombre'])}
             
             for i, (centro, num_tiendas, costo, capacidad, ruta) in enumerate(zonas):
                 ruta_limpia = ruta.replace('\n', ' ').strip()
-                tiendas_en_ruta = re.findall(r'Tienda (\d+)', ruta_limpia)
-                
-                self.rutas_optimizadas[i] = {
+                nombres_ruta = [nombre.strip() for nombre in ruta_limpia.split('→')]
+                recorridos = self.separar_recorridos(
+                    [fila_por_nombre[nombre] for nombre in nombres_ruta if nombre in fila_por_nombre],
+                    fila_por_nombre.get(centro)
+                )
+
+                self.rutas_optimizadas[zona_por_centro.get(centro, i)] = {
                     'centro': centro,
                     'num_tiendas': int(num_tiendas),
                     'costo': float(costo),
                     'capacidad': int(capacidad.replace(',', '')),
                     'ruta_completa': ruta_limpia,
-                    'tiendas': [int(t) for t in tiendas_en_ruta]
+                    'recorridos': recorridos,
+                    'nodos': [nodo for recorrido in recorridos for nodo in recorrido]
                 }
             
             print(f"Costo total: {self.costo_total:.2f}")
@@ -78,11 +197,13 @@ class GeneradorMapaRutasOptimizadas:
         lat_centro = self.datos_df['Latitud_WGS84'].mean() 
         lon_centro = self.datos_df['Longitud_WGS84'].mean()
         
-        # Crear mapa base centrado en la media de las ubicaciones
+        # Crear mapa base centrado en la media de las ubicaciones; en modo
+        # escalable los vectores se dibujan en un canvas en lugar de SVG
         self.mapa = folium.Map(
             location=[lat_centro, lon_centro], 
             zoom_start=10,
-            tiles='OpenStreetMap'
+            tiles='OpenStreetMap',
+            prefer_canvas=self.modo_mapa == 'escalable'
         )
         title_html = '''
         <h3 align="center" style="font-size:20px"><b>Mapa de Rutas Optimizadas</b></h3>
@@ -114,6 +235,16 @@ class GeneradorMapaRutasOptimizadas:
             ).add_to(self.mapa)
     
     def agregar_tiendas_y_rutas(self):
+        if self.modo_mapa == 'escalable':
+            return self.agregar_tiendas_y_rutas_escalable()
+        
+        # Columnas como arreglos: cada tienda se toma por su fila en datos_df
+        latitudes = self.datos_df['Latitud_WGS84'].to_numpy()
+        longitudes = self.datos_df['Longitud_WGS84'].to_numpy()
+        nombres = self.datos_df['Nombre'].to_numpy()
+        niveles = self.datos_df['Nivel_Tienda'].to_numpy()
+        capacidades = self.datos_df['Capacidad_Venta'].to_numpy()
+        
         for zona_id, zona_info in self.rutas_optimizadas.items(): 
             if zona_id >= len(self.centros_distribucion):
                 continue
@@ -123,39 +254,37 @@ class GeneradorMapaRutasOptimizadas:
             
             coord_centro = [centro['Latitud_WGS84'], centro['Longitud_WGS84']]
             
-            coordenadas_ruta = [coord_centro]
-            tiendas_encontradas = 0
+            recorridos = zona_info['recorridos']
+            # Un recorrido cerrado desde el centro por cada vehiculo
+            for vehiculo, nodos in enumerate(recorridos):
+                etiqueta = f" - Vehículo {vehiculo + 1}" if len(recorridos) > 1 else ""
+                coordenadas_ruta = [coord_centro]
+                tiendas_encontradas = 0
             
-            for orden, tienda_id in enumerate(zona_info['tiendas']):
-                tienda = self.tiendas[
-                    self.tiendas['Nombre'].str.contains(f'Tienda {tienda_id}', na=False)
-                ]
-                
-                if not tienda.empty:
-                    tienda = tienda.iloc[0]
-                    coord_tienda = [tienda['Latitud_WGS84'], tienda['Longitud_WGS84']]
+                for orden, nodo in enumerate(nodos):
+                    coord_tienda = [latitudes[nodo], longitudes[nodo]]
                     coordenadas_ruta.append(coord_tienda)
                     tiendas_encontradas += 1
-                    
+                
                     popup_text = f"""
-                    <b>{tienda['Nombre']}</b><br>
-                    Zona {zona_id + 1} - Orden: {orden + 1}<br>
-                    Nivel: {tienda['Nivel_Tienda']}<br>
-                    Capacidad Venta: {tienda['Capacidad_Venta']}<br>
+                    <b>{nombres[nodo]}</b><br>
+                    Zona {zona_id + 1}{etiqueta} - Orden: {orden + 1}<br>
+                    Nivel: {niveles[nodo]}<br>
+                    Capacidad Venta: {capacidades[nodo]}<br>
                     Costo de zona: {zona_info['costo']:.2f}
                     """
-                    
+                
                     folium.CircleMarker(
                         location=coord_tienda,
                         radius=10,
                         popup=popup_text,
-                        tooltip=f"Tienda {tienda_id} (Orden: {orden + 1})",
+                        tooltip=f"{nombres[nodo]} (Orden: {orden + 1}{etiqueta})",
                         color='black',
                         fillColor=color_zona,
                         fillOpacity=0.9,
                         weight=2
                     ).add_to(self.mapa)
-                    
+                
                     folium.Marker(
                         location=coord_tienda,
                         icon=folium.DivIcon(
@@ -165,43 +294,170 @@ class GeneradorMapaRutasOptimizadas:
                         )
                     ).add_to(self.mapa)
             
-            coordenadas_ruta.append(coord_centro)
+                coordenadas_ruta.append(coord_centro)
             
-            if len(coordenadas_ruta) >= 3:
-                ruta_principal = folium.PolyLine(
-                    locations=coordenadas_ruta,
-                    color='black',
-                    weight=8,
-                    opacity=1.0
-                )
-                ruta_principal.add_to(self.mapa)
-                ruta_color = folium.PolyLine(
-                    locations=coordenadas_ruta,
-                    color=color_zona,
-                    weight=6,
-                    opacity=0.9,
-                    popup=f"Ruta Zona {zona_id + 1}<br>Centro: {centro['Nombre']}<br>Tiendas: {tiendas_encontradas}<br>Costo: {zona_info['costo']:.2f}",
-                    tooltip=f"Ruta Zona {zona_id + 1} - Costo: {zona_info['costo']:.2f}"
-                )
-                ruta_color.add_to(self.mapa)
-                
-                for i in range(len(coordenadas_ruta) - 1):
-                    folium.PolyLine(
-                        locations=[coordenadas_ruta[i], coordenadas_ruta[i + 1]],
+                if len(coordenadas_ruta) >= 3:
+                    ruta_principal = folium.PolyLine(
+                        locations=coordenadas_ruta,
                         color='black',
-                        weight=6,
-                        opacity=0.8
-                    ).add_to(self.mapa)
-                    
-                    folium.PolyLine(
-                        locations=[coordenadas_ruta[i], coordenadas_ruta[i + 1]],
+                        weight=8,
+                        opacity=1.0
+                    )
+                    ruta_principal.add_to(self.mapa)
+                    ruta_color = folium.PolyLine(
+                        locations=coordenadas_ruta,
                         color=color_zona,
-                        weight=4,
+                        weight=6,
                         opacity=0.9,
-                        dash_array='10, 5'
-                    ).add_to(self.mapa)
+                        popup=f"Ruta Zona {zona_id + 1}{etiqueta}<br>Centro: {centro['Nombre']}<br>Tiendas: {tiendas_encontradas}<br>Costo: {zona_info['costo']:.2f}",
+                        tooltip=f"Ruta Zona {zona_id + 1}{etiqueta} - Costo: {zona_info['costo']:.2f}"
+                    )
+                    ruta_color.add_to(self.mapa)
+                
+                    for i in range(len(coordenadas_ruta) - 1):
+                        folium.PolyLine(
+                            locations=[coordenadas_ruta[i], coordenadas_ruta[i + 1]],
+                            color='black',
+                            weight=6,
+                            opacity=0.8
+                        ).add_to(self.mapa)
+                    
+                        folium.PolyLine(
+                            locations=[coordenadas_ruta[i], coordenadas_ruta[i + 1]],
+                            color=color_zona,
+                            weight=4,
+                            opacity=0.9,
+                            dash_array='10, 5'
+                        ).add_to(self.mapa)
                 
-                self.agregar_flechas_direccionales(coordenadas_ruta, color_zona)
+                    self.agregar_flechas_direccionales(coordenadas_ruta, color_zona)
+    
+    @staticmethod
+    def simplificar_polilinea(x, y, tolerancia):
+        # Douglas-Peucker: indices de los puntos que se conservan para que la
+        # linea simplificada no se aleje mas de `tolerancia` de la original.
+        # Los extremos siempre se conservan.
+        n = len(x)
+        if n <= 2 or tolerancia <= 0:
+            return np.arange(n)
+        conservar = np.zeros(n, dtype=bool)
+        conservar[[0, n - 1]] = True
+        pendientes = [(0, n - 1)]
+        while pendientes:
+            inicio, fin = pendientes.pop()
+            if fin - inicio < 2:
+                continue
+            dx, dy = x[fin] - x[inicio], y[fin] - y[inicio]
+            px, py = x[inicio + 1:fin] - x[inicio], y[inicio + 1:fin] - y[inicio]
+            longitud = np.hypot(dx, dy)
+            # Con extremos iguales (la ruta vuelve al centro) se usa la distancia al punto
+            if longitud == 0:
+                distancias = np.hypot(px, py)
+            else:
+                distancias = np.abs(dx * py - dy * px) / longitud
+            k = int(np.argmax(distancias))
+            if distancias[k] > tolerancia:
+                medio = inicio + 1 + k
+                conservar[medio] = True
+                pendientes.append((inicio, medio))
+                pendientes.append((medio, fin))
+        return np.flatnonzero(conservar)
+    
+    @staticmethod
+    def rangos_zoom(cortes=None, tolerancia_pixeles=None):
+        # [(zoom_min, zoom_max, tolerancia en grados)]. Un pixel mide
+        # 360 / (256 * 2^z) grados al zoom z; cada rango usa el de su zoom
+        # mayor y el ultimo (zoom_max None) no se simplifica
+        cortes = sorted(config.CORTES_ZOOM_RUTAS if cortes is None else cortes)
+        tolerancia_pixeles = (config.TOLERANCIA_PIXELES_MAPA if tolerancia_pixeles is None
+                              else tolerancia_pixeles)
+        rangos = []
+        zoom_min = 0
+        for corte in cortes:
+            rangos.append((zoom_min, corte, tolerancia_pixeles * 360 / (256 * 2 ** (corte - 1))))
+            zoom_min = corte
+        rangos.append((zoom_min, None, 0.0))
+        return rangos
+    
+    def agregar_tiendas_y_rutas_escalable(self):
+        # Por zona un FeatureGroup (se puede ocultar desde el control de capas) con:
+        #   - una capa GeoJSON con la ruta simplificada para cada rango de zoom
+        #   - las tiendas en un FastMarkerCluster: los datos van como un solo
+        #     arreglo JSON y los marcadores se crean en el navegador
+        latitudes = self.datos_df['Latitud_WGS84'].to_numpy(dtype=np.float64)
+        longitudes = self.datos_df['Longitud_WGS84'].to_numpy(dtype=np.float64)
+        nombres = self.datos_df['Nombre'].to_numpy()
+        niveles = self.datos_df['Nivel_Tienda'].to_numpy()
+        capacidades = self.datos_df['Capacidad_Venta'].to_numpy()
+        decimales = config.DECIMALES_COORDENADAS_MAPA
+        rangos = self.rangos_zoom()
+        capas_rutas = []
+        
+        for zona_id, zona_info in self.rutas_optimizadas.items():
+            if zona_id >= len(self.centros_distribucion):
+                continue
+            
+            color_zona = self.colores_zonas[zona_id % len(self.colores_zonas)]
+            centro = self.centros_distribucion.iloc[zona_id]
+            nodos = np.asarray(zona_info['nodos'], dtype=np.int64)
+            # Orden de visita de cada tienda dentro del recorrido de su vehiculo
+            ordenes = [orden + 1 for recorrido in zona_info['recorridos'] for orden in range(len(recorrido))]
+            grupo = folium.FeatureGroup(name=f"Zona {zona_id + 1}: {centro['Nombre']}")
+
+            # Una linea cerrada desde el centro por vehiculo y rango de zoom
+            lineas = []
+            for recorrido in zona_info['recorridos']:
+                recorrido = np.asarray(recorrido, dtype=np.int64)
+                lat_ruta = np.concatenate(([centro['Latitud_WGS84']], latitudes[recorrido], [centro['Latitud_WGS84']]))
+                lon_ruta = np.concatenate(([centro['Longitud_WGS84']], longitudes[recorrido], [centro['Longitud_WGS84']]))
+                for zoom_min, zoom_max, tolerancia in rangos:
+                    indices = self.simplificar_polilinea(lon_ruta, lat_ruta, tolerancia)
+                    lineas.append({
+                        'type': 'Feature',
+                        'geometry': {
+                            'type': 'LineString',
+                            'coordinates': np.column_stack(
+                                (lon_ruta[indices], lat_ruta[indices])
+                            ).round(decimales).tolist()
+                        },
+                        'properties': {'zoom_min': zoom_min, 'zoom_max': zoom_max}
+                    })
+            capa_ruta = folium.GeoJson(
+                {'type': 'FeatureCollection', 'features': lineas},
+                style_function=lambda _, color=color_zona: {'color': color, 'weight': 4, 'opacity': 0.9},
+                tooltip=f"Ruta Zona {zona_id + 1} - Costo: {zona_info['costo']:.2f}",
+                control=False
+            )
+            capa_ruta.add_to(grupo)
+            capas_rutas.append(capa_ruta)
+            
+            if len(nodos):
+                FastMarkerCluster(
+                    list(zip(
+                        latitudes[nodos].round(decimales).tolist(),
+                        longitudes[nodos].round(decimales).tolist(),
+                        nombres[nodos].tolist(),
+                        ordenes,
+                        niveles[nodos].tolist(),
+                        capacidades[nodos].tolist()
+                    )),
+                    callback=f'''function (row) {{
+                        var marker = L.circleMarker(new L.LatLng(row[0], row[1]), {{
+                            radius: 7, color: 'black', weight: 1, fillColor: '{color_zona}', fillOpacity: 0.9
+                        }});
+                        marker.bindTooltip(row[2] + ' (Orden: ' + row[3] + ')');
+                        marker.bindPopup('<b>' + row[2] + '</b><br>Zona {zona_id + 1} - Orden: ' + row[3] +
+                                         '<br>Nivel: ' + row[4] + '<br>Capacidad Venta: ' + row[5]);
+                        return marker;
+                    }}''',
+                    control=False,
+                    chunked_loading=True
+                ).add_to(grupo)
+            
+            grupo.add_to(self.mapa)
+        
+        SelectorDetalleRutas(capas_rutas).add_to(self.mapa)
+        folium.LayerControl(collapsed=True).add_to(self.mapa)
     
     def agregar_flechas_direccionales(self, coordenadas, color):
         for i in range(1, len(coordenadas) - 1, 3):
@@ -232,6 +488,19 @@ class GeneradorMapaRutasOptimizadas:
                 ).add_to(self.mapa)
     
     def agregar_leyenda_y_controles(self):
+        if self.modo_mapa == 'escalable':
+            caracteristicas = '''
+        <p>• Rutas simplificadas según el zoom</p>
+        <p>• Tiendas agrupadas: acercar o hacer clic para expandir</p>
+        <p>• Colores: diferentes zonas</p>
+        <p>• Control de capas: mostrar u ocultar zonas</p>'''
+        else:
+            caracteristicas = '''
+        <p>• Líneas gruesas: rutas principales</p>
+        <p>• Líneas punteadas: segmentos individuales</p>
+        <p>• Números: orden de visita</p>
+        <p>• Colores: diferentes zonas</p>
+        <p>• Flechas: dirección de la ruta</p>'''
         legend_html = f'''
         <div style="position: fixed; 
                     bottom: 50px; left: 50px; width: 280px; height: 220px; 
@@ -244,11 +513,7 @@ class GeneradorMapaRutasOptimizadas:
         <p><b> Costo Total: {self.costo_total:.2f}</b></p>
         <hr>
         <p> <b>Características:</b></p>
-        <p>• Líneas gruesas: rutas principales</p>
-        <p>• Líneas punteadas: segmentos individuales</p>
-        <p>• Números: orden de visita</p>
-        <p>• Colores: diferentes zonas</p>
-        <p>• Flechas: dirección de la ruta</p>
+        {caracteristicas}
         </div>
         '''
         self.mapa.get_root().html.add_child(folium.Element(legend_html))
@@ -277,6 +542,14 @@ class GeneradorMapaRutasOptimizadas:
         estadisticas_html += '</div>'
         self.mapa.get_root().html.add_child(folium.Element(estadisticas_html))
     
+    def construir_mapa(self):
+        # Requiere datos_df, centros_distribucion y rutas_optimizadas cargados
+        self.crear_mapa_base()
+        self.agregar_centros_distribucion()
+        self.agregar_tiendas_y_rutas()
+        self.agregar_leyenda_y_controles()
+        self.agregar_estadisticas()
+    
     def generar_mapa_completo(self):
         print("=== GENERANDO MAPA DE RUTAS OPTIMIZADAS ===")
         
@@ -286,13 +559,9 @@ class GeneradorMapaRutasOptimizadas:
         if not self.parsear_resultados_optimizacion():
             return False
         
-        self.crear_mapa_base()
-        self.agregar_centros_distribucion()
-        self.agregar_tiendas_y_rutas()
-        self.agregar_leyenda_y_controles()
-        self.agregar_estadisticas()
+        self.construir_mapa()
         
-        nombre_archivo = 'mapa_rutas_optimizadas.html'
+        nombre_archivo = config.ARCHIVO_MAPA
         self.mapa.save(nombre_archivo)
         print(f"Mapa de rutas optimizadas guardado como: {nombre_archivo}")
         
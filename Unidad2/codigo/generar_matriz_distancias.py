@@ -1,6 +1,11 @@
 import pandas as pd
 import numpy as np
 from math import radians, cos, sin, asin, sqrt
+from config import METODO_DISTANCIAS, ARCHIVO_RED_VIAL
+from red_vial import RedVial
+
+# Radio de la Tierra en kilometros
+RADIO_TIERRA_KM = 6371
 
 
 def haversine(lat1, lon1, lat2, lon2):
@@ -13,16 +18,76 @@ def haversine(lat1, lon1, lat2, lon2):
     a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
     c = 2 * asin(sqrt(a))
     
-    # Radio de la Tierra en kilometros
-    r = 6371
+    return c * RADIO_TIERRA_KM
+
+
+def calcular_matriz_haversine(latitudes, longitudes, tipo_dato='float64', tam_bloque=None):
+    # Misma formula que haversine() evaluada con broadcasting de NumPy.
+    # La matriz es simetrica: cada bloque de filas solo calcula las columnas
+    # desde su diagonal en adelante y el resto se copia transpuesto.
+    # tam_bloque limita las filas por bloque para acotar la memoria temporal
+    # a tam_bloque x N valores (None = todo en un bloque).
+    lat = np.radians(np.asarray(latitudes, dtype=np.float64))
+    lon = np.radians(np.asarray(longitudes, dtype=np.float64))
+    n_ubicaciones = len(lat)
+    cos_lat = np.cos(lat)
+    
+    matriz = np.zeros((n_ubicaciones, n_ubicaciones), dtype=tipo_dato)
+    tam_bloque = tam_bloque or max(n_ubicaciones, 1)
+    
+    for inicio in range(0, n_ubicaciones, tam_bloque):
+        fin = min(inicio + tam_bloque, n_ubicaciones)
+        
+        dlat = lat[None, inicio:] - lat[inicio:fin, None]
+        dlon = lon[None, inicio:] - lon[inicio:fin, None]
+        a = (np.sin(dlat / 2) ** 2 +
+             cos_lat[inicio:fin, None] * cos_lat[None, inicio:] * np.sin(dlon / 2) ** 2)
+        bloque = 2 * np.arcsin(np.sqrt(a)) * RADIO_TIERRA_KM
+        
+        matriz[inicio:fin, inicio:] = bloque
+        matriz[inicio:, inicio:fin] = bloque.T
     
-    return c * r
+    np.fill_diagonal(matriz, 0.0)
+    return matriz
+
+
+def calcular_distancias_ubicaciones(lat_nuevas, lon_nuevas, latitudes, longitudes,
+                                    metodo=None, archivo_red_vial=None):
+    # Filas y columnas de la matriz para unas pocas ubicaciones nuevas frente
+    # a las existentes, sin recalcular la matriz completa: devuelve
+    # (salida, llegada), ambas nuevas x existentes, con salida[i, j] de la
+    # nueva i a la existente j y llegada[i, j] de la existente j a la nueva i
+    metodo = metodo or METODO_DISTANCIAS
+    if metodo == 'red_vial':
+        red = RedVial.cargar(archivo_red_vial or ARCHIVO_RED_VIAL)
+        salida = red.distancias_entre(lat_nuevas, lon_nuevas, latitudes, longitudes)
+        llegada = red.distancias_entre(lat_nuevas, lon_nuevas, latitudes, longitudes, hacia_origen=True)
+        return salida, llegada
+    if metodo != 'haversine':
+        raise ValueError(f"Metodo de distancias desconocido: '{metodo}'")
+    
+    lat = np.radians(np.asarray(latitudes, dtype=np.float64))
+    lon = np.radians(np.asarray(longitudes, dtype=np.float64))
+    lat_n = np.radians(np.asarray(lat_nuevas, dtype=np.float64))[:, None]
+    lon_n = np.radians(np.asarray(lon_nuevas, dtype=np.float64))[:, None]
+    a = np.sin((lat - lat_n) / 2) ** 2 + np.cos(lat_n) * np.cos(lat) * np.sin((lon - lon_n) / 2) ** 2
+    salida = 2 * np.arcsin(np.sqrt(a)) * RADIO_TIERRA_KM
+    return salida, salida
 
 
 def generar_matriz_distancias(archivo_entrada='datos_distribucion_tiendas.xlsx',
-                              archivo_salida='matriz_distancias.xlsx'):
+                              archivo_salida='matriz_distancias.xlsx',
+                              tipo_dato='float64', tam_bloque=None,
+                              metodo=None, archivo_red_vial=None):
+    # metodo: 'haversine' o 'red_vial' (ver config.METODO_DISTANCIAS)
+    metodo = metodo or METODO_DISTANCIAS
+    if metodo not in ('haversine', 'red_vial'):
+        raise ValueError(f"Metodo de distancias desconocido: '{metodo}'")
     
-    print("GENERADOR DE MATRIZ DE DISTANCIAS - FORMULA DE HAVERSINE")
+    if metodo == 'red_vial':
+        print("GENERADOR DE MATRIZ DE DISTANCIAS - RED VIAL (OpenStreetMap)")
+    else:
+        print("GENERADOR DE MATRIZ DE DISTANCIAS - FORMULA DE HAVERSINE")
     
     # Cargar datos de ubicaciones
     try:
@@ -45,19 +110,20 @@ def generar_matriz_distancias(archivo_entrada='datos_distribucion_tiendas.xlsx',
     longitudes = df_ubicaciones['Longitud_WGS84'].values
     n_ubicaciones = len(latitudes)
     
-    # Calcular matriz de distancias
-    matriz_distancias = np.zeros((n_ubicaciones, n_ubicaciones))
-    
-    for i in range(n_ubicaciones):
-        for j in range(n_ubicaciones):
-            if i == j:
-                matriz_distancias[i, j] = 0.0
-            else:
-                distancia = haversine(
-                    latitudes[i], longitudes[i],
-                    latitudes[j], longitudes[j]
-                )
-                matriz_distancias[i, j] = distancia
+    if metodo == 'red_vial':
+        archivo_red_vial = archivo_red_vial or ARCHIVO_RED_VIAL
+        try:
+            red = RedVial.cargar(archivo_red_vial)
+        except FileNotFoundError:
+            print(f"Error: No se encontró la red vial '{archivo_red_vial}'")
+            return False
+        print(f"Red vial: {red.num_nodos} nodos, {red.grafo.nnz} tramos")
+        matriz_distancias = red.matriz_distancias(latitudes, longitudes, tipo_dato=tipo_dato)
+    else:
+        # Calcular matriz de distancias (vectorizada, aprovechando la simetria)
+        matriz_distancias = calcular_matriz_haversine(
+            latitudes, longitudes, tipo_dato=tipo_dato, tam_bloque=tam_bloque
+        )
     
     # Crear DataFrame con el formato correcto (Nodo_1, Nodo_2, ...)
     columnas = [f'Nodo_{i+1}' for i in range(n_ubicaciones)]
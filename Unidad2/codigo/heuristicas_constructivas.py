@@ -0,0 +1,201 @@
+import numpy as np
+
+HEURISTICAS_INICIALES = (
+    'aleatoria', 'vecino_cercano', 'insercion_barata', 'insercion_lejana', 'arista_voraz'
+)
+
+
+class HeuristicasConstructivas:
+    # Rutas iniciales construidas sobre la matriz de costos. Cada heuristica
+    # trabaja sobre la submatriz de la zona con indices locales (0 = centro)
+    # y devuelve el orden de visita local; construir_ruta lo traduce a nodos.
+    # Los pasos internos operan sobre filas y columnas completas con numpy,
+    # asi el costo en Python crece con el numero de tiendas y no con su cuadrado.
+
+    @staticmethod
+    def submatriz(matriz_costos, nodos):
+        return np.array(matriz_costos[np.ix_(nodos, nodos)], dtype=np.float64)
+
+    @staticmethod
+    def vecino_mas_cercano(costos):
+        # Desde el centro, siempre a la tienda no visitada mas barata
+        m = len(costos)
+        visitado = np.zeros(m, dtype=bool)
+        visitado[0] = True
+        orden = [0]
+        actual = 0
+        for _ in range(m - 1):
+            actual = int(np.argmin(np.where(visitado, np.inf, costos[actual])))
+            visitado[actual] = True
+            orden.append(actual)
+        return orden
+
+    @staticmethod
+    def _orden_desde_sucesores(sucesor):
+        orden = [0]
+        nodo = int(sucesor[0])
+        while nodo != 0:
+            orden.append(nodo)
+            nodo = int(sucesor[nodo])
+        return orden
+
+    @staticmethod
+    def _costos_insercion(costos, inicios, finales, nodos):
+        # Matriz (nodos x aristas) de c(a, u) + c(u, b) - c(a, b)
+        return (costos[np.ix_(inicios, nodos)].T + costos[np.ix_(nodos, finales)] -
+                costos[inicios, finales])
+
+    @classmethod
+    def insercion_mas_barata(cls, costos):
+        # En cada paso inserta la tienda cuya mejor insercion es mas barata.
+        # La ruta es un arreglo de sucesores y cada arista se identifica por
+        # su nodo inicial. Para cada tienda pendiente se guarda su mejor arista:
+        # al insertar k entre a y b solo las tiendas cuya mejor arista era
+        # (a, b) se recalculan contra toda la ruta; las demas solo se comparan
+        # con las dos aristas nuevas (a, k) y (k, b).
+        m = len(costos)
+        sucesor = np.zeros(m, dtype=np.int64)
+        en_ruta = np.zeros(m, dtype=bool)
+        en_ruta[0] = True
+        mejor_costo = costos[0] + costos[:, 0] - costos[0, 0]
+        mejor_arista = np.zeros(m, dtype=np.int64)
+        mejor_costo[0] = np.inf
+
+        for _ in range(m - 1):
+            k = int(np.argmin(mejor_costo))
+            a = int(mejor_arista[k])
+            b = int(sucesor[a])
+            sucesor[a], sucesor[k] = k, b
+            en_ruta[k] = True
+            mejor_costo[k] = np.inf
+
+            pendientes = np.flatnonzero(~en_ruta)
+            if len(pendientes) == 0:
+                break
+            afectadas = pendientes[mejor_arista[pendientes] == a]
+            resto = pendientes[mejor_arista[pendientes] != a]
+
+            if len(afectadas):
+                inicios = np.flatnonzero(en_ruta)
+                insercion = cls._costos_insercion(costos, inicios, sucesor[inicios], afectadas)
+                posicion = np.argmin(insercion, axis=1)
+                mejor_costo[afectadas] = insercion[np.arange(len(afectadas)), posicion]
+                mejor_arista[afectadas] = inicios[posicion]
+
+            if len(resto):
+                nuevas = np.array([a, k])
+                insercion = cls._costos_insercion(costos, nuevas, sucesor[nuevas], resto)
+                posicion = np.argmin(insercion, axis=1)
+                costo_nuevo = insercion[np.arange(len(resto)), posicion]
+                mejora = costo_nuevo < mejor_costo[resto]
+                mejor_costo[resto[mejora]] = costo_nuevo[mejora]
+                mejor_arista[resto[mejora]] = nuevas[posicion[mejora]]
+
+        return cls._orden_desde_sucesores(sucesor)
+
+    @classmethod
+    def insercion_mas_lejana(cls, costos):
+        # En cada paso toma la tienda mas alejada de la ruta (la de mayor
+        # distancia minima a sus nodos) y la inserta donde cuesta menos.
+        # Las tiendas lejanas fijan primero la forma general de la ruta.
+        m = len(costos)
+        simetrica = (costos + costos.T) / 2
+        sucesor = np.zeros(m, dtype=np.int64)
+        en_ruta = np.zeros(m, dtype=bool)
+        en_ruta[0] = True
+        distancia = simetrica[0].copy()
+
+        for _ in range(m - 1):
+            k = int(np.argmax(np.where(en_ruta, -np.inf, distancia)))
+            inicios = np.flatnonzero(en_ruta)
+            insercion = cls._costos_insercion(costos, inicios, sucesor[inicios], [k])[0]
+            a = int(inicios[np.argmin(insercion)])
+            sucesor[a], sucesor[k] = k, sucesor[a]
+            en_ruta[k] = True
+            np.minimum(distancia, simetrica[k], out=distancia)
+
+        return cls._orden_desde_sucesores(sucesor)
+
+    @staticmethod
+    def arista_voraz(costos):
+        # Recorre las aristas de menor a mayor costo (simetrizado) y acepta
+        # las que no dan grado 3 ni cierran un ciclo antes de tiempo; el
+        # camino resultante se cierra y se orienta en el sentido mas barato.
+        m = len(costos)
+        if m <= 3:
+            return list(range(m))
+        simetrica = (costos + costos.T) / 2
+        filas, columnas = np.triu_indices(m, k=1)
+        orden_aristas = np.argsort(simetrica[filas, columnas], kind='stable')
+
+        grado = np.zeros(m, dtype=np.int64)
+        padre = list(range(m))
+        vecinos = [[] for _ in range(m)]
+
+        def raiz(nodo):
+            while padre[nodo] != nodo:
+                padre[nodo] = padre[padre[nodo]]
+                nodo = padre[nodo]
+            return nodo
+
+        aceptadas = 0
+        for arista in orden_aristas.tolist():
+            i, j = int(filas[arista]), int(columnas[arista])
+            if grado[i] == 2 or grado[j] == 2:
+                continue
+            raiz_i, raiz_j = raiz(i), raiz(j)
+            if raiz_i == raiz_j:
+                continue
+            padre[raiz_i] = raiz_j
+            grado[i] += 1
+            grado[j] += 1
+            vecinos[i].append(j)
+            vecinos[j].append(i)
+            aceptadas += 1
+            if aceptadas == m - 1:
+                break
+
+        # Los dos extremos del camino cierran el ciclo
+        i, j = np.flatnonzero(grado < 2).tolist()
+        vecinos[i].append(j)
+        vecinos[j].append(i)
+
+        orden = [0]
+        anterior, actual = 0, vecinos[0][0]
+        while actual != 0:
+            orden.append(actual)
+            siguiente = vecinos[actual][0] if vecinos[actual][0] != anterior else vecinos[actual][1]
+            anterior, actual = actual, siguiente
+
+        inverso = [0] + orden[:0:-1]
+        ida = orden + [0]
+        vuelta = inverso + [0]
+        if costos[vuelta[:-1], vuelta[1:]].sum() < costos[ida[:-1], ida[1:]].sum():
+            return inverso
+        return orden
+
+    @classmethod
+    def construir_ruta(cls, heuristica, matriz_costos, centro_id, tiendas_ids):
+        # [centro, tiendas en el orden construido, centro]
+        constructores = {
+            'vecino_cercano': cls.vecino_mas_cercano,
+            'insercion_barata': cls.insercion_mas_barata,
+            'insercion_lejana': cls.insercion_mas_lejana,
+            'arista_voraz': cls.arista_voraz,
+        }
+        if heuristica not in constructores:
+            raise ValueError(f"Heuristica inicial desconocida: '{heuristica}'")
+        nodos = np.asarray([centro_id] + list(tiendas_ids))
+        orden = constructores[heuristica](cls.submatriz(matriz_costos, nodos))
+        return nodos[orden].tolist() + [centro_id]
+
+    @staticmethod
+    def insertar_mas_barato(ruta, nodo, matriz_costos):
+        # Inserta el nodo entre el par consecutivo (a, b) que minimiza
+        # c(a, nodo) + c(nodo, b) - c(a, b)
+        extremos = np.asarray(ruta)
+        anteriores, siguientes = extremos[:-1], extremos[1:]
+        costos = (np.asarray(matriz_costos[anteriores, nodo], dtype=np.float64) +
+                  np.asarray(matriz_costos[nodo, siguientes], dtype=np.float64) -
+                  np.asarray(matriz_costos[anteriores, siguientes], dtype=np.float64))
+        ruta.insert(int(np.argmin(costos)) + 1, nodo)
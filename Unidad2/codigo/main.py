@@ -62,7 +62,8 @@ def main():
         ResultadosManager.guardar_resultados_archivo(
             resultados, 
             costo_total, 
-            optimizador.data_loader.datos_df
+            optimizador.data_loader.datos_df,
+            segundos_total=optimizador.segundos_totales
         )
         print("\nProceso de optimización completado exitosamente")
         
@@ -0,0 +1,339 @@
+import random
+import numpy as np
+
+# Operadores de vecindario para el recocido simulado.
+# Todos trabajan sobre una ruta [centro, t1, ..., tk, centro]: las posiciones
+# 0 y -1 son el centro de distribucion y nunca se mueven.
+# Cada operador expone:
+#   proponer(ruta)                          -> movimiento (tupla) o None
+#   proponer_con_candidatos(ruta, posicion, candidatos)
+#                                           -> movimiento que crea una arista
+#                                              hacia un vecino candidato, o None
+#   calcular_delta(ruta, matriz, mov)       -> cambio de costo en O(1) (2-opt
+#                                              con costos asimetricos: O(tramo))
+#   aplicar(ruta, mov)                      -> modifica la ruta en sitio
+#   posiciones_afectadas(mov)               -> posiciones cuyo nodo cambio
+# posicion es {nodo: indice en la ruta} para las tiendas; el centro no aparece.
+
+
+class OperadorSwap:
+    # Intercambia dos tiendas de posicion
+    nombre = 'swap'
+
+    @staticmethod
+    def proponer(ruta):
+        if len(ruta) <= 3:
+            return None
+        pos1, pos2 = random.sample(range(1, len(ruta) - 1), 2)
+        return (pos1, pos2) if pos1 < pos2 else (pos2, pos1)
+
+    @staticmethod
+    def proponer_con_candidatos(ruta, posicion, candidatos):
+        # Lleva un vecino candidato de ruta[i] a la posicion contigua a i
+        i = random.randint(1, len(ruta) - 2)
+        pos_vecino = posicion.get(random.choice(candidatos[ruta[i]]))
+        if pos_vecino is None:
+            return None
+        destino = i + 1 if random.random() < 0.5 else i - 1
+        if destino < 1 or destino > len(ruta) - 2 or destino == pos_vecino:
+            return None
+        return (destino, pos_vecino) if destino < pos_vecino else (pos_vecino, destino)
+
+    @staticmethod
+    def calcular_delta(ruta, matriz_costos, movimiento):
+        pos1, pos2 = movimiento
+        a = ruta[pos1]
+        b = ruta[pos2]
+        anterior_a = ruta[pos1 - 1]
+        siguiente_b = ruta[pos2 + 1]
+
+        if pos2 == pos1 + 1:
+            # Posiciones contiguas: comparten la arista (a, b)
+            costo_antes = (matriz_costos[anterior_a, a] + matriz_costos[a, b] +
+                           matriz_costos[b, siguiente_b])
+            costo_despues = (matriz_costos[anterior_a, b] + matriz_costos[b, a] +
+                             matriz_costos[a, siguiente_b])
+        else:
+            siguiente_a = ruta[pos1 + 1]
+            anterior_b = ruta[pos2 - 1]
+            costo_antes = (matriz_costos[anterior_a, a] + matriz_costos[a, siguiente_a] +
+                           matriz_costos[anterior_b, b] + matriz_costos[b, siguiente_b])
+            costo_despues = (matriz_costos[anterior_a, b] + matriz_costos[b, siguiente_a] +
+                             matriz_costos[anterior_b, a] + matriz_costos[a, siguiente_b])
+
+        return costo_despues - costo_antes
+
+    @staticmethod
+    def aplicar(ruta, movimiento):
+        pos1, pos2 = movimiento
+        ruta[pos1], ruta[pos2] = ruta[pos2], ruta[pos1]
+
+    @staticmethod
+    def posiciones_afectadas(movimiento):
+        return movimiento
+
+
+class Operador2Opt:
+    # Invierte el segmento ruta[i..j]; solo cambian las dos aristas de los extremos
+    nombre = '2opt'
+
+    @staticmethod
+    def proponer(ruta):
+        if len(ruta) <= 3:
+            return None
+        i, j = random.sample(range(1, len(ruta) - 1), 2)
+        return (i, j) if i < j else (j, i)
+
+    @staticmethod
+    def proponer_con_candidatos(ruta, posicion, candidatos):
+        # Invierte el tramo necesario para que ruta[i] quede junto a su candidato
+        i = random.randint(1, len(ruta) - 2)
+        pos_vecino = posicion.get(random.choice(candidatos[ruta[i]]))
+        if pos_vecino is None:
+            # El candidato es el centro: llevar ruta[i] al inicio o al final
+            movimiento = (1, i) if random.random() < 0.5 else (i, len(ruta) - 2)
+        elif pos_vecino > i:
+            movimiento = (i + 1, pos_vecino)
+        else:
+            movimiento = (pos_vecino + 1, i)
+        return movimiento if movimiento[0] < movimiento[1] else None
+
+    @staticmethod
+    def calcular_delta(ruta, matriz_costos, movimiento):
+        i, j = movimiento
+        anterior = ruta[i - 1]
+        primero = ruta[i]
+        ultimo = ruta[j]
+        siguiente = ruta[j + 1]
+        return (matriz_costos[anterior, ultimo] + matriz_costos[primero, siguiente] -
+                matriz_costos[anterior, primero] - matriz_costos[ultimo, siguiente])
+
+    @staticmethod
+    def aplicar(ruta, movimiento):
+        i, j = movimiento
+        ruta[i:j + 1] = ruta[i:j + 1][::-1]
+
+    @staticmethod
+    def posiciones_afectadas(movimiento):
+        i, j = movimiento
+        return range(i, j + 1)
+
+
+class Operador2OptAsimetrico(Operador2Opt):
+    # 2-opt para costos asimetricos: las aristas internas del tramo invertido
+    # se recorren en sentido contrario y su costo cambia, el delta es O(tramo)
+    TRAMO_VECTORIZADO = 16
+
+    @staticmethod
+    def calcular_delta(ruta, matriz_costos, movimiento):
+        i, j = movimiento
+        delta = Operador2Opt.calcular_delta(ruta, matriz_costos, movimiento)
+        if j - i > Operador2OptAsimetrico.TRAMO_VECTORIZADO:
+            tramo = np.array(ruta[i:j + 1])
+            return delta + float((matriz_costos[tramo[1:], tramo[:-1]] -
+                                  matriz_costos[tramo[:-1], tramo[1:]]).sum())
+        for p in range(i, j):
+            delta += matriz_costos[ruta[p + 1], ruta[p]] - matriz_costos[ruta[p], ruta[p + 1]]
+        return delta
+
+
+class OperadorOrOpt:
+    # Reubica un segmento de 1 a 3 tiendas entre las posiciones p y p+1
+    nombre = 'or_opt'
+    LONGITUD_MAXIMA = 3
+
+    @classmethod
+    def proponer(cls, ruta):
+        n_tiendas = len(ruta) - 2
+        if n_tiendas < 2:
+            return None
+
+        longitud = random.randint(1, min(cls.LONGITUD_MAXIMA, n_tiendas - 1))
+        i = random.randint(1, n_tiendas - longitud + 1)
+
+        # Las posiciones de insercion validas excluyen i-1 .. i+longitud-1
+        r = random.randint(0, n_tiendas - longitud - 1)
+        p = r if r < i - 1 else r + longitud + 1
+        return (i, longitud, p)
+
+    @classmethod
+    def proponer_con_candidatos(cls, ruta, posicion, candidatos):
+        # Inserta el segmento justo antes o despues de un candidato de su primer nodo
+        n_tiendas = len(ruta) - 2
+        if n_tiendas < 2:
+            return None
+
+        longitud = random.randint(1, min(cls.LONGITUD_MAXIMA, n_tiendas - 1))
+        i = random.randint(1, n_tiendas - longitud + 1)
+        pos_vecino = posicion.get(random.choice(candidatos[ruta[i]]))
+        if pos_vecino is None:
+            p = 0 if random.random() < 0.5 else n_tiendas
+        else:
+            p = pos_vecino if random.random() < 0.5 else pos_vecino - 1
+
+        if i - 1 <= p <= i + longitud - 1:
+            return None
+        return (i, longitud, p)
+
+    @staticmethod
+    def calcular_delta(ruta, matriz_costos, movimiento):
+        i, longitud, p = movimiento
+        anterior = ruta[i - 1]
+        primero = ruta[i]
+        ultimo = ruta[i + longitud - 1]
+        siguiente = ruta[i + longitud]
+        destino_a = ruta[p]
+        destino_b = ruta[p + 1]
+
+        costo_antes = (matriz_costos[anterior, primero] + matriz_costos[ultimo, siguiente] +
+                       matriz_costos[destino_a, destino_b])
+        costo_despues = (matriz_costos[anterior, siguiente] + matriz_costos[destino_a, primero] +
+                         matriz_costos[ultimo, destino_b])
+        return costo_despues - costo_antes
+
+    @staticmethod
+    def aplicar(ruta, movimiento):
+        i, longitud, p = movimiento
+        segmento = ruta[i:i + longitud]
+        if p < i:
+            ruta[p + 1:i + longitud] = segmento + ruta[p + 1:i]
+        else:
+            ruta[i:p + 1] = ruta[i + longitud:p + 1] + segmento
+
+    @staticmethod
+    def posiciones_afectadas(movimiento):
+        i, longitud, p = movimiento
+        return range(p + 1, i + longitud) if p < i else range(i, p + 1)
+
+
+class Operador3Opt:
+    # Intercambio de segmentos adyacentes A=ruta[i..j-1] y B=ruta[j..k] sin
+    # invertirlos (la reconexion 3-opt pura), por eso el delta es O(1)
+    nombre = '3opt'
+
+    @staticmethod
+    def proponer(ruta):
+        if len(ruta) <= 4:
+            return None
+        i, j, k = sorted(random.sample(range(1, len(ruta) - 1), 3))
+        return (i, j, k)
+
+    @staticmethod
+    def proponer_con_candidatos(ruta, posicion, candidatos):
+        # El segmento B comienza en un candidato de ruta[i-1]
+        if len(ruta) <= 4:
+            return None
+        i = random.randint(1, len(ruta) - 3)
+        j = posicion.get(random.choice(candidatos[ruta[i - 1]]))
+        if j is None or j <= i:
+            return None
+        return (i, j, random.randint(j, len(ruta) - 2))
+
+    @staticmethod
+    def calcular_delta(ruta, matriz_costos, movimiento):
+        i, j, k = movimiento
+        anterior = ruta[i - 1]
+        inicio_a = ruta[i]
+        fin_a = ruta[j - 1]
+        inicio_b = ruta[j]
+        fin_b = ruta[k]
+        siguiente = ruta[k + 1]
+
+        costo_antes = (matriz_costos[anterior, inicio_a] + matriz_costos[fin_a, inicio_b] +
+                       matriz_costos[fin_b, siguiente])
+        costo_despues = (matriz_costos[anterior, inicio_b] + matriz_costos[fin_b, inicio_a] +
+                         matriz_costos[fin_a, siguiente])
+        return costo_despues - costo_antes
+
+    @staticmethod
+    def aplicar(ruta, movimiento):
+        i, j, k = movimiento
+        ruta[i:k + 1] = ruta[j:k + 1] + ruta[i:j]
+
+    @staticmethod
+    def posiciones_afectadas(movimiento):
+        i, j, k = movimiento
+        return range(i, k + 1)
+
+
+OPERADORES_MOVIMIENTO = {
+    OperadorSwap.nombre: OperadorSwap,
+    Operador2Opt.nombre: Operador2Opt,
+    OperadorOrOpt.nombre: OperadorOrOpt,
+    Operador3Opt.nombre: Operador3Opt,
+}
+
+
+def matriz_es_simetrica(matriz_costos, nodos):
+    # Compara la submatriz de los nodos con su transpuesta
+    nodos = np.asarray(nodos)
+    submatriz = np.asarray(matriz_costos[np.ix_(nodos, nodos)])
+    return bool(np.array_equal(submatriz, submatriz.T))
+
+
+def obtener_operadores(nombres, simetrica=True):
+    # Con costos asimetricos '2opt' usa el delta que recorre el tramo invertido
+    desconocidos = [nombre for nombre in nombres if nombre not in OPERADORES_MOVIMIENTO]
+    if desconocidos:
+        raise ValueError(
+            f"Operadores desconocidos: {desconocidos}. "
+            f"Disponibles: {list(OPERADORES_MOVIMIENTO)}"
+        )
+    if not nombres:
+        raise ValueError("Se requiere al menos un operador de vecindario")
+    operadores = [OPERADORES_MOVIMIENTO[nombre] for nombre in nombres]
+    if not simetrica:
+        operadores = [Operador2OptAsimetrico if operador is Operador2Opt else operador
+                      for operador in operadores]
+    return operadores
+
+
+class SelectorOperadores:
+    # Seleccion por ruleta con pesos adaptativos: cada operador acumula un
+    # puntaje por sus resultados recientes y el peso se actualiza al final de
+    # cada nivel de temperatura
+    PUNTAJE_MEJOR_GLOBAL = 3.0
+    PUNTAJE_MEJORA = 1.0
+
+    def __init__(self, operadores, adaptativo=True, factor_reaccion=0.1, peso_minimo=0.05):
+        self.operadores = list(operadores)
+        self.adaptativo = adaptativo
+        self.factor_reaccion = factor_reaccion
+        self.peso_minimo = peso_minimo
+        self.pesos = [1.0] * len(self.operadores)
+        self.puntajes = [0.0] * len(self.operadores)
+        self.usos = [0] * len(self.operadores)
+
+    def seleccionar(self):
+        if len(self.operadores) == 1:
+            return 0, self.operadores[0]
+
+        r = random.random() * sum(self.pesos)
+        acumulado = 0.0
+        for indice, peso in enumerate(self.pesos):
+            acumulado += peso
+            if r < acumulado:
+                return indice, self.operadores[indice]
+        return len(self.operadores) - 1, self.operadores[-1]
+
+    def registrar(self, indice, delta_costo, mejor_global):
+        if not self.adaptativo:
+            return
+        self.usos[indice] += 1
+        if mejor_global:
+            self.puntajes[indice] += self.PUNTAJE_MEJOR_GLOBAL
+        elif delta_costo < 0:
+            self.puntajes[indice] += self.PUNTAJE_MEJORA
+
+    def actualizar_pesos(self):
+        if not self.adaptativo:
+            return
+        for indice in range(len(self.operadores)):
+            if self.usos[indice] == 0:
+                continue
+            rendimiento = self.puntajes[indice] / self.usos[indice]
+            peso = ((1 - self.factor_reaccion) * self.pesos[indice] +
+                    self.factor_reaccion * rendimiento)
+            self.pesos[indice] = max(peso, self.peso_minimo)
+            self.puntajes[indice] = 0.0
+            self.usos[indice] = 0
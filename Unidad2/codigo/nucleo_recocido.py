@@ -0,0 +1,451 @@
+import math
+import random
+import numpy as np
+from movimientos import SelectorOperadores, obtener_operadores, matriz_es_simetrica
+from config import (
+    INTERVALO_VERIFICACION_COSTO,
+    TOLERANCIA_VERIFICACION_COSTO,
+    OPERADORES_VECINDARIO,
+    SELECCION_ADAPTATIVA_OPERADORES,
+    FACTOR_REACCION_OPERADORES,
+    PESO_MINIMO_OPERADOR,
+    MUESTRAS_CALIBRACION,
+    ACEPTACION_INICIAL_OBJETIVO
+)
+
+# Nucleo del recocido sobre arreglos: la ruta es un arreglo int32 que se
+# modifica en sitio y los numeros aleatorios de cada nivel se generan de una
+# vez con un generador de NumPy. Si Numba esta instalado las funciones se
+# compilan; si no, el mismo codigo se ejecuta en Python puro, por eso con la
+# misma semilla ambos dan exactamente la misma ruta.
+try:
+    from numba import njit
+    NUMBA_DISPONIBLE = True
+except ImportError:
+    NUMBA_DISPONIBLE = False
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda funcion: funcion
+
+CODIGO_SWAP = 0
+CODIGO_2OPT = 1
+CODIGO_OR_OPT = 2
+CODIGO_3OPT = 3
+# 2-opt con costos asimetricos (delta O(tramo)); lo elige la cadena, no config.py
+CODIGO_2OPT_ASIMETRICO = 4
+CODIGOS_OPERADORES = {
+    'swap': CODIGO_SWAP,
+    '2opt': CODIGO_2OPT,
+    'or_opt': CODIGO_OR_OPT,
+    '3opt': CODIGO_3OPT,
+}
+LONGITUD_MAXIMA_OR_OPT = 3
+# Numeros aleatorios por propuesta: operador, hasta 4 para el movimiento y aceptacion
+ALEATORIOS_POR_PROPUESTA = 6
+
+_aviso_mostrado = False
+
+
+@njit(cache=True)
+def costo_ruta(ruta, matriz_costos):
+    costo = 0.0
+    for i in range(len(ruta) - 1):
+        costo += matriz_costos[ruta[i], ruta[i + 1]]
+    return costo
+
+
+@njit(cache=True)
+def _dos_posiciones(n, u1, u2):
+    # Dos posiciones distintas y ordenadas entre 1 y n
+    p1 = 1 + int(u1 * n)
+    p2 = 1 + int(u2 * (n - 1))
+    if p2 >= p1:
+        p2 += 1
+    if p1 < p2:
+        return p1, p2
+    return p2, p1
+
+
+@njit(cache=True)
+def proponer(codigo, ruta, u, candidatos, usar_candidatos, posicion):
+    # Devuelve (valido, a, b, c) con la misma semantica que los operadores
+    # de movimientos.py; u[1..4] son los numeros aleatorios de la propuesta
+    n = len(ruta) - 2
+    k = candidatos.shape[1]
+
+    if codigo == CODIGO_2OPT_ASIMETRICO:
+        codigo = CODIGO_2OPT
+    if codigo == CODIGO_SWAP or codigo == CODIGO_2OPT:
+        if n < 2:
+            return False, 0, 0, 0
+        if not usar_candidatos:
+            a, b = _dos_posiciones(n, u[1], u[2])
+            return True, a, b, 0
+        i = 1 + int(u[1] * n)
+        pos_vecino = posicion[candidatos[ruta[i], int(u[2] * k)]]
+        if codigo == CODIGO_SWAP:
+            if pos_vecino < 0:
+                return False, 0, 0, 0
+            destino = i + 1 if u[3] < 0.5 else i - 1
+            if destino < 1 or destino > n or destino == pos_vecino:
+                return False, 0, 0, 0
+            if destino < pos_vecino:
+                return True, destino, pos_vecino, 0
+            return True, pos_vecino, destino, 0
+        if pos_vecino < 0:
+            if u[3] < 0.5:
+                a, b = 1, i
+            else:
+                a, b = i, n
+        elif pos_vecino > i:
+            a, b = i + 1, pos_vecino
+        else:
+            a, b = pos_vecino + 1, i
+        return a < b, a, b, 0
+
+    if codigo == CODIGO_OR_OPT:
+        if n < 2:
+            return False, 0, 0, 0
+        longitud = 1 + int(u[1] * min(LONGITUD_MAXIMA_OR_OPT, n - 1))
+        i = 1 + int(u[2] * (n - longitud + 1))
+        if not usar_candidatos:
+            r = int(u[3] * (n - longitud))
+            p = r if r < i - 1 else r + longitud + 1
+            return True, i, longitud, p
+        pos_vecino = posicion[candidatos[ruta[i], int(u[3] * k)]]
+        if pos_vecino < 0:
+            p = 0 if u[4] < 0.5 else n
+        else:
+            p = pos_vecino if u[4] < 0.5 else pos_vecino - 1
+        if i - 1 <= p <= i + longitud - 1:
+            return False, 0, 0, 0
+        return True, i, longitud, p
+
+    # 3-opt: intercambio de los segmentos ruta[i..j-1] y ruta[j..k]
+    if n < 3:
+        return False, 0, 0, 0
+    if not usar_candidatos:
+        x, y = _dos_posiciones(n, u[1], u[2])
+        z = 1 + int(u[3] * (n - 2))
+        if z >= x:
+            z += 1
+        if z >= y:
+            z += 1
+        if z < x:
+            return True, z, x, y
+        if z < y:
+            return True, x, z, y
+        return True, x, y, z
+    i = 1 + int(u[1] * (n - 1))
+    j = posicion[candidatos[ruta[i - 1], int(u[2] * k)]]
+    if j < 0 or j <= i:
+        return False, 0, 0, 0
+    return True, i, j, j + int(u[3] * (n - j + 1))
+
+
+@njit(cache=True)
+def calcular_delta(codigo, ruta, matriz_costos, a, b, c):
+    m = matriz_costos
+    if codigo == CODIGO_SWAP:
+        x = ruta[a]
+        y = ruta[b]
+        anterior_x = ruta[a - 1]
+        siguiente_y = ruta[b + 1]
+        if b == a + 1:
+            costo_antes = m[anterior_x, x] + m[x, y] + m[y, siguiente_y]
+            costo_despues = m[anterior_x, y] + m[y, x] + m[x, siguiente_y]
+        else:
+            siguiente_x = ruta[a + 1]
+            anterior_y = ruta[b - 1]
+            costo_antes = (m[anterior_x, x] + m[x, siguiente_x] +
+                           m[anterior_y, y] + m[y, siguiente_y])
+            costo_despues = (m[anterior_x, y] + m[y, siguiente_x] +
+                             m[anterior_y, x] + m[x, siguiente_y])
+        return costo_despues - costo_antes
+
+    if codigo == CODIGO_2OPT or codigo == CODIGO_2OPT_ASIMETRICO:
+        anterior = ruta[a - 1]
+        primero = ruta[a]
+        ultimo = ruta[b]
+        siguiente = ruta[b + 1]
+        delta = (m[anterior, ultimo] + m[primero, siguiente] -
+                 m[anterior, primero] - m[ultimo, siguiente])
+        if codigo == CODIGO_2OPT_ASIMETRICO:
+            for p in range(a, b):
+                delta += m[ruta[p + 1], ruta[p]] - m[ruta[p], ruta[p + 1]]
+        return delta
+
+    if codigo == CODIGO_OR_OPT:
+        i, longitud, p = a, b, c
+        anterior = ruta[i - 1]
+        primero = ruta[i]
+        ultimo = ruta[i + longitud - 1]
+        siguiente = ruta[i + longitud]
+        destino_a = ruta[p]
+        destino_b = ruta[p + 1]
+        costo_antes = m[anterior, primero] + m[ultimo, siguiente] + m[destino_a, destino_b]
+        costo_despues = m[anterior, siguiente] + m[destino_a, primero] + m[ultimo, destino_b]
+        return costo_despues - costo_antes
+
+    i, j, k = a, b, c
+    anterior = ruta[i - 1]
+    inicio_a = ruta[i]
+    fin_a = ruta[j - 1]
+    inicio_b = ruta[j]
+    fin_b = ruta[k]
+    siguiente = ruta[k + 1]
+    costo_antes = m[anterior, inicio_a] + m[fin_a, inicio_b] + m[fin_b, siguiente]
+    costo_despues = m[anterior, inicio_b] + m[fin_b, inicio_a] + m[fin_a, siguiente]
+    return costo_despues - costo_antes
+
+
+@njit(cache=True)
+def _invertir(ruta, inicio, fin):
+    while inicio < fin:
+        ruta[inicio], ruta[fin] = ruta[fin], ruta[inicio]
+        inicio += 1
+        fin -= 1
+
+
+@njit(cache=True)
+def _intercambiar_bloques(ruta, inicio, medio, fin):
+    # ruta[inicio..medio-1] + ruta[medio..fin] -> ruta[medio..fin] + ruta[inicio..medio-1]
+    # con tres inversiones, sin memoria auxiliar
+    _invertir(ruta, inicio, medio - 1)
+    _invertir(ruta, medio, fin)
+    _invertir(ruta, inicio, fin)
+
+
+@njit(cache=True)
+def aplicar(codigo, ruta, a, b, c, posicion, usar_candidatos):
+    # Aplica el movimiento en sitio y actualiza la posicion de las tiendas movidas
+    if codigo == CODIGO_SWAP:
+        ruta[a], ruta[b] = ruta[b], ruta[a]
+        inicio, fin = a, b
+    elif codigo == CODIGO_2OPT or codigo == CODIGO_2OPT_ASIMETRICO:
+        _invertir(ruta, a, b)
+        inicio, fin = a, b
+    elif codigo == CODIGO_OR_OPT:
+        i, longitud, p = a, b, c
+        if p < i:
+            _intercambiar_bloques(ruta, p + 1, i, i + longitud - 1)
+            inicio, fin = p + 1, i + longitud - 1
+        else:
+            _intercambiar_bloques(ruta, i, i + longitud, p)
+            inicio, fin = i, p
+    else:
+        _intercambiar_bloques(ruta, a, b, c)
+        inicio, fin = a, c
+
+    if usar_candidatos:
+        for pos in range(inicio, fin + 1):
+            posicion[ruta[pos]] = pos
+
+
+@njit(cache=True)
+def _seleccionar_operador(pesos, u):
+    r = u * pesos.sum()
+    acumulado = 0.0
+    for indice in range(len(pesos)):
+        acumulado += pesos[indice]
+        if r < acumulado:
+            return indice
+    return len(pesos) - 1
+
+
+@njit(cache=True)
+def ejecutar_nivel(ruta, ruta_mejor, matriz_costos, t, aleatorios, pesos, codigos,
+                   candidatos, usar_candidatos, posicion, puntajes, usos,
+                   costo_actual, costo_mejor, mejor_pendiente, intervalo_verificacion,
+                   movimientos_aplicados):
+    # Un nivel de temperatura (una fila de aleatorios por iteracion). Los
+    # puntajes y usos de los operadores se acumulan en los arreglos recibidos.
+    # Con mejor_pendiente la mejor ruta es la actual y ruta_mejor aun no la
+    # tiene: se copia solo antes de aceptar un movimiento que empeora.
+    mejoras = 0
+    propuestos = 0
+    peores_propuestos = 0
+    peores_aceptados = 0
+    discrepancia_maxima = 0.0
+
+    for it in range(aleatorios.shape[0]):
+        if costo_mejor == 0:
+            break
+        u = aleatorios[it]
+        indice = _seleccionar_operador(pesos, u[0])
+        codigo = codigos[indice]
+        valido, a, b, c = proponer(codigo, ruta, u, candidatos, usar_candidatos, posicion)
+        if not valido:
+            continue
+        propuestos += 1
+
+        delta_costo = calcular_delta(codigo, ruta, matriz_costos, a, b, c)
+
+        if delta_costo < 0:
+            aceptar = True
+        else:
+            probabilidad = math.exp(-delta_costo / t) if t > 0 else 0.0
+            aceptar = u[5] < probabilidad
+            if delta_costo > 0:
+                peores_propuestos += 1
+                if aceptar:
+                    peores_aceptados += 1
+
+        usos[indice] += 1
+        if not aceptar:
+            continue
+
+        if mejor_pendiente and delta_costo > 0:
+            ruta_mejor[:] = ruta
+            mejor_pendiente = False
+        aplicar(codigo, ruta, a, b, c, posicion, usar_candidatos)
+        # float() mantiene el acumulado en doble precision aunque la matriz sea float32
+        costo_actual += float(delta_costo)
+        movimientos_aplicados += 1
+
+        if intervalo_verificacion > 0 and movimientos_aplicados % intervalo_verificacion == 0:
+            costo_real = costo_ruta(ruta, matriz_costos)
+            discrepancia_maxima = max(discrepancia_maxima, abs(costo_real - costo_actual))
+            costo_actual = costo_real
+
+        if costo_actual < costo_mejor:
+            puntajes[indice] += 3.0
+            mejor_pendiente = True
+            costo_mejor = costo_actual
+            mejoras += 1
+        elif delta_costo < 0:
+            puntajes[indice] += 1.0
+
+    return (costo_actual, costo_mejor, mejor_pendiente, mejoras, movimientos_aplicados,
+            propuestos, peores_propuestos, peores_aceptados, discrepancia_maxima)
+
+
+@njit(cache=True)
+def muestrear_deltas(ruta, matriz_costos, aleatorios, pesos, codigos,
+                     candidatos, usar_candidatos, posicion):
+    # Suma y cantidad de los deltas positivos de movimientos propuestos sin aplicar
+    suma = 0.0
+    cantidad = 0
+    for it in range(aleatorios.shape[0]):
+        u = aleatorios[it]
+        codigo = codigos[_seleccionar_operador(pesos, u[0])]
+        valido, a, b, c = proponer(codigo, ruta, u, candidatos, usar_candidatos, posicion)
+        if not valido:
+            continue
+        delta_costo = calcular_delta(codigo, ruta, matriz_costos, a, b, c)
+        if delta_costo > 0:
+            suma += float(delta_costo)
+            cantidad += 1
+    return suma, cantidad
+
+
+class CadenaRecocidoCompilada:
+    # Misma interfaz que CadenaRecocido, con el estado en arreglos de NumPy y
+    # los niveles ejecutados por el nucleo. El generador de NumPy se siembra
+    # desde el modulo random, asi la semilla de la zona tambien lo fija.
+
+    def __init__(self, ruta_inicial, matriz_costos, operadores=None,
+                 intervalo_verificacion=INTERVALO_VERIFICACION_COSTO, candidatos=None):
+        global _aviso_mostrado
+        if not NUMBA_DISPONIBLE and not _aviso_mostrado:
+            print("    Aviso: Numba no está instalado, el núcleo del recocido se ejecuta "
+                  "en Python puro (mismos resultados, más lento)")
+            _aviso_mostrado = True
+
+        self.matriz_costos = np.asarray(matriz_costos)
+        self.ruta = np.asarray(ruta_inicial, dtype=np.int32)
+        self._ruta_mejor = self.ruta.copy()
+        self.mejor_pendiente = False
+        self.costo = float(costo_ruta(self.ruta, self.matriz_costos))
+        self.costo_mejor = self.costo
+        self.mejoras = 0
+        self.movimientos_aplicados = 0
+        self.propuestos = 0
+        self.peores_propuestos = 0
+        self.peores_aceptados = 0
+        self.tasa_aceptacion = 0.0
+        self.intervalo_verificacion = intervalo_verificacion or 0
+        self.sin_movimientos = len(ruta_inicial) <= 3
+        self.selector = SelectorOperadores(
+            obtener_operadores(operadores or OPERADORES_VECINDARIO),
+            adaptativo=SELECCION_ADAPTATIVA_OPERADORES,
+            factor_reaccion=FACTOR_REACCION_OPERADORES,
+            peso_minimo=PESO_MINIMO_OPERADOR
+        )
+        self.codigos = np.array(
+            [CODIGOS_OPERADORES[operador.nombre] for operador in self.selector.operadores],
+            dtype=np.int64
+        )
+        if not matriz_es_simetrica(self.matriz_costos, self.ruta[:-1]):
+            self.codigos[self.codigos == CODIGO_2OPT] = CODIGO_2OPT_ASIMETRICO
+
+        # Candidatos como matriz (nodo, k); posicion[nodo] = -1 fuera de la ruta o centro
+        self.usar_candidatos = candidatos is not None
+        self.posicion = np.full(self.matriz_costos.shape[0], -1, dtype=np.int32)
+        if self.usar_candidatos:
+            num_vecinos = min(len(vecinos) for vecinos in candidatos.values())
+            self.candidatos = np.zeros((self.matriz_costos.shape[0], num_vecinos), dtype=np.int32)
+            for nodo, vecinos in candidatos.items():
+                self.candidatos[nodo] = vecinos[:num_vecinos]
+            self.posicion[self.ruta[1:-1]] = np.arange(1, len(self.ruta) - 1, dtype=np.int32)
+        else:
+            self.candidatos = np.zeros((1, 1), dtype=np.int32)
+
+        self.generador = np.random.default_rng(random.getrandbits(64))
+
+    def consolidar_mejor(self):
+        if self.mejor_pendiente:
+            self._ruta_mejor[:] = self.ruta
+            self.mejor_pendiente = False
+
+    @property
+    def ruta_mejor(self):
+        self.consolidar_mejor()
+        return self._ruta_mejor.tolist()
+
+    def ejecutar_nivel(self, matriz_costos, t, L):
+        selector = self.selector
+        puntajes = np.zeros(len(self.codigos))
+        usos = np.zeros(len(self.codigos), dtype=np.int64)
+        aleatorios = self.generador.random((L, ALEATORIOS_POR_PROPUESTA))
+
+        (costo, costo_mejor, self.mejor_pendiente, mejoras, movimientos_aplicados,
+         propuestos, peores_propuestos, peores_aceptados, discrepancia) = ejecutar_nivel(
+            self.ruta, self._ruta_mejor, self.matriz_costos, float(t), aleatorios,
+            np.asarray(selector.pesos, dtype=np.float64), self.codigos,
+            self.candidatos, self.usar_candidatos, self.posicion, puntajes, usos,
+            self.costo, self.costo_mejor, self.mejor_pendiente,
+            self.intervalo_verificacion, self.movimientos_aplicados
+        )
+        self.costo = float(costo)
+        self.costo_mejor = float(costo_mejor)
+        self.movimientos_aplicados = int(movimientos_aplicados)
+        self.mejoras += int(mejoras)
+        self.propuestos += int(propuestos)
+        self.peores_propuestos += int(peores_propuestos)
+        self.peores_aceptados += int(peores_aceptados)
+        self.tasa_aceptacion = peores_aceptados / peores_propuestos if peores_propuestos else 0.0
+
+        if discrepancia > TOLERANCIA_VERIFICACION_COSTO:
+            print(f"        Advertencia: el costo incremental difirió hasta {discrepancia:.6f} "
+                  f"del real, se corrige")
+
+        if selector.adaptativo:
+            for indice in range(len(self.codigos)):
+                selector.puntajes[indice] += float(puntajes[indice])
+                selector.usos[indice] += int(usos[indice])
+        selector.actualizar_pesos()
+
+    def calibrar_temperatura(self, matriz_costos, num_muestras=MUESTRAS_CALIBRACION,
+                             aceptacion_objetivo=ACEPTACION_INICIAL_OBJETIVO):
+        suma, cantidad = muestrear_deltas(
+            self.ruta, self.matriz_costos,
+            self.generador.random((num_muestras, ALEATORIOS_POR_PROPUESTA)),
+            np.asarray(self.selector.pesos, dtype=np.float64), self.codigos,
+            self.candidatos, self.usar_candidatos, self.posicion
+        )
+        if cantidad == 0:
+            return None
+        return -(suma / cantidad) / math.log(aceptacion_objetivo)
@@ -0,0 +1,237 @@
+import os
+import xml.etree.ElementTree as ET
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from scipy import sparse
+from scipy.sparse import csgraph
+from scipy.spatial import cKDTree
+from config import (
+    ARCHIVO_RED_VIAL,
+    TIPOS_VIA_RED_VIAL,
+    FUENTES_POR_BLOQUE_DIJKSTRA,
+    NUM_PROCESOS
+)
+
+RADIO_TIERRA_KM = 6371
+
+# Grafo de cada proceso trabajador: se recibe una sola vez al crear el pool
+_grafo_worker = None
+_destinos_worker = None
+
+
+def _inicializar_worker(datos, indices, indptr, num_nodos, destinos):
+    global _grafo_worker, _destinos_worker
+    _grafo_worker = sparse.csr_matrix((datos, indices, indptr), shape=(num_nodos, num_nodos))
+    _destinos_worker = destinos
+
+
+def _distancias_bloque(fuentes):
+    # Dijkstra desde cada fuente sobre todo el grafo; solo se devuelven las
+    # columnas de los destinos (fuentes x destinos)
+    distancias = csgraph.dijkstra(_grafo_worker, directed=True, indices=fuentes)
+    return distancias[:, _destinos_worker]
+
+
+def _haversine_vector(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = (np.sin((lat2 - lat1) / 2) ** 2 +
+         np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * np.arcsin(np.sqrt(a)) * RADIO_TIERRA_KM
+
+
+def _coordenadas_esfera(latitudes, longitudes):
+    # Puntos sobre la esfera unitaria: la distancia euclidiana (cuerda) ordena
+    # igual que la distancia sobre la superficie y sirve para el KD-tree
+    lat = np.radians(np.asarray(latitudes, dtype=np.float64))
+    lon = np.radians(np.asarray(longitudes, dtype=np.float64))
+    return np.column_stack((np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)))
+
+
+class RedVial:
+    # Grafo dirigido de calles leido de un extracto local de OpenStreetMap
+    # (.osm en XML), sin servicios externos. Los nodos son los de OSM que
+    # aparecen en alguna via de TIPOS_VIA_RED_VIAL, renumerados 0..n-1, y las
+    # aristas los tramos entre nodos consecutivos de cada via con su longitud
+    # en km (en ambos sentidos salvo vias de un solo sentido). Se guarda como
+    # matriz dispersa CSR.
+    # Las ubicaciones se conectan al nodo mas cercano de la componente
+    # fuertemente conexa mas grande, asi toda ubicacion alcanza a las demas.
+
+    SENTIDO_UNICO = ('yes', 'true', '1')
+
+    def __init__(self, grafo, latitudes, longitudes):
+        self.grafo = grafo.tocsr()
+        self.latitudes = np.asarray(latitudes, dtype=np.float64)
+        self.longitudes = np.asarray(longitudes, dtype=np.float64)
+
+        _, componentes = csgraph.connected_components(self.grafo, directed=True, connection='strong')
+        self.nodos_conectados = np.flatnonzero(componentes == np.bincount(componentes).argmax())
+        self._arbol = cKDTree(_coordenadas_esfera(
+            self.latitudes[self.nodos_conectados], self.longitudes[self.nodos_conectados]
+        ))
+
+    @property
+    def num_nodos(self):
+        return self.grafo.shape[0]
+
+    @classmethod
+    def desde_osm(cls, archivo=ARCHIVO_RED_VIAL, tipos_via=TIPOS_VIA_RED_VIAL):
+        # Lectura en flujo con iterparse: cada elemento se libera al terminar
+        # de procesarlo, la memoria crece con los nodos y tramos, no con el XML
+        ids_nodo, lat_nodo, lon_nodo = array('q'), array('d'), array('d')
+        origenes, destinos, sentido = array('q'), array('q'), array('b')
+        tipos_via = set(tipos_via)
+
+        raiz, via, etiquetas = None, [], {}
+        for evento, elemento in ET.iterparse(archivo, events=('start', 'end')):
+            if evento == 'start':
+                if raiz is None:
+                    raiz = elemento
+                elif elemento.tag == 'way':
+                    via, etiquetas = [], {}
+                continue
+            if elemento.tag == 'node':
+                ids_nodo.append(int(elemento.get('id')))
+                lat_nodo.append(float(elemento.get('lat')))
+                lon_nodo.append(float(elemento.get('lon')))
+            elif elemento.tag == 'nd':
+                via.append(int(elemento.get('ref')))
+            elif elemento.tag == 'tag':
+                etiquetas[elemento.get('k')] = elemento.get('v')
+            elif elemento.tag == 'way':
+                if etiquetas.get('highway') in tipos_via and len(via) > 1:
+                    unico = etiquetas.get('oneway')
+                    if unico in cls.SENTIDO_UNICO or etiquetas.get('junction') == 'roundabout':
+                        direccion = 1
+                    elif unico == '-1':
+                        direccion = -1
+                    else:
+                        direccion = 0
+                    origenes.extend(via[:-1])
+                    destinos.extend(via[1:])
+                    sentido.extend([direccion] * (len(via) - 1))
+            if elemento.tag in ('node', 'way', 'relation'):
+                # La raiz conserva a sus hijos ya leidos aunque esten vacios
+                raiz.clear()
+
+        return cls._construir(
+            np.frombuffer(ids_nodo, dtype=np.int64), np.frombuffer(lat_nodo), np.frombuffer(lon_nodo),
+            np.frombuffer(origenes, dtype=np.int64), np.frombuffer(destinos, dtype=np.int64),
+            np.frombuffer(sentido, dtype=np.int8)
+        )
+
+    @classmethod
+    def _construir(cls, ids_nodo, lat_nodo, lon_nodo, origenes, destinos, sentido):
+        # Solo se conservan los nodos usados por las vias, renumerados en el
+        # orden de sus ids de OSM
+        usados = np.unique(np.concatenate((origenes, destinos)))
+        orden = np.argsort(ids_nodo)
+        posicion = np.searchsorted(ids_nodo[orden], usados)
+        encontrados = (posicion < len(orden)) & (ids_nodo[orden][np.minimum(posicion, len(orden) - 1)] == usados)
+        if not encontrados.all():
+            # Extracto recortado: hay vias que citan nodos fuera del archivo
+            usados = usados[encontrados]
+            posicion = posicion[encontrados]
+            validos = np.isin(origenes, usados) & np.isin(destinos, usados)
+            origenes, destinos, sentido = origenes[validos], destinos[validos], sentido[validos]
+        fila = orden[posicion]
+        latitudes, longitudes = lat_nodo[fila], lon_nodo[fila]
+
+        u = np.searchsorted(usados, origenes)
+        v = np.searchsorted(usados, destinos)
+        longitud = _haversine_vector(latitudes[u], longitudes[u], latitudes[v], longitudes[v])
+
+        # Sentido 1: u -> v; -1: v -> u; 0: ambos
+        hacia = sentido >= 0
+        regreso = sentido <= 0
+        filas = np.concatenate((u[hacia], v[regreso]))
+        columnas = np.concatenate((v[hacia], u[regreso]))
+        pesos = np.concatenate((longitud[hacia], longitud[regreso]))
+
+        # Tramos repetidos: se conserva el mas corto (csr_matrix los sumaria)
+        orden_tramos = np.lexsort((pesos, columnas, filas))
+        filas, columnas, pesos = filas[orden_tramos], columnas[orden_tramos], pesos[orden_tramos]
+        primeros = np.ones(len(filas), dtype=bool)
+        primeros[1:] = (filas[1:] != filas[:-1]) | (columnas[1:] != columnas[:-1])
+        # Un peso 0 en CSR se confunde con "sin arista": nodos con las mismas coordenadas
+        pesos = np.maximum(pesos[primeros], 1e-9)
+
+        n = len(usados)
+        grafo = sparse.csr_matrix((pesos, (filas[primeros], columnas[primeros])), shape=(n, n))
+        return cls(grafo, latitudes, longitudes)
+
+    @classmethod
+    def cargar(cls, archivo=ARCHIVO_RED_VIAL, tipos_via=TIPOS_VIA_RED_VIAL):
+        # El grafo leido se guarda en archivo + '.npz' y se reutiliza mientras
+        # el .osm no sea mas reciente (la lectura del XML es lo mas lento)
+        archivo_grafo = archivo + '.npz'
+        if (os.path.exists(archivo_grafo) and
+                os.path.getmtime(archivo_grafo) >= os.path.getmtime(archivo)):
+            with np.load(archivo_grafo) as datos:
+                if sorted(datos['tipos_via'].tolist()) == sorted(tipos_via):
+                    n = len(datos['latitudes'])
+                    grafo = sparse.csr_matrix(
+                        (datos['pesos'], datos['indices'], datos['indptr']), shape=(n, n)
+                    )
+                    return cls(grafo, datos['latitudes'], datos['longitudes'])
+
+        red = cls.desde_osm(archivo, tipos_via)
+        temporal = archivo_grafo + '.tmp'
+        with open(temporal, 'wb') as f:
+            np.savez(f, pesos=red.grafo.data, indices=red.grafo.indices, indptr=red.grafo.indptr,
+                     latitudes=red.latitudes, longitudes=red.longitudes,
+                     tipos_via=np.array(sorted(tipos_via)))
+        os.replace(temporal, archivo_grafo)
+        return red
+
+    def ajustar_ubicaciones(self, latitudes, longitudes):
+        # (nodo del grafo, km en linea recta hasta el) de cada ubicacion
+        cuerdas, posiciones = self._arbol.query(_coordenadas_esfera(latitudes, longitudes))
+        acceso_km = 2 * np.arcsin(np.minimum(cuerdas / 2, 1.0)) * RADIO_TIERRA_KM
+        return self.nodos_conectados[posiciones], acceso_km
+
+    def _entre_nodos(self, grafo, fuentes, destinos, num_procesos, fuentes_por_bloque):
+        # Dijkstra desde cada fuente en bloques de fuentes_por_bloque repartidos
+        # entre procesos; cada bloque ocupa fuentes_por_bloque x nodos del grafo
+        # en memoria temporal. Devuelve fuentes x destinos
+        bloques = [fuentes[i:i + fuentes_por_bloque] for i in range(0, len(fuentes), fuentes_por_bloque)]
+        argumentos = (grafo.data, grafo.indices, grafo.indptr, self.num_nodos, destinos)
+        num_procesos = min(num_procesos or os.cpu_count() or 1, len(bloques))
+        if num_procesos <= 1:
+            _inicializar_worker(*argumentos)
+            resultados = [_distancias_bloque(bloque) for bloque in bloques]
+        else:
+            with ProcessPoolExecutor(max_workers=num_procesos, initializer=_inicializar_worker,
+                                     initargs=argumentos) as executor:
+                resultados = list(executor.map(_distancias_bloque, bloques))
+        return np.vstack(resultados) if resultados else np.zeros((0, len(destinos)))
+
+    def matriz_distancias(self, latitudes, longitudes, num_procesos=NUM_PROCESOS,
+                          fuentes_por_bloque=FUENTES_POR_BLOQUE_DIJKSTRA, tipo_dato='float64'):
+        # Distancia por calles entre cada par de ubicaciones: tramo recto hasta
+        # su nodo + camino mas corto + tramo recto desde el nodo de destino.
+        # Un Dijkstra por nodo de origen distinto. Puede ser asimetrica si hay
+        # vias de un solo sentido.
+        nodos, acceso_km = self.ajustar_ubicaciones(latitudes, longitudes)
+        unicos, inversa = np.unique(nodos, return_inverse=True)
+        entre_nodos = self._entre_nodos(self.grafo, unicos, unicos, num_procesos, fuentes_por_bloque)
+
+        matriz = entre_nodos[inversa[:, None], inversa[None, :]]
+        matriz += acceso_km[:, None] + acceso_km[None, :]
+        np.fill_diagonal(matriz, 0.0)
+        return matriz.astype(tipo_dato, copy=False)
+
+    def distancias_entre(self, lat_origen, lon_origen, lat_destino, lon_destino, hacia_origen=False,
+                         num_procesos=NUM_PROCESOS, fuentes_por_bloque=FUENTES_POR_BLOQUE_DIJKSTRA):
+        # Distancias de pocas ubicaciones (origen) a muchas (destino), con un
+        # Dijkstra por origen: origenes x destinos. Con hacia_origen=True son
+        # las distancias desde cada destino hasta cada origen (mismo orden de
+        # ejes), calculadas sobre el grafo con las aristas invertidas.
+        # Para la misma ubicacion en ambos lados la distancia no se anula.
+        nodos_origen, acceso_origen = self.ajustar_ubicaciones(lat_origen, lon_origen)
+        nodos_destino, acceso_destino = self.ajustar_ubicaciones(lat_destino, lon_destino)
+        unicos, inversa = np.unique(nodos_origen, return_inverse=True)
+        grafo = self.grafo.T.tocsr() if hacia_origen else self.grafo
+        entre_nodos = self._entre_nodos(grafo, unicos, nodos_destino, num_procesos, fuentes_por_bloque)
+        return entre_nodos[inversa] + acceso_origen[:, None] + acceso_destino[None, :]
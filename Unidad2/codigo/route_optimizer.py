@@ -1,11 +1,35 @@
+import time
 from data_loader import DataLoader
+from ejecucion_paralela import (
+    EjecutorZonasParalelo,
+    optimizar_zona_con_semilla,
+    cadenas_por_zona,
+    crear_estrategia,
+    evento_progreso
+)
+from cvrp import RuteoCapacitado
+from arranque_caliente import ArranqueCaliente
+from heuristicas_constructivas import HEURISTICAS_INICIALES
+from cota_inferior import CotaInferior
 from simulated_annealing import SimulatedAnnealing
 from config import (
     TEMPERATURA_INICIAL,
     TASA_ENFRIAMIENTO,
     TEMP_FINAL,
     L_ITERACIONES,
-    MOSTRAR_PROGRESO
+    MOSTRAR_PROGRESO,
+    MODO_EJECUCION,
+    NUM_PROCESOS,
+    SEMILLA_ALEATORIA,
+    CALIBRAR_TEMPERATURA_INICIAL,
+    TIEMPO_LIMITE_TOTAL,
+    TIEMPO_LIMITE_ZONA,
+    ARRANQUE_CALIENTE,
+    ARCHIVO_RUTAS_PREVIAS,
+    HEURISTICA_INICIAL,
+    CALCULAR_COTA_INFERIOR,
+    BRECHA_PARADA,
+    ESTADISTICAS_RECOCIDO
 )
 
 class RouteOptimizer:
@@ -13,65 +37,251 @@ class RouteOptimizer:
         self.data_loader = DataLoader()
         self.resultados_zonas = {}
         self.costo_total_optimizado = 0
+        self.segundos_totales = None
+        self.segundos_zona = {}
+        # {zona_id: EstadisticasRecocido}: costos inicial y final de cada zona,
+        # y los contadores del recocido con ESTADISTICAS_RECOCIDO
+        self.estadisticas_zona = {}
     
     def cargar_datos(self):
         return self.data_loader.cargar_todos_los_datos()
     
-    def optimizar_rutas_por_zonas(self, temp_inicial=None, tasa_enfriamiento=None):
+    def matriz_optimizacion(self):
+        # Costos que minimiza el recocido: CostosPorHora en modo 'horario',
+        # si no la matriz combinada
+        if self.data_loader.costos_horarios is not None:
+            return self.data_loader.costos_horarios
+        return self.data_loader.costo_total_matrix
+    
+    def optimizar_rutas_por_zonas(self, temp_inicial=None, tasa_enfriamiento=None,
+                                  modo_ejecucion=None, num_procesos=None,
+                                  modo_cadenas=None, num_cadenas=None,
+                                  modo_ruteo=None, capacidad_vehiculo=None,
+                                  tiempo_limite=None, tiempo_limite_zona=None,
+                                  callback_progreso=None, arranque_caliente=None,
+                                  archivo_rutas_previas=None, heuristica_inicial=None,
+                                  brecha_parada=None, semilla=None):
+        # tiempo_limite: segundos de reloj para todas las zonas, repartidos en
+        # proporcion a sus tiendas; tiempo_limite_zona: tope por zona. Al vencer
+        # el plazo cada zona devuelve la mejor ruta encontrada hasta ese momento.
+        # callback_progreso(evento) recibe dicts con zona, cadena, costo_mejor,
+        # temperatura, terminada y segundos transcurridos.
+        # arranque_caliente: partir de las rutas de archivo_rutas_previas.
+        # heuristica_inicial: ruta inicial de las demas zonas (ver config.py).
+        # brecha_parada: detener cada zona al quedar a esa brecha de su cota inferior.
+        # semilla: reemplaza a SEMILLA_ALEATORIA (resultados reproducibles).
+        # temp_inicial y tasa_enfriamiento: con CALIBRAR_TEMPERATURA_INICIAL o
+        # ENFRIAMIENTO_ADAPTATIVO activados el programa de cada zona los ajusta.
 
         # Usar valores por defecto si no se especifican
         temp_inicial = temp_inicial or TEMPERATURA_INICIAL
         tasa_enfriamiento = tasa_enfriamiento or TASA_ENFRIAMIENTO
+        modo_ejecucion = modo_ejecucion or MODO_EJECUCION
+        num_procesos = num_procesos or NUM_PROCESOS
+        estrategia = crear_estrategia(modo_cadenas, num_cadenas, modo_ruteo, capacidad_vehiculo)
+        tiempo_limite = TIEMPO_LIMITE_TOTAL if tiempo_limite is None else tiempo_limite
+        tiempo_limite_zona = TIEMPO_LIMITE_ZONA if tiempo_limite_zona is None else tiempo_limite_zona
+        heuristica_inicial = heuristica_inicial or HEURISTICA_INICIAL
+        brecha_parada = BRECHA_PARADA if brecha_parada is None else brecha_parada
+        semilla = SEMILLA_ALEATORIA if semilla is None else semilla
+        if heuristica_inicial not in HEURISTICAS_INICIALES:
+            raise ValueError(f"Heurística inicial desconocida: '{heuristica_inicial}'")
+        if self.data_loader.costos_horarios is not None and estrategia['modo_ruteo'] == 'cvrp':
+            raise ValueError("Los costos por hora no están disponibles en modo de ruteo 'cvrp'")
+        
+        inicio = time.monotonic()
+        def notificar_con_tiempo(evento):
+            evento['segundos'] = time.monotonic() - inicio
+            callback_progreso(evento)
+        notificar = notificar_con_tiempo if callback_progreso is not None else None
         
         self.resultados_zonas = {}
         self.costo_total_optimizado = 0
+        self.segundos_zona = {}
+        self.estadisticas_zona = {}
         
         if MOSTRAR_PROGRESO:
             print(f"\nINICIANDO OPTIMIZACIÓN DE RUTAS POR ZONAS")
-            print(f"Parámetros: T={temp_inicial}, decay={tasa_enfriamiento}")
+            temp_mostrada = 'calibrada por zona' if CALIBRAR_TEMPERATURA_INICIAL else temp_inicial
+            print(f"Parámetros: T={temp_mostrada}, decay={tasa_enfriamiento}, modo={modo_ejecucion}, "
+                  f"cadenas={estrategia['modo_cadenas']}, ruteo={estrategia['modo_ruteo']}, "
+                  f"inicio={heuristica_inicial}")
+            if tiempo_limite is not None or tiempo_limite_zona is not None:
+                print(f"Límite de tiempo: total={'-' if tiempo_limite is None else tiempo_limite} s, "
+                      f"por zona={'-' if tiempo_limite_zona is None else tiempo_limite_zona} s")
             print("="*70)
         
-        # Optimizar cada zona
+        parametros = {
+            'temp_inicial': temp_inicial,
+            'tasa_enfriamiento': tasa_enfriamiento,
+            'temp_final': TEMP_FINAL,
+            'L': L_ITERACIONES,
+            'heuristica_inicial': heuristica_inicial,
+            'brecha_parada': brecha_parada,
+            'estadisticas': ESTADISTICAS_RECOCIDO
+        }
+        
+        # Las zonas son independientes: se reunen las que tienen tiendas
         num_zonas = len(self.data_loader.centros_distribucion)
+        tareas = []
+        for zona_id in range(num_zonas):
+            tiendas_zona = self.data_loader.obtener_tiendas_por_zona(zona_id)
+            if len(tiendas_zona) > 0:
+                tareas.append((zona_id, tiendas_zona))
+        
+        if ARRANQUE_CALIENTE if arranque_caliente is None else arranque_caliente:
+            parametros['rutas_iniciales'] = self._preparar_arranque_caliente(
+                tareas, estrategia, archivo_rutas_previas or ARCHIVO_RUTAS_PREVIAS
+            )
+        
+        cotas = {}
+        if CALCULAR_COTA_INFERIOR or brecha_parada is not None:
+            cotas = self._calcular_cotas_inferiores(tareas, estrategia)
+            parametros['cotas_inferiores'] = cotas
+        
+        # El pool solo compensa si hay mas de una tarea (zona o cadena)
+        num_tareas = len(tareas) * cadenas_por_zona(estrategia)
         
+        if modo_ejecucion == 'procesos' and num_tareas > 1:
+            soluciones = self._optimizar_zonas_en_procesos(
+                tareas, parametros, estrategia, num_procesos, semilla,
+                tiempo_limite, tiempo_limite_zona, notificar
+            )
+        elif modo_ejecucion in ('secuencial', 'procesos'):
+            soluciones = self._optimizar_zonas_secuencial(
+                tareas, parametros, estrategia, semilla,
+                tiempo_limite, tiempo_limite_zona, notificar
+            )
+        else:
+            raise ValueError(f"Modo de ejecución desconocido: '{modo_ejecucion}'")
+        
+        # Guardar resultados en orden de zona
         for zona_id in range(num_zonas):
             tiendas_zona = self.data_loader.obtener_tiendas_por_zona(zona_id)
             centro_zona = self.data_loader.obtener_centro_por_zona(zona_id)
             
-            if MOSTRAR_PROGRESO:
-                print(f"\nOptimizando {centro_zona['Nombre']}")
+            if zona_id not in soluciones:
+                if MOSTRAR_PROGRESO:
+                    print(f"\n{centro_zona['Nombre']}: sin tiendas asignadas")
+                continue
             
-            if len(tiendas_zona) > 0:
-                # Ejecutar optimización para esta zona con todos los parámetros
-                ruta_optima, costo_optimo = SimulatedAnnealing.optimizar_zona(
-                    self.data_loader.costo_total_matrix,
-                    zona_id,
-                    tiendas_zona,
-                    temp_inicial,
-                    tasa_enfriamiento,
-                    TEMP_FINAL,
-                    L_ITERACIONES
+            ruta_optima, costo_optimo = soluciones[zona_id]
+            estadisticas = self.estadisticas_zona.get(zona_id)
+            self.resultados_zonas[zona_id] = {
+                'centro': centro_zona['Nombre'],
+                'ruta': ruta_optima,
+                'costo': costo_optimo,
+                'costo_inicial': None if estadisticas is None else estadisticas.costo_inicial,
+                'tiendas_count': len(tiendas_zona),
+                'capacidad_total': tiendas_zona['Capacidad_Venta'].sum(),
+                'segundos': self.segundos_zona.get(zona_id),
+                'cota_inferior': cotas.get(zona_id)
+            }
+            if ESTADISTICAS_RECOCIDO and estadisticas is not None:
+                self.resultados_zonas[zona_id]['estadisticas'] = estadisticas
+            
+            # En modo CVRP la ruta vuelve al centro entre vehiculos
+            if estrategia['modo_ruteo'] == 'cvrp':
+                self.resultados_zonas[zona_id]['rutas_vehiculos'] = RuteoCapacitado.separar_rutas(
+                    ruta_optima, zona_id
                 )
-                
-                # Guardar resultados
-                self.resultados_zonas[zona_id] = {
-                    'centro': centro_zona['Nombre'],
-                    'ruta': ruta_optima,
-                    'costo': costo_optimo,
-                    'tiendas_count': len(tiendas_zona),
-                    'capacidad_total': tiendas_zona['Capacidad_Venta'].sum()
-                }
-                
-                self.costo_total_optimizado += costo_optimo
-                
-                if MOSTRAR_PROGRESO:
-                    print(f"    Optimización completada - Costo final: {costo_optimo:.2f}")
-            else:
-                if MOSTRAR_PROGRESO:
-                    print(f"    Sin tiendas asignadas")
+            
+            self.costo_total_optimizado += costo_optimo
         
+        self.segundos_totales = time.monotonic() - inicio
         return self.resultados_zonas, self.costo_total_optimizado
     
+    def _preparar_arranque_caliente(self, tareas, estrategia, archivo_rutas_previas=None):
+        if estrategia['modo_ruteo'] != 'tsp':
+            print("    Arranque en caliente no disponible en modo de ruteo "
+                  f"'{estrategia['modo_ruteo']}', se omite")
+            return {}
+        if MOSTRAR_PROGRESO:
+            print("Arranque en caliente desde resultados previos")
+        return ArranqueCaliente.preparar_rutas_iniciales(
+            {zona_id: list(tiendas_zona.index) for zona_id, tiendas_zona in tareas},
+            self.data_loader.datos_df,
+            SimulatedAnnealing.matriz_estatica(self.matriz_optimizacion()),
+            archivo_rutas_previas
+        )
+    
+    def _calcular_cotas_inferiores(self, tareas, estrategia):
+        inicio = time.monotonic()
+        # Con costos por hora la cota usa el menor tiempo de cada arista en el dia
+        matriz = self.data_loader.costo_total_matrix
+        if self.data_loader.costos_horarios is not None:
+            matriz = self.data_loader.costos_horarios.minimo_por_arista()
+        cotas = {
+            zona_id: CotaInferior.calcular(
+                matriz, zona_id, list(tiendas_zona.index),
+                estrategia['modo_ruteo']
+            )
+            for zona_id, tiendas_zona in tareas
+        }
+        if MOSTRAR_PROGRESO:
+            print(f"Cotas inferiores calculadas en {time.monotonic() - inicio:.2f} s")
+        return cotas
+    
+    def _optimizar_zonas_secuencial(self, tareas, parametros, estrategia, semilla=None,
+                                    tiempo_limite=None, tiempo_limite_zona=None, notificar=None):
+        soluciones = {}
+        fecha_limite_global = None if tiempo_limite is None else time.monotonic() + tiempo_limite
+        tiendas_restantes = sum(len(tiendas_zona) for _, tiendas_zona in tareas)
+        for zona_id, tiendas_zona in tareas:
+            centro_zona = self.data_loader.obtener_centro_por_zona(zona_id)
+            
+            if MOSTRAR_PROGRESO:
+                print(f"\nOptimizando {centro_zona['Nombre']}")
+            
+            # El tiempo que dejan sin usar las zonas anteriores se reparte entre las siguientes
+            segundos = tiempo_limite_zona
+            if fecha_limite_global is not None:
+                parte = max(0.0, fecha_limite_global - time.monotonic()) * len(tiendas_zona) / tiendas_restantes
+                segundos = parte if segundos is None else min(segundos, parte)
+            tiendas_restantes -= len(tiendas_zona)
+            
+            inicio_zona = time.monotonic()
+            ruta, costo, estadisticas = optimizar_zona_con_semilla(
+                self.matriz_optimizacion(),
+                zona_id,
+                tiendas_zona,
+                parametros,
+                estrategia,
+                semilla,
+                segundos,
+                fecha_limite_global,
+                notificar
+            )
+            self.segundos_zona[zona_id] = time.monotonic() - inicio_zona
+            soluciones[zona_id] = (ruta, costo)
+            if estadisticas is not None:
+                self.estadisticas_zona[zona_id] = estadisticas
+            if notificar is not None:
+                notificar(evento_progreso(zona_id, soluciones[zona_id][1], terminada=True))
+            
+            if MOSTRAR_PROGRESO:
+                print(f"    Optimización completada - Costo final: {soluciones[zona_id][1]:.2f}")
+        return soluciones
+    
+    def _optimizar_zonas_en_procesos(self, tareas, parametros, estrategia, num_procesos, semilla=None,
+                                     tiempo_limite=None, tiempo_limite_zona=None, notificar=None):
+        with EjecutorZonasParalelo(self.matriz_optimizacion(), num_procesos) as ejecutor:
+            if MOSTRAR_PROGRESO:
+                print(f"\nOptimizando {len(tareas)} zonas en {ejecutor.num_procesos} procesos")
+            
+            soluciones = ejecutor.ejecutar(
+                tareas, parametros, estrategia, semilla,
+                tiempo_limite, tiempo_limite_zona, notificar
+            )
+            self.segundos_zona.update(ejecutor.segundos_zona)
+            self.estadisticas_zona.update(ejecutor.estadisticas_zona)
+        
+        if MOSTRAR_PROGRESO:
+            for zona_id, (_, costo_optimo) in soluciones.items():
+                centro_zona = self.data_loader.obtener_centro_por_zona(zona_id)
+                print(f"    {centro_zona['Nombre']} - Costo final: {costo_optimo:.2f}")
+        return soluciones
+    
     def obtener_resumen_resultados(self):
         if not self.resultados_zonas:
             return None
@@ -79,6 +289,7 @@ class RouteOptimizer:
         total_tiendas = sum(resultado['tiendas_count'] for resultado in self.resultados_zonas.values())
         total_capacidad = sum(resultado['capacidad_total'] for resultado in self.resultados_zonas.values())
         zonas_activas = len([r for r in self.resultados_zonas.values() if r['tiendas_count'] > 0])
+        cotas = [resultado.get('cota_inferior') for resultado in self.resultados_zonas.values()]
         
         return {
             'zonas_totales': len(self.resultados_zonas),
@@ -86,7 +297,8 @@ class RouteOptimizer:
             'total_tiendas': total_tiendas,
             'total_capacidad': total_capacidad,
             'costo_total': self.costo_total_optimizado,
-            'costo_promedio_por_zona': self.costo_total_optimizado / zonas_activas if zonas_activas > 0 else 0
+            'costo_promedio_por_zona': self.costo_total_optimizado / zonas_activas if zonas_activas > 0 else 0,
+            'cota_inferior_total': sum(cotas) if None not in cotas else None
         }
     
     def obtener_ruta_formateada(self, zona_id):
@@ -95,10 +307,4 @@ class RouteOptimizer:
             return []
         
         ruta_indices = self.resultados_zonas[zona_id]['ruta']
-        ruta_nombres = []
-        
-        for nodo in ruta_indices:
-            nombre = self.data_loader.datos_df.iloc[nodo]['Nombre']
-            ruta_nombres.append(nombre)
-        
-        return ruta_nombres
\ No newline at end of file
+        return self.data_loader.datos_df['Nombre'].to_numpy()[ruta_indices].tolist()
\ No newline at end of file
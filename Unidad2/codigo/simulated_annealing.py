@@ -1,113 +1,802 @@
 import random
 import math
-from config import MOSTRAR_PROGRESO
+import time
+import numpy as np
+from config import (
+    MOSTRAR_PROGRESO,
+    INTERVALO_VERIFICACION_COSTO,
+    TOLERANCIA_VERIFICACION_COSTO,
+    OPERADORES_VECINDARIO,
+    SELECCION_ADAPTATIVA_OPERADORES,
+    FACTOR_REACCION_OPERADORES,
+    PESO_MINIMO_OPERADOR,
+    NUM_CADENAS,
+    RAZON_TEMPERATURAS_REPLICAS,
+    NUM_VECINOS_CANDIDATOS,
+    CALIBRAR_TEMPERATURA_INICIAL,
+    ACEPTACION_INICIAL_OBJETIVO,
+    MUESTRAS_CALIBRACION,
+    ENFRIAMIENTO_ADAPTATIVO,
+    ACEPTACION_ALTA,
+    ACEPTACION_BAJA,
+    FACTOR_ENFRIAMIENTO_RAPIDO,
+    FACTOR_ENFRIAMIENTO_LENTO,
+    PASOS_SIN_MEJORA_MAX,
+    BACKEND_RECOCIDO,
+    HEURISTICA_INICIAL,
+    ACEPTACION_HEURISTICA_INICIAL,
+    BRECHA_PARADA,
+    UMBRAL_SOLUCION_EXACTA
+)
+from movimientos import SelectorOperadores, obtener_operadores, matriz_es_simetrica
+from vecinos_candidatos import calcular_vecinos_candidatos
+from nucleo_recocido import CadenaRecocidoCompilada
+from heuristicas_constructivas import HeuristicasConstructivas
+from solucion_exacta import SolucionExacta
+from costos_horarios import CostosPorHora
+
+
+class CadenaRecocido:
+    # Estado de una cadena de recocido: ruta actual, mejor ruta y selector de
+    # operadores. Una zona usa una cadena; el templado paralelo usa varias.
+    
+    def __init__(self, ruta_inicial, matriz_costos, operadores=None,
+                 intervalo_verificacion=INTERVALO_VERIFICACION_COSTO, candidatos=None):
+        self.ruta = ruta_inicial
+        # Con listas de candidatos los operadores necesitan la posicion de cada tienda
+        self.candidatos = candidatos
+        self.posicion = None
+        if candidatos is not None:
+            self.posicion = {nodo: pos for pos, nodo in enumerate(ruta_inicial[1:-1], start=1)}
+        self.costo = SimulatedAnnealing.calcular_costo_ruta(ruta_inicial, matriz_costos)
+        # La mejor ruta se copia en este buffer solo cuando hace falta: mientras
+        # mejor_pendiente sea True la mejor ruta es la ruta actual
+        self._ruta_mejor = ruta_inicial[:]
+        self.mejor_pendiente = False
+        self.costo_mejor = self.costo
+        self.mejoras = 0
+        self.movimientos_aplicados = 0
+        # Movimientos evaluados y, de ellos, los que empeoran (propuestos y
+        # aceptados); acumulados de toda la cadena para EstadisticasRecocido
+        self.propuestos = 0
+        self.peores_propuestos = 0
+        self.peores_aceptados = 0
+        # Fraccion de movimientos que empeoran aceptados en el ultimo nivel
+        self.tasa_aceptacion = 0.0
+        self.intervalo_verificacion = intervalo_verificacion
+        # Con una sola tienda no hay movimientos posibles
+        self.sin_movimientos = len(ruta_inicial) <= 3
+        self.selector = SelectorOperadores(
+            obtener_operadores(operadores or OPERADORES_VECINDARIO, matriz_es_simetrica(
+                SimulatedAnnealing.matriz_estatica(matriz_costos), ruta_inicial[:-1]
+            )),
+            adaptativo=SELECCION_ADAPTATIVA_OPERADORES,
+            factor_reaccion=FACTOR_REACCION_OPERADORES,
+            peso_minimo=PESO_MINIMO_OPERADOR
+        )
+    
+    def ejecutar_nivel(self, matriz_costos, t, L):
+        # L iteraciones a temperatura t. El estado se copia a variables locales
+        # durante el nivel para no pagar acceso a atributos en cada iteracion
+        s_actual = self.ruta
+        costo_actual = self.costo
+        costo_mejor = self.costo_mejor
+        mejor_pendiente = self.mejor_pendiente
+        mejoras = self.mejoras
+        movimientos_aplicados = self.movimientos_aplicados
+        intervalo_verificacion = self.intervalo_verificacion
+        selector = self.selector
+        candidatos = self.candidatos
+        posicion = self.posicion
+        # Solo cuentan los movimientos que empeoran: los de delta 0 siempre
+        # se aceptan y ocultarian que la cadena esta congelada
+        propuestos = 0
+        peores_propuestos = 0
+        peores_aceptados = 0
+        
+        for i in range(L):
+            if costo_mejor == 0:
+                break
+            
+            # Generar movimiento candidato con el operador seleccionado
+            # y evaluar solo las aristas afectadas en lugar de la ruta completa
+            indice_operador, operador = selector.seleccionar()
+            if candidatos is None:
+                movimiento = operador.proponer(s_actual)
+            else:
+                movimiento = operador.proponer_con_candidatos(s_actual, posicion, candidatos)
+            if movimiento is None:
+                continue
+            propuestos += 1
+            
+            delta_costo = operador.calcular_delta(s_actual, matriz_costos, movimiento)
+            
+            # Criterio de aceptacion del recocido simulado
+            if delta_costo < 0:
+                aceptar = True
+            else:
+                # Aceptar solucion peor con probabilidad exp(-delta/T)
+                probabilidad = math.exp(-delta_costo / t) if t > 0 else 0
+                aceptar = random.random() < probabilidad
+                if delta_costo > 0:
+                    peores_propuestos += 1
+                    peores_aceptados += aceptar
+            
+            if not aceptar:
+                selector.registrar(indice_operador, delta_costo, False)
+                continue
+            
+            # Antes de empeorar una ruta que es la mejor se guarda su copia
+            if mejor_pendiente and delta_costo > 0:
+                self._ruta_mejor[:] = s_actual
+                mejor_pendiente = False
+            
+            # Aplicar el movimiento sobre la ruta actual
+            operador.aplicar(s_actual, movimiento)
+            if posicion is not None:
+                for pos in operador.posiciones_afectadas(movimiento):
+                    posicion[s_actual[pos]] = pos
+            # float() mantiene el acumulado en doble precision aunque la matriz sea float32
+            costo_actual += float(delta_costo)
+            movimientos_aplicados += 1
+            
+            # Modo de verificacion: recalcular el costo completo cada K movimientos
+            if intervalo_verificacion and movimientos_aplicados % intervalo_verificacion == 0:
+                costo_actual = SimulatedAnnealing.verificar_costo(s_actual, matriz_costos, costo_actual)
+            
+            # Actualizar mejor solucion encontrada
+            mejor_global = costo_actual < costo_mejor
+            selector.registrar(indice_operador, delta_costo, mejor_global)
+            if mejor_global:
+                mejor_pendiente = True
+                costo_mejor = costo_actual
+                mejoras += 1
+        
+        # Favorecer los operadores que produjeron mejoras recientemente
+        selector.actualizar_pesos()
+        
+        self.costo = costo_actual
+        self.mejor_pendiente = mejor_pendiente
+        self.costo_mejor = costo_mejor
+        self.mejoras = mejoras
+        self.movimientos_aplicados = movimientos_aplicados
+        self.propuestos += propuestos
+        self.peores_propuestos += peores_propuestos
+        self.peores_aceptados += peores_aceptados
+        self.tasa_aceptacion = peores_aceptados / peores_propuestos if peores_propuestos else 0.0
+    
+    def consolidar_mejor(self):
+        # Copia la ruta actual al buffer de la mejor si aun no se habia copiado
+        if self.mejor_pendiente:
+            self._ruta_mejor[:] = self.ruta
+            self.mejor_pendiente = False
+    
+    @property
+    def ruta_mejor(self):
+        self.consolidar_mejor()
+        return self._ruta_mejor
+    
+    def calibrar_temperatura(self, matriz_costos, num_muestras=MUESTRAS_CALIBRACION,
+                             aceptacion_objetivo=ACEPTACION_INICIAL_OBJETIVO):
+        # Temperatura a la que un movimiento que empeora (delta promedio de una
+        # muestra de movimientos sin aplicar) se acepta con la probabilidad
+        # objetivo: exp(-delta_promedio / T0) = aceptacion_objetivo
+        deltas = []
+        for _ in range(num_muestras):
+            _, operador = self.selector.seleccionar()
+            if self.candidatos is None:
+                movimiento = operador.proponer(self.ruta)
+            else:
+                movimiento = operador.proponer_con_candidatos(self.ruta, self.posicion, self.candidatos)
+            if movimiento is None:
+                continue
+            delta_costo = float(operador.calcular_delta(self.ruta, matriz_costos, movimiento))
+            if delta_costo > 0:
+                deltas.append(delta_costo)
+        
+        if not deltas:
+            return None
+        return -(sum(deltas) / len(deltas)) / math.log(aceptacion_objetivo)
+
+
+class CadenaRecocidoHoraria(CadenaRecocido):
+    # Cadena sobre CostosPorHora: el tiempo de cada arista depende del minuto
+    # de salida, asi que un movimiento desplaza el reloj de toda la ruta que
+    # le sigue. Por cada posicion se guarda el minuto de salida y cuanto puede
+    # atrasarse o adelantarse sin cambiar de franja, y por sufijo el minimo de
+    # esos margenes. Un movimiento se aplica en sitio y solo las aristas del
+    # tramo afectado se recalculan una a una; el resto de la ruta se desplaza
+    # con el desfase resultante y solo se recalculan las aristas cuya salida
+    # cambia de franja (con el margen del sufijo, casi siempre ninguna). El
+    # delta es el desfase que llega al final. Si se rechaza se deshace.
+
+    def __init__(self, ruta_inicial, costos_horarios, operadores=None,
+                 intervalo_verificacion=INTERVALO_VERIFICACION_COSTO, candidatos=None):
+        self.costos_horarios = costos_horarios
+        super().__init__(ruta_inicial, costos_horarios, operadores,
+                         intervalo_verificacion, candidatos)
+
+    @property
+    def ruta(self):
+        return self._ruta
+
+    @ruta.setter
+    def ruta(self, ruta):
+        # Tambien al intercambiar rutas entre replicas del templado paralelo
+        self._ruta = ruta
+        self.llegada = np.array(self.costos_horarios.llegadas(ruta))
+        self._actualizar_margenes()
+
+    def _actualizar_margenes(self):
+        # abajo[p] / arriba[p]: minutos desde el inicio / hasta el fin de la
+        # franja de la salida de p; margen_*[p]: minimo de las posiciones p..n-1.
+        # La ultima posicion (el centro al volver) no sale y su margen es infinito.
+        costos = self.costos_horarios
+        n = len(self.llegada) - 1
+        self.salida = self.llegada[:n].copy()
+        self.salida[1:] += costos.minutos_servicio
+        abajo = np.mod(self.salida, costos.minutos_por_franja)
+        self.abajo = np.append(abajo, np.inf)
+        self.arriba = np.append(costos.minutos_por_franja - abajo, np.inf)
+        self.margen_abajo = np.minimum.accumulate(self.abajo[::-1])[::-1]
+        self.margen_arriba = np.minimum.accumulate(self.arriba[::-1])[::-1]
+
+    def _evaluar(self, operador, movimiento):
+        # Aplica el movimiento y devuelve (delta, inicio, fin, llegadas nuevas
+        # de inicio..fin, tramos desplazados [(desde, desfase)], tramo original)
+        afectadas = operador.posiciones_afectadas(movimiento)
+        inicio, fin = min(afectadas), max(afectadas)
+        ruta = self._ruta
+        tramo_original = ruta[inicio:fin + 1]
+        operador.aplicar(ruta, movimiento)
+
+        costos = self.costos_horarios
+        franja = costos.franja
+        minutos_por_franja = costos.minutos_por_franja
+        num_franjas = costos.num_franjas
+        servicio = costos.minutos_servicio
+        llegada = self.llegada
+        salida = self.salida
+
+        # Aristas nuevas del tramo afectado
+        minuto = float(salida[inicio - 1])
+        llegadas_nuevas = []
+        for p in range(inicio - 1, fin + 1):
+            minuto += float(franja(int(minuto // minutos_por_franja) % num_franjas)[ruta[p], ruta[p + 1]])
+            llegadas_nuevas.append(minuto)
+            minuto += servicio
+
+        # Resto de la ruta: mismo orden, salidas desplazadas por el desfase
+        p = fin + 1
+        desfase = llegadas_nuevas.pop() - float(llegada[p])
+        desplazados = []
+        while not -self.margen_abajo[p] <= desfase < self.margen_arriba[p]:
+            # Primera salida desde p que cambia de franja con el desfase
+            if desfase >= 0:
+                q = p + int(np.argmax(self.arriba[p:] <= desfase))
+            else:
+                q = p + int(np.argmax(self.abajo[p:] < -desfase))
+            desplazados.append((p, desfase))
+            minuto = float(salida[q]) + desfase
+            minuto += float(franja(int(minuto // minutos_por_franja) % num_franjas)[ruta[q], ruta[q + 1]])
+            p = q + 1
+            desfase = minuto - float(llegada[p])
+        desplazados.append((p, desfase))
+        return desfase, inicio, fin, llegadas_nuevas, desplazados, tramo_original
+
+    def _confirmar(self, inicio, llegadas_nuevas, desplazados):
+        self.llegada[inicio:inicio + len(llegadas_nuevas)] = llegadas_nuevas
+        limites = [desde for desde, _ in desplazados[1:]] + [len(self.llegada)]
+        for (desde, desfase), hasta in zip(desplazados, limites):
+            self.llegada[desde:hasta] += desfase
+        self._actualizar_margenes()
+
+    def ejecutar_nivel(self, matriz_costos, t, L):
+        s_actual = self._ruta
+        costo_actual = self.costo
+        costo_mejor = self.costo_mejor
+        mejor_pendiente = self.mejor_pendiente
+        mejoras = self.mejoras
+        movimientos_aplicados = self.movimientos_aplicados
+        intervalo_verificacion = self.intervalo_verificacion
+        selector = self.selector
+        candidatos = self.candidatos
+        posicion = self.posicion
+        propuestos = 0
+        peores_propuestos = 0
+        peores_aceptados = 0
+
+        for i in range(L):
+            if costo_mejor == 0:
+                break
+
+            indice_operador, operador = selector.seleccionar()
+            if candidatos is None:
+                movimiento = operador.proponer(s_actual)
+            else:
+                movimiento = operador.proponer_con_candidatos(s_actual, posicion, candidatos)
+            if movimiento is None:
+                continue
+            propuestos += 1
+
+            delta_costo, inicio, fin, llegadas_nuevas, desplazados, tramo_original = self._evaluar(
+                operador, movimiento
+            )
+
+            if delta_costo < 0:
+                aceptar = True
+            else:
+                probabilidad = math.exp(-delta_costo / t) if t > 0 else 0
+                aceptar = random.random() < probabilidad
+                if delta_costo > 0:
+                    peores_propuestos += 1
+                    peores_aceptados += aceptar
+
+            if not aceptar:
+                s_actual[inicio:fin + 1] = tramo_original
+                selector.registrar(indice_operador, delta_costo, False)
+                continue
+
+            # La ruta ya tiene el movimiento: la mejor se reconstruye con el tramo original
+            if mejor_pendiente and delta_costo > 0:
+                self._ruta_mejor[:] = s_actual
+                self._ruta_mejor[inicio:fin + 1] = tramo_original
+                mejor_pendiente = False
+
+            self._confirmar(inicio, llegadas_nuevas, desplazados)
+            if posicion is not None:
+                for pos in operador.posiciones_afectadas(movimiento):
+                    posicion[s_actual[pos]] = pos
+            costo_actual += delta_costo
+            movimientos_aplicados += 1
+
+            if intervalo_verificacion and movimientos_aplicados % intervalo_verificacion == 0:
+                costo_actual = SimulatedAnnealing.verificar_costo(s_actual, matriz_costos, costo_actual)
+                self.ruta = s_actual
+
+            mejor_global = costo_actual < costo_mejor
+            selector.registrar(indice_operador, delta_costo, mejor_global)
+            if mejor_global:
+                mejor_pendiente = True
+                costo_mejor = costo_actual
+                mejoras += 1
+
+        selector.actualizar_pesos()
+
+        self.costo = costo_actual
+        self.mejor_pendiente = mejor_pendiente
+        self.costo_mejor = costo_mejor
+        self.mejoras = mejoras
+        self.movimientos_aplicados = movimientos_aplicados
+        self.propuestos += propuestos
+        self.peores_propuestos += peores_propuestos
+        self.peores_aceptados += peores_aceptados
+        self.tasa_aceptacion = peores_aceptados / peores_propuestos if peores_propuestos else 0.0
+
+    def calibrar_temperatura(self, matriz_costos, num_muestras=MUESTRAS_CALIBRACION,
+                             aceptacion_objetivo=ACEPTACION_INICIAL_OBJETIVO):
+        # Igual que CadenaRecocido, deshaciendo cada movimiento evaluado
+        deltas = []
+        for _ in range(num_muestras):
+            _, operador = self.selector.seleccionar()
+            if self.candidatos is None:
+                movimiento = operador.proponer(self._ruta)
+            else:
+                movimiento = operador.proponer_con_candidatos(self._ruta, self.posicion, self.candidatos)
+            if movimiento is None:
+                continue
+            delta_costo, inicio, fin, _, _, tramo_original = self._evaluar(operador, movimiento)
+            self._ruta[inicio:fin + 1] = tramo_original
+            if delta_costo > 0:
+                deltas.append(delta_costo)
+
+        if not deltas:
+            return None
+        return -(sum(deltas) / len(deltas)) / math.log(aceptacion_objetivo)
+
+
+class ProgramaEnfriamiento:
+    # Programa de temperatura de una zona. Enfriamiento geometrico; en modo
+    # adaptativo la tasa depende de la aceptacion del ultimo nivel:
+    #   > aceptacion_alta      caminata casi aleatoria: tasa^factor_rapido
+    #   [baja, alta]           zona productiva: tasa^factor_lento
+    #   < aceptacion_baja      cadena congelada: tasa
+    # El detector de estancamiento termina tras N niveles sin nueva mejor solucion.
+    # Con fecha limite (time.monotonic()) la temperatura nunca supera la de un
+    # enfriamiento que llega a temp_final justo al vencer el plazo:
+    # T0 * (Tf / T0) ^ (fraccion del tiempo transcurrida).
+    
+    def __init__(self, temp_inicial, tasa_enfriamiento, temp_final=0.001,
+                 adaptativo=ENFRIAMIENTO_ADAPTATIVO, pasos_sin_mejora_max=PASOS_SIN_MEJORA_MAX,
+                 fecha_limite=None, aceptacion_alta=ACEPTACION_ALTA, aceptacion_baja=ACEPTACION_BAJA,
+                 factor_rapido=FACTOR_ENFRIAMIENTO_RAPIDO, factor_lento=FACTOR_ENFRIAMIENTO_LENTO):
+        self.t = temp_inicial
+        self.temp_inicial = temp_inicial
+        self.tasa_enfriamiento = tasa_enfriamiento
+        self.temp_final = temp_final
+        self.adaptativo = adaptativo
+        self.aceptacion_alta = aceptacion_alta
+        self.aceptacion_baja = aceptacion_baja
+        self.factor_rapido = factor_rapido
+        self.factor_lento = factor_lento
+        self.pasos_sin_mejora_max = pasos_sin_mejora_max
+        self.niveles = 0
+        self.niveles_sin_mejora = 0
+        self.estancado = False
+        self.fecha_limite = fecha_limite
+        self.inicio = time.monotonic()
+        self.tiempo_agotado = fecha_limite is not None and self.inicio >= fecha_limite
+    
+    def continuar(self):
+        return self.t > self.temp_final and not self.estancado and not self.tiempo_agotado
+    
+    def enfriar(self, tasa_aceptacion, hubo_mejora):
+        self.niveles += 1
+        if hubo_mejora:
+            self.niveles_sin_mejora = 0
+        elif tasa_aceptacion < self.aceptacion_baja:
+            # Solo cuentan los niveles frios: en caliente la cadena se aleja
+            # a proposito de la mejor solucion y no es estancamiento
+            self.niveles_sin_mejora += 1
+            if self.pasos_sin_mejora_max and self.niveles_sin_mejora >= self.pasos_sin_mejora_max:
+                self.estancado = True
+        
+        tasa = self.tasa_enfriamiento
+        if self.adaptativo:
+            if tasa_aceptacion > self.aceptacion_alta:
+                tasa = tasa ** self.factor_rapido
+            elif tasa_aceptacion >= self.aceptacion_baja:
+                tasa = tasa ** self.factor_lento
+        self.t *= tasa
+        
+        if self.fecha_limite is not None:
+            ahora = time.monotonic()
+            if ahora >= self.fecha_limite:
+                self.tiempo_agotado = True
+            elif self.temp_inicial > self.temp_final > 0:
+                fraccion = (ahora - self.inicio) / (self.fecha_limite - self.inicio)
+                t_plazo = self.temp_inicial * (self.temp_final / self.temp_inicial) ** fraccion
+                self.t = min(self.t, t_plazo)
+
 
 class SimulatedAnnealing:
     
     @staticmethod
     def calcular_costo_ruta(ruta, matriz_costos):
-        costo = 0
+        if isinstance(matriz_costos, CostosPorHora):
+            return matriz_costos.costo_ruta(ruta)
+        costo = 0.0
         for i in range(len(ruta) - 1):
-            costo += matriz_costos[ruta[i]][ruta[i+1]]
+            costo += float(matriz_costos[ruta[i], ruta[i+1]])
         return costo
     
     @staticmethod
-    def generar_solucion_inicial_zona(centro_id, tiendas_zona):
+    def matriz_estatica(matriz_costos):
+        # Matriz N x N para heuristicas y candidatos; con costos por hora, la
+        # franja de la hora de salida
+        if isinstance(matriz_costos, CostosPorHora):
+            return matriz_costos.matriz_referencia()
+        return matriz_costos
+    
+    @staticmethod
+    def generar_solucion_inicial_zona(centro_id, tiendas_zona, matriz_costos=None,
+                                      heuristica='aleatoria'):
 
         tiendas_ids = list(tiendas_zona.index)  # Usar directamente los índices del DataFrame
+        if heuristica != 'aleatoria':
+            return HeuristicasConstructivas.construir_ruta(
+                heuristica, SimulatedAnnealing.matriz_estatica(matriz_costos), centro_id, tiendas_ids
+            )
         random.shuffle(tiendas_ids)
         ruta_inicial = [centro_id] + tiendas_ids + [centro_id]
         return ruta_inicial
     
     @staticmethod
-    def generar_solucion_vecina(ruta):
-        vecina = ruta[:]
-        
-        # Solo hacer swap si hay al menos 2 tiendas para intercambiar
-        # Las posiciones 0 y -1 son el centro de distribución, no se tocan
-        if len(vecina) > 3:  
-            # Seleccionar dos posiciones diferentes entre las tiendas (posiciones 1 a len-2)
-            pos1, pos2 = random.sample(range(1, len(vecina) - 1), 2)
-            
-            # Hacer el swap entre las dos posiciones seleccionadas
-            vecina[pos1], vecina[pos2] = vecina[pos2], vecina[pos1]
-            
-        return vecina
+    def resumen_costos(costo_inicial, costo_final):
+        if costo_inicial <= 0:
+            return f"Costo inicial: {costo_inicial:.2f}, final: {costo_final:.2f}"
+        mejora = 100 * (costo_inicial - costo_final) / costo_inicial
+        return f"Costo inicial: {costo_inicial:.2f}, final: {costo_final:.2f} (-{mejora:.1f}%)"
+    
+    @staticmethod
+    def obtener_candidatos(matriz_costos, ruta, num_vecinos):
+        # Las listas de candidatos solo tienen sentido si la zona tiene
+        # bastantes mas tiendas que vecinos por lista
+        if not num_vecinos or len(ruta) - 2 <= 2 * num_vecinos:
+            return None
+        return calcular_vecinos_candidatos(
+            SimulatedAnnealing.matriz_estatica(matriz_costos), ruta[:-1], num_vecinos
+        )
+    
+    @staticmethod
+    def crear_cadena(backend, ruta_inicial, matriz_costos, operadores=None,
+                     intervalo_verificacion=INTERVALO_VERIFICACION_COSTO, candidatos=None):
+        # 'python': listas y operadores de movimientos.py
+        # 'compilado': arreglos y nucleo de nucleo_recocido.py (Numba si esta instalado)
+        # Con costos por hora siempre se usa CadenaRecocidoHoraria
+        if isinstance(matriz_costos, CostosPorHora):
+            return CadenaRecocidoHoraria(ruta_inicial, matriz_costos, operadores,
+                                         intervalo_verificacion, candidatos)
+        if backend == 'python':
+            return CadenaRecocido(ruta_inicial, matriz_costos, operadores,
+                                  intervalo_verificacion, candidatos)
+        if backend == 'compilado':
+            return CadenaRecocidoCompilada(ruta_inicial, matriz_costos, operadores,
+                                           intervalo_verificacion, candidatos)
+        raise ValueError(f"Backend de recocido desconocido: '{backend}'")
+    
+    @staticmethod
+    def resolver_exacto(matriz_costos, centro_id, tiendas_zona, ruta_inicial=None, progreso=None,
+                        mostrar_progreso=MOSTRAR_PROGRESO, estadisticas=None,
+                        heuristica_inicial=HEURISTICA_INICIAL):
+        # Held-Karp para zonas (o vehiculos) pequeños: ruta optima en milisegundos.
+        # Con estadisticas, el costo inicial es el de la ruta con la que habria
+        # empezado el recocido
+        inicio = time.monotonic()
+        if estadisticas is not None and ruta_inicial is None:
+            ruta_inicial = SimulatedAnnealing.generar_solucion_inicial_zona(
+                centro_id, tiendas_zona, matriz_costos, heuristica_inicial
+            )
+        tiendas_ids = list(ruta_inicial[1:-1]) if ruta_inicial is not None else list(tiendas_zona.index)
+        ruta, costo = SolucionExacta.resolver(matriz_costos, centro_id, tiendas_ids)
+        if progreso is not None:
+            progreso(costo, 0.0)
+        if estadisticas is not None:
+            estadisticas.registrar_exacta(centro_id, len(tiendas_ids),
+                                          SimulatedAnnealing.calcular_costo_ruta(ruta_inicial, matriz_costos),
+                                          costo, time.monotonic() - inicio)
+        if mostrar_progreso:
+            print(f"    Zona {centro_id + 1}: {len(tiendas_ids)} tiendas, solucion exacta "
+                  f"(Held-Karp) - Costo final: {costo:.2f} ({(time.monotonic() - inicio) * 1000:.0f} ms)")
+        return ruta, costo
+    
+    @staticmethod
+    def aceptacion_por_defecto(heuristica_inicial):
+        # Una ruta aleatoria se calienta con ACEPTACION_INICIAL_OBJETIVO; una
+        # construida parte mas fria para conservar su estructura. None indica
+        # una ruta dada por quien llama (p. ej. el arranque en caliente).
+        if heuristica_inicial in (None, 'aleatoria'):
+            return ACEPTACION_INICIAL_OBJETIVO
+        return ACEPTACION_HEURISTICA_INICIAL
+    
+    @staticmethod
+    def brecha_alcanzada(costo, cota_inferior, brecha_parada):
+        if cota_inferior is None or brecha_parada is None or cota_inferior <= 0:
+            return False
+        return costo - cota_inferior <= brecha_parada * cota_inferior
+    
+    @classmethod
+    def verificar_costo(cls, ruta, matriz_costos, costo_incremental):
+        # Recalcula el costo completo y lo compara con el acumulado por deltas
+        costo_real = cls.calcular_costo_ruta(ruta, matriz_costos)
+        if abs(costo_real - costo_incremental) > TOLERANCIA_VERIFICACION_COSTO:
+            print(f"        Advertencia: costo incremental {costo_incremental:.6f} "
+                  f"difiere del real {costo_real:.6f}, se corrige")
+        return costo_real
     
     @classmethod
     def optimizar_zona(cls, matriz_costos, centro_id, tiendas_zona, 
                       temp_inicial, tasa_enfriamiento, 
-                      temp_final=0.001, L=50):
+                      temp_final=0.001, L=50,
+                      intervalo_verificacion=INTERVALO_VERIFICACION_COSTO,
+                      operadores=None, num_vecinos_candidatos=NUM_VECINOS_CANDIDATOS,
+                      ruta_inicial=None, calibrar_temperatura=CALIBRAR_TEMPERATURA_INICIAL,
+                      aceptacion_inicial=None,
+                      enfriamiento_adaptativo=ENFRIAMIENTO_ADAPTATIVO,
+                      pasos_sin_mejora_max=PASOS_SIN_MEJORA_MAX, backend=BACKEND_RECOCIDO,
+                      fecha_limite=None, progreso=None, heuristica_inicial=HEURISTICA_INICIAL,
+                      cota_inferior=None, brecha_parada=BRECHA_PARADA,
+                      umbral_exacto=UMBRAL_SOLUCION_EXACTA, estadisticas=None,
+                      mostrar_progreso=MOSTRAR_PROGRESO):
+        # fecha_limite: time.monotonic() en que se devuelve la mejor ruta encontrada.
+        # progreso(costo_mejor, temperatura) se llama al final de cada nivel.
+        # aceptacion_inicial: objetivo de la calibracion (None = segun la ruta inicial).
+        # cota_inferior y brecha_parada: se detiene al quedar a menos de esa brecha de la cota.
+        # umbral_exacto: hasta esas tiendas la ruta optima se calcula sin recocido.
+        # estadisticas: EstadisticasRecocido que se llena con los contadores de la zona.
+        # mostrar_progreso: False para recocidos internos (p. ej. cada vehiculo en cvrp).
         if len(tiendas_zona) == 0:
-            if MOSTRAR_PROGRESO:
+            if mostrar_progreso:
                 print(f"     Zona {centro_id + 1} no tiene tiendas asignadas")
-            return [centro_id + 1], 0
-        
-        # Inicializacion del algoritmo
-        s_actual = cls.generar_solucion_inicial_zona(centro_id, tiendas_zona)
-        costo_actual = cls.calcular_costo_ruta(s_actual, matriz_costos)
+            return [centro_id, centro_id], 0
+        if len(tiendas_zona) <= umbral_exacto:
+            return cls.resolver_exacto(matriz_costos, centro_id, tiendas_zona, ruta_inicial,
+                                       progreso, mostrar_progreso, estadisticas, heuristica_inicial)
         
-        s_mejor = s_actual[:]
-        costo_mejor = costo_actual
-        t = temp_inicial
+        # Inicializacion del algoritmo (desde una ruta dada, construida o aleatoria)
+        if ruta_inicial is None:
+            ruta_inicial = cls.generar_solucion_inicial_zona(
+                centro_id, tiendas_zona, matriz_costos, heuristica_inicial
+            )
+        else:
+            ruta_inicial = list(ruta_inicial)
+            heuristica_inicial = None
+        aceptacion_inicial = aceptacion_inicial or cls.aceptacion_por_defecto(heuristica_inicial)
+        cadena = cls.crear_cadena(
+            backend, ruta_inicial, matriz_costos, operadores, intervalo_verificacion,
+            cls.obtener_candidatos(matriz_costos, ruta_inicial, num_vecinos_candidatos)
+        )
+        if calibrar_temperatura and not cadena.sin_movimientos:
+            temp_inicial = cadena.calibrar_temperatura(
+                matriz_costos, aceptacion_objetivo=aceptacion_inicial
+            ) or temp_inicial
+        programa = ProgramaEnfriamiento(
+            temp_inicial, tasa_enfriamiento, temp_final,
+            enfriamiento_adaptativo, pasos_sin_mejora_max, fecha_limite
+        )
+        costo_inicial = cadena.costo_mejor
+        if estadisticas is not None:
+            estadisticas.iniciar(centro_id, len(tiendas_zona), cadena, temp_inicial)
         
-        mejoras = 0
-        
-        if MOSTRAR_PROGRESO:
-            print(f"    Zona {centro_id + 1}: {len(tiendas_zona)} tiendas, costo inicial: {costo_mejor:.2f}")
+        if mostrar_progreso:
+            print(f"    Zona {centro_id + 1}: {len(tiendas_zona)} tiendas, costo inicial: {costo_inicial:.2f}"
+                  + (f", temperatura inicial: {temp_inicial:.2f}" if calibrar_temperatura else ""))
         
         # Bucle principal del recocido simulado
-        # Termina cuando: temperatura < minima OR costo = 0
-        while t > temp_final and costo_mejor > 0:
+        # Termina cuando: temperatura < minima OR estancamiento OR costo = 0 OR brecha alcanzada
+        brecha_alcanzada = cls.brecha_alcanzada(cadena.costo_mejor, cota_inferior, brecha_parada)
+        while (programa.continuar() and cadena.costo_mejor > 0 and not cadena.sin_movimientos
+               and not brecha_alcanzada):
             
             # L iteraciones por cada temperatura
-            for i in range(L):
-                if costo_mejor == 0:
-                    break
-                
-                # Generar solucion candidata usando swap entre dos puntos
-                s_candidata = cls.generar_solucion_vecina(s_actual)
-                costo_candidata = cls.calcular_costo_ruta(s_candidata, matriz_costos)
-                
-                delta_costo = costo_candidata - costo_actual
-                
-                # Criterio de aceptacion del recocido simulado
-                if delta_costo < 0:
-                    # Aceptar solucion mejor (siempre aceptamos mejoras)
-                    s_actual = s_candidata
-                    costo_actual = costo_candidata
-                    
-                    # Actualizar mejor solucion encontrada
-                    if costo_actual < costo_mejor:
-                        s_mejor = s_actual[:]
-                        costo_mejor = costo_actual
-                        mejoras += 1
-                        
-                        # Si encontramos la solucion optima (costo 0), terminar
-                        if costo_mejor == 0:
-                            if MOSTRAR_PROGRESO:
-                                print(f"        Solucion optima encontrada! Costo = 0")
-                            break
-                        
-                else:
-                    # Aceptar solucion peor con probabilidad exp(-delta/T)
-                    probabilidad = math.exp(-delta_costo / t) if t > 0 else 0
-                    if random.random() < probabilidad:
-                        s_actual = s_candidata
-                        costo_actual = costo_candidata
+            mejoras_previas = cadena.mejoras
+            if estadisticas is not None:
+                estadisticas.iniciar_nivel(cadena)
+            cadena.ejecutar_nivel(matriz_costos, programa.t, L)
+            if estadisticas is not None:
+                estadisticas.registrar_nivel(cadena, programa.t)
             
             # Enfriar la temperatura despues de L iteraciones
-            t *= tasa_enfriamiento
+            programa.enfriar(cadena.tasa_aceptacion, cadena.mejoras > mejoras_previas)
+            if progreso is not None:
+                progreso(cadena.costo_mejor, programa.t)
+            brecha_alcanzada = cls.brecha_alcanzada(cadena.costo_mejor, cota_inferior, brecha_parada)
+        
+        # El costo acumulado por deltas puede arrastrar error de redondeo,
+        # el costo reportado se recalcula sobre la mejor ruta
+        s_mejor = cadena.ruta_mejor
+        costo_mejor = cls.calcular_costo_ruta(s_mejor, matriz_costos)
         
         # Determinar la razon de terminacion
-        if MOSTRAR_PROGRESO:
-            if costo_mejor == 0:
-                razon = "solucion optima (costo = 0)"
-            elif t <= temp_final:
-                razon = "temperatura minima alcanzada"
-            else:
-                razon = "terminacion desconocida"
+        if cadena.sin_movimientos:
+            razon = "sin movimientos posibles"
+        elif costo_mejor == 0:
+            razon = "solucion optima (costo = 0)"
+        elif brecha_alcanzada:
+            razon = f"brecha de optimalidad menor a {brecha_parada:.1%}"
+        elif programa.estancado:
+            razon = f"estancamiento tras {programa.niveles_sin_mejora} niveles sin mejora"
+        elif programa.tiempo_agotado:
+            razon = "tiempo agotado"
+        elif programa.t <= temp_final:
+            razon = "temperatura minima alcanzada"
+        else:
+            razon = "terminacion desconocida"
+        if estadisticas is not None:
+            estadisticas.finalizar(cadena, costo_mejor, razon)
+        
+        if mostrar_progreso:
+            print(f"        Optimizacion completada ({razon}) - "
+                  f"{cls.resumen_costos(costo_inicial, costo_mejor)} "
+                  f"({cadena.mejoras} mejoras, {programa.niveles} niveles)")
+        
+        return s_mejor, costo_mejor
+    
+    @classmethod
+    def optimizar_zona_templado_paralelo(cls, matriz_costos, centro_id, tiendas_zona,
+                                         temp_inicial, tasa_enfriamiento,
+                                         temp_final=0.001, L=50,
+                                         intervalo_verificacion=INTERVALO_VERIFICACION_COSTO,
+                                         operadores=None, num_vecinos_candidatos=NUM_VECINOS_CANDIDATOS,
+                                         num_replicas=NUM_CADENAS,
+                                         razon_temperaturas=RAZON_TEMPERATURAS_REPLICAS,
+                                         ruta_inicial=None,
+                                         calibrar_temperatura=CALIBRAR_TEMPERATURA_INICIAL,
+                                         aceptacion_inicial=None,
+                                         enfriamiento_adaptativo=ENFRIAMIENTO_ADAPTATIVO,
+                                         pasos_sin_mejora_max=PASOS_SIN_MEJORA_MAX,
+                                         backend=BACKEND_RECOCIDO,
+                                         fecha_limite=None, progreso=None,
+                                         heuristica_inicial=HEURISTICA_INICIAL,
+                                         cota_inferior=None, brecha_parada=BRECHA_PARADA,
+                                         umbral_exacto=UMBRAL_SOLUCION_EXACTA, estadisticas=None,
+                                         mostrar_progreso=MOSTRAR_PROGRESO):
+        # Templado paralelo (intercambio de replicas): varias cadenas con
+        # temperaturas escalonadas T, T*r, T*r^2, ... que se enfrian juntas.
+        # Tras cada nivel las replicas vecinas intentan intercambiar su ruta,
+        # asi las soluciones buenas bajan a las cadenas frias y las frias
+        # pueden escapar de minimos locales subiendo a las calientes.
+        # estadisticas: EstadisticasRecocido que recibe los costos inicial y final.
+        if len(tiendas_zona) == 0:
+            if mostrar_progreso:
+                print(f"     Zona {centro_id + 1} no tiene tiendas asignadas")
+            return [centro_id, centro_id], 0
+        if len(tiendas_zona) <= umbral_exacto:
+            return cls.resolver_exacto(matriz_costos, centro_id, tiendas_zona, ruta_inicial, progreso,
+                                       estadisticas=estadisticas, heuristica_inicial=heuristica_inicial,
+                                       mostrar_progreso=mostrar_progreso)
+        inicio = time.perf_counter()
+        
+        # Sin ruta inicial dada cada replica parte de un orden aleatorio
+        # distinto; una ruta construida es la misma para todas
+        if ruta_inicial is not None:
+            heuristica_inicial = None
+        elif heuristica_inicial != 'aleatoria':
+            ruta_inicial = cls.generar_solucion_inicial_zona(
+                centro_id, tiendas_zona, matriz_costos, heuristica_inicial
+            )
+        aceptacion_inicial = aceptacion_inicial or cls.aceptacion_por_defecto(heuristica_inicial)
+        rutas_iniciales = [
+            cls.generar_solucion_inicial_zona(centro_id, tiendas_zona) if ruta_inicial is None
+            else list(ruta_inicial)
+            for _ in range(max(1, num_replicas))
+        ]
+        # Todas las replicas comparten las mismas listas de candidatos
+        candidatos = cls.obtener_candidatos(matriz_costos, rutas_iniciales[0], num_vecinos_candidatos)
+        replicas = [
+            cls.crear_cadena(backend, ruta_inicial, matriz_costos, operadores,
+                             intervalo_verificacion, candidatos)
+            for ruta_inicial in rutas_iniciales
+        ]
+        escalas = [razon_temperaturas ** r for r in range(len(replicas))]
+        if calibrar_temperatura and not replicas[0].sin_movimientos:
+            temp_inicial = replicas[0].calibrar_temperatura(
+                matriz_costos, aceptacion_objetivo=aceptacion_inicial
+            ) or temp_inicial
+        # El programa sigue a la replica mas caliente (escala 1) y se adapta
+        # con su tasa de aceptacion; las demas mantienen su escala relativa
+        programa = ProgramaEnfriamiento(
+            temp_inicial, tasa_enfriamiento, temp_final,
+            enfriamiento_adaptativo, pasos_sin_mejora_max, fecha_limite
+        )
+        intercambios = 0
+        costo_inicial = min(replica.costo_mejor for replica in replicas)
+        
+        if mostrar_progreso:
+            print(f"    Zona {centro_id + 1}: {len(tiendas_zona)} tiendas, {len(replicas)} replicas, "
+                  f"costo inicial: {costo_inicial:.2f}")
+        
+        while (programa.continuar() and not replicas[0].sin_movimientos and
+               min(replica.costo_mejor for replica in replicas) > 0 and
+               not cls.brecha_alcanzada(min(replica.costo_mejor for replica in replicas),
+                                        cota_inferior, brecha_parada)):
+            t = programa.t
+            mejor_previo = min(replica.costo_mejor for replica in replicas)
+            for replica, escala in zip(replicas, escalas):
+                replica.ejecutar_nivel(matriz_costos, t * escala, L)
+            
+            # Intercambio entre replicas vecinas con probabilidad
+            # min(1, exp((1/Ti - 1/Tj) * (Ei - Ej)))
+            for r in range(len(replicas) - 1):
+                caliente, fria = replicas[r], replicas[r + 1]
+                t_caliente, t_fria = t * escalas[r], t * escalas[r + 1]
+                if t_fria <= 0:
+                    continue
+                exponente = (1 / t_caliente - 1 / t_fria) * (caliente.costo - fria.costo)
+                if exponente >= 0 or random.random() < math.exp(exponente):
+                    caliente.consolidar_mejor()
+                    fria.consolidar_mejor()
+                    caliente.ruta, fria.ruta = fria.ruta, caliente.ruta
+                    caliente.costo, fria.costo = fria.costo, caliente.costo
+                    caliente.posicion, fria.posicion = fria.posicion, caliente.posicion
+                    intercambios += 1
             
-            print(f"        Optimizacion completada ({razon}) - Costo final: {costo_mejor:.2f} ({mejoras} mejoras)")
+            mejor_actual = min(replica.costo_mejor for replica in replicas)
+            programa.enfriar(replicas[0].tasa_aceptacion, mejor_actual < mejor_previo)
+            if progreso is not None:
+                progreso(mejor_actual, programa.t)
+        
+        mejor = min(replicas, key=lambda replica: replica.costo_mejor)
+        s_mejor = mejor.ruta_mejor
+        costo_mejor = cls.calcular_costo_ruta(s_mejor, matriz_costos)
+        
+        if estadisticas is not None:
+            estadisticas.registrar_costos(centro_id, len(tiendas_zona), costo_inicial, costo_mejor,
+                                          time.perf_counter() - inicio, "templado paralelo")
+        
+        if mostrar_progreso:
+            print(f"        Templado paralelo completado - "
+                  f"{cls.resumen_costos(costo_inicial, costo_mejor)} "
+                  f"({intercambios} intercambios de replicas)")
         
-        return s_mejor, costo_mejor
\ No newline at end of file
+        return s_mejor, costo_mejor
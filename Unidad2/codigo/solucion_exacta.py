@@ -0,0 +1,112 @@
+import numpy as np
+from heuristicas_constructivas import HeuristicasConstructivas
+from costos_horarios import CostosPorHora
+
+
+class SolucionExacta:
+    # Ruta optima de zonas pequeñas por programacion dinamica de Held-Karp.
+    # costo[S, j]: ruta mas barata que sale del centro, visita el conjunto de
+    # tiendas S (mascara de bits) y termina en la tienda j de S.
+    #   costo[{j}, j] = c(centro, j)
+    #   costo[S, j]   = min_i costo[S - {j}, i] + c(i, j)
+    # Los conjuntos se procesan por capas del mismo tamaño: dentro de una
+    # capa, para cada tienda j se resuelven todos los S que la contienen con
+    # una sola operacion de numpy. Memoria 2^n * n (n = 15: unos 4 MB).
+
+    @staticmethod
+    def _conjuntos_por_tamano(n):
+        conjuntos = np.arange(1 << n, dtype=np.int64)
+        tamanos = np.zeros(1 << n, dtype=np.int64)
+        for bit in range(n):
+            tamanos += (conjuntos >> bit) & 1
+        orden = np.argsort(tamanos, kind='stable')
+        limites = np.searchsorted(tamanos[orden], np.arange(n + 2))
+        return [orden[limites[k]:limites[k + 1]] for k in range(n + 1)]
+
+    @classmethod
+    def held_karp(cls, costos):
+        # costos: submatriz con el centro en el indice 0. Devuelve
+        # (costo optimo, orden local de visita empezando en 0)
+        n = len(costos) - 1
+        if n <= 0:
+            return 0.0, [0]
+        tiendas = costos[1:, 1:]
+        costo = np.full((1 << n, n), np.inf)
+        anterior = np.full((1 << n, n), -1, dtype=np.int8)
+        unitarios = 1 << np.arange(n)
+        costo[unitarios, np.arange(n)] = costos[0, 1:]
+
+        for capa in cls._conjuntos_por_tamano(n)[2:]:
+            for j in range(n):
+                conjuntos = capa[(capa >> j) & 1 == 1]
+                previos = costo[conjuntos ^ (1 << j)] + tiendas[:, j]
+                mejores = np.argmin(previos, axis=1)
+                costo[conjuntos, j] = previos[np.arange(len(conjuntos)), mejores]
+                anterior[conjuntos, j] = mejores
+
+        completo = (1 << n) - 1
+        cierres = costo[completo] + costos[1:, 0]
+        ultimo = int(np.argmin(cierres))
+        orden = []
+        conjunto = completo
+        while ultimo >= 0:
+            orden.append(ultimo + 1)
+            ultimo, conjunto = int(anterior[conjunto, ultimo]), conjunto ^ (1 << ultimo)
+        return float(cierres.min()), [0] + orden[::-1]
+
+    @classmethod
+    def held_karp_horario(cls, tiempos, minuto_salida, minutos_por_franja, minutos_servicio):
+        # Variante con costos por hora: tiempos es el subtensor (franjas x m x m)
+        # y llegada[S, j] el minuto mas temprano en que se llega a j tras
+        # visitar S. La franja de cada arista sale del minuto de salida de su
+        # origen. Es exacta si salir antes nunca hace llegar despues (FIFO);
+        # con franjas escalonadas puede no cumplirse justo en los cambios de franja.
+        n = tiempos.shape[1] - 1
+        if n <= 0:
+            return 0.0, [0]
+        num_franjas = len(tiempos)
+        tiendas = np.arange(1, n + 1)
+
+        def franjas(salidas):
+            # Los conjuntos inalcanzables (inf) se leen en la franja 0 y siguen en inf
+            return (np.where(np.isfinite(salidas), salidas, 0) // minutos_por_franja
+                    ).astype(np.int64) % num_franjas
+
+        llegada = np.full((1 << n, n), np.inf)
+        anterior = np.full((1 << n, n), -1, dtype=np.int8)
+        franja_salida = franjas(np.array(minuto_salida))
+        llegada[1 << np.arange(n), np.arange(n)] = minuto_salida + tiempos[franja_salida, 0, 1:]
+
+        for capa in cls._conjuntos_por_tamano(n)[2:]:
+            for j in range(n):
+                conjuntos = capa[(capa >> j) & 1 == 1]
+                salidas = llegada[conjuntos ^ (1 << j)] + minutos_servicio
+                previos = salidas + tiempos[franjas(salidas), tiendas[None, :], j + 1]
+                mejores = np.argmin(previos, axis=1)
+                llegada[conjuntos, j] = previos[np.arange(len(conjuntos)), mejores]
+                anterior[conjuntos, j] = mejores
+
+        completo = (1 << n) - 1
+        salidas = llegada[completo] + minutos_servicio
+        cierres = salidas + tiempos[franjas(salidas), tiendas, 0]
+        ultimo = int(np.argmin(cierres))
+        orden = []
+        conjunto = completo
+        while ultimo >= 0:
+            orden.append(ultimo + 1)
+            ultimo, conjunto = int(anterior[conjunto, ultimo]), conjunto ^ (1 << ultimo)
+        return float(cierres.min() - minuto_salida - n * minutos_servicio), [0] + orden[::-1]
+
+    @classmethod
+    def resolver(cls, matriz_costos, centro_id, tiendas_ids):
+        # Devuelve ([centro, tiendas en orden optimo, centro], costo)
+        nodos = np.asarray([centro_id] + list(tiendas_ids))
+        if isinstance(matriz_costos, CostosPorHora):
+            _, orden = cls.held_karp_horario(
+                matriz_costos.subtensor(nodos), matriz_costos.minuto_salida,
+                matriz_costos.minutos_por_franja, matriz_costos.minutos_servicio
+            )
+            ruta = nodos[orden].tolist() + [centro_id]
+            return ruta, matriz_costos.costo_ruta(ruta)
+        costo, orden = cls.held_karp(HeuristicasConstructivas.submatriz(matriz_costos, nodos))
+        return nodos[orden].tolist() + [centro_id], costo
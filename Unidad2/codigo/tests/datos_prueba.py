@@ -0,0 +1,53 @@
+import sys
+import os
+import numpy as np
+
+# Generadores de datos sinteticos compartidos por las pruebas
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmark_optimizacion import generar_red, generar_matriz_costos
+from route_optimizer import RouteOptimizer
+
+
+def generar_matriz(num_nodos, semilla, simetrica=False):
+    # Costos uniformes entre 1 y 100; sin simetria c(i, j) y c(j, i) son independientes
+    generador = np.random.default_rng(semilla)
+    matriz = generador.uniform(1.0, 100.0, (num_nodos, num_nodos))
+    if simetrica:
+        matriz = (matriz + matriz.T) / 2
+    np.fill_diagonal(matriz, 0.0)
+    return matriz
+
+
+def generar_matriz_puntos(num_nodos, semilla):
+    # Distancias euclidianas entre puntos al azar en un cuadrado de 100 x 100
+    puntos = np.random.default_rng(semilla).uniform(0.0, 100.0, (num_nodos, 2))
+    return np.sqrt(((puntos[:, None, :] - puntos[None, :, :]) ** 2).sum(axis=2))
+
+
+
+def crear_optimizador(num_tiendas, num_centros, semilla=0):
+    # RouteOptimizer con una red sintetica ya cargada y asignada por proximidad,
+    # sin archivos. Los centros son las primeras filas: zona_id = fila del centro
+    optimizador = RouteOptimizer()
+    cargador = optimizador.data_loader
+    cargador.datos_df = generar_red(num_tiendas, num_centros, semilla)
+    cargador.costo_total_matrix = generar_matriz_costos(cargador.datos_df, semilla)
+    cargador.separar_ubicaciones()
+    cargador.asignar_tiendas_a_zonas('proximidad')
+    return optimizador
+
+
+def verificar_rutas(optimizador):
+    # Cada zona: ruta cerrada en su centro que visita una vez cada tienda de
+    # la zona, con el costo de la ruta
+    matriz = optimizador.data_loader.costo_total_matrix
+    for zona_id, resultado in optimizador.resultados_zonas.items():
+        ruta = resultado['ruta']
+        tiendas = sorted(optimizador.data_loader.obtener_tiendas_por_zona(zona_id).index)
+        assert ruta[0] == zona_id and ruta[-1] == zona_id, f"Zona {zona_id}: ruta no cerrada {ruta}"
+        assert sorted(nodo for nodo in ruta if nodo != zona_id) == tiendas, \
+            f"Zona {zona_id}: la ruta no visita cada tienda una vez"
+        costo = float(matriz[ruta[:-1], ruta[1:]].sum())
+        assert abs(costo - resultado['costo']) < 1e-6, \
+            f"Zona {zona_id}: costo {resultado['costo']}, real {costo}"
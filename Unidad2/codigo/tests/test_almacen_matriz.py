@@ -0,0 +1,66 @@
+import sys
+import os
+import numpy as np
+import pandas as pd
+
+# Agregar el directorio del codigo al path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from almacen_matriz import AlmacenMatrizCostos
+from generar_matriz_distancias import calcular_matriz_haversine
+
+NUM_INICIALES = 20
+
+
+def generar_ubicaciones(nombres, semilla):
+    generador = np.random.default_rng(semilla)
+    return pd.DataFrame({
+        'Nombre': nombres,
+        'Latitud_WGS84': 24.8 + (generador.random(len(nombres)) - 0.5) * 0.2,
+        'Longitud_WGS84': -107.4 + (generador.random(len(nombres)) - 0.5) * 0.2
+    })
+
+
+def test_sincronizar_agrega_retira_y_mueve(tmp_path):
+    """Solo cambian las filas y columnas de las ubicaciones agregadas o movidas"""
+    print("Probando AlmacenMatrizCostos.sincronizar...")
+    datos_df = generar_ubicaciones([f'Tienda {i}' for i in range(NUM_INICIALES)], semilla=0)
+    distancias = calcular_matriz_haversine(datos_df['Latitud_WGS84'], datos_df['Longitud_WGS84'])
+    combustible = distancias * np.random.default_rng(1).uniform(0.1, 0.3, distancias.shape)
+    almacen = AlmacenMatrizCostos(str(tmp_path / 'almacen.npy'), tipo_dato='float64')
+    almacen.inicializar(datos_df, distancias, combustible)
+    capacidad_inicial = len(almacen._abrir())
+    inicial = pd.DataFrame(distancias + combustible, index=datos_df['Nombre'], columns=datos_df['Nombre'])
+
+    # Se retiran 2, se mueve 1 y se agregan mas de las ranuras libres
+    retiradas = ['Tienda 3', 'Tienda 11']
+    movida = 'Tienda 7'
+    libres = capacidad_inicial - NUM_INICIALES + len(retiradas)
+    agregadas = generar_ubicaciones([f'Nueva {i}' for i in range(libres + 2)], semilla=2)
+    actual = datos_df[~datos_df['Nombre'].isin(retiradas)].copy()
+    actual.loc[actual['Nombre'] == movida, 'Latitud_WGS84'] += 0.01
+    actual = pd.concat([actual, agregadas], ignore_index=True)
+
+    cambios = almacen.sincronizar(actual, metodo_distancias='haversine')
+    assert cambios == (len(agregadas), len(retiradas), 1), f"Cambios inesperados: {cambios}"
+    assert len(almacen._abrir()) > capacidad_inicial, "No se amplio la capacidad"
+
+    nombres = actual['Nombre'].tolist()
+    matriz = almacen.matriz(nombres)
+    conservadas = [nombre for nombre in nombres if nombre in inicial.index and nombre != movida]
+    filas = [nombres.index(nombre) for nombre in conservadas]
+    assert np.array_equal(matriz[np.ix_(filas, filas)], inicial.loc[conservadas, conservadas].to_numpy()), \
+        "Las ubicaciones conservadas cambiaron de costo"
+
+    # Filas y columnas nuevas: haversine * (1 + factor de combustible)
+    esperada = calcular_matriz_haversine(actual['Latitud_WGS84'], actual['Longitud_WGS84'])
+    esperada *= 1.0 + almacen.indice['factor_combustible']
+    nuevas = [nombres.index(nombre) for nombre in nombres if nombre not in conservadas]
+    assert np.allclose(matriz[nuevas, :], esperada[nuevas, :], rtol=1e-9, atol=1e-9)
+    assert np.allclose(matriz[:, nuevas], esperada[:, nuevas], rtol=1e-9, atol=1e-9)
+
+    # Sin cambios no se toca nada; el indice guardado reproduce la misma matriz
+    assert almacen.sincronizar(actual, metodo_distancias='haversine') == (0, 0, 0)
+    reabierto = AlmacenMatrizCostos(str(tmp_path / 'almacen.npy'), tipo_dato='float64')
+    assert np.array_equal(reabierto.matriz(nombres), matriz)
+    print("Test sincronizar: PASO")
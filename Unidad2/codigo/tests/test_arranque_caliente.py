@@ -0,0 +1,77 @@
+import sys
+import os
+import numpy as np
+import pytest
+
+# Agregar el directorio del codigo al path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import route_optimizer
+from utils import ResultadosManager
+from heuristicas_constructivas import HeuristicasConstructivas
+from datos_prueba import crear_optimizador
+
+NUM_TIENDAS = 60
+NUM_CENTROS = 2
+
+
+def guardar_rutas_previas(directorio):
+    # Resultados de una ejecucion normal en el reporte de texto y el JSON
+    optimizador = crear_optimizador(NUM_TIENDAS, NUM_CENTROS)
+    resultados, costo_total = optimizador.optimizar_rutas_por_zonas(semilla=1)
+    archivos = {'txt': str(directorio / 'resultados.txt'), 'json': str(directorio / 'resultados.json')}
+    ResultadosManager.guardar_resultados_archivo(
+        resultados, costo_total, optimizador.data_loader.datos_df,
+        archivo=archivos['txt'], archivo_json=archivos['json']
+    )
+    return archivos, rutas_por_nombre(optimizador, resultados)
+
+
+def rutas_por_nombre(optimizador, resultados):
+    nombres = optimizador.data_loader.datos_df['Nombre'].to_numpy()
+    return {resultado['centro']: nombres[resultado['ruta']].tolist() for resultado in resultados.values()}
+
+
+def optimizar_sin_iteraciones(optimizador, archivo, monkeypatch):
+    # L = 0: el recocido no propone movimientos y devuelve su ruta inicial
+    monkeypatch.setattr(route_optimizer, 'L_ITERACIONES', 0)
+    resultados, _ = optimizador.optimizar_rutas_por_zonas(
+        arranque_caliente=True, archivo_rutas_previas=archivo, semilla=2
+    )
+    return rutas_por_nombre(optimizador, resultados)
+
+
+@pytest.mark.parametrize('formato', ['json', 'txt'])
+def test_arranque_caliente_sin_iteraciones_devuelve_las_rutas_previas(tmp_path, monkeypatch, formato):
+    """Sin cambios en la red y sin iteraciones, la ruta de cada zona es la de la ejecucion anterior"""
+    print("Probando ArranqueCaliente...")
+    archivos, previas = guardar_rutas_previas(tmp_path)
+    optimizador = crear_optimizador(NUM_TIENDAS, NUM_CENTROS)
+    assert optimizar_sin_iteraciones(optimizador, archivos[formato], monkeypatch) == previas
+    print("Test arranque caliente: PASO")
+
+
+def test_arranque_caliente_repara_tiendas_retiradas_y_renombradas(tmp_path, monkeypatch):
+    """Las tiendas que ya no estan se quitan, y una renombrada se trata como nueva (insercion mas barata)"""
+    archivos, previas = guardar_rutas_previas(tmp_path)
+    optimizador = crear_optimizador(NUM_TIENDAS, NUM_CENTROS)
+    cargador = optimizador.data_loader
+    ruta_zona = previas[cargador.datos_df.loc[0, 'Nombre']]
+    retirada, renombrada = ruta_zona[3], ruta_zona[7]
+
+    # Red del dia siguiente: una tienda menos y otra con nombre nuevo
+    conservar = (cargador.datos_df['Nombre'] != retirada).to_numpy()
+    cargador.datos_df = cargador.datos_df[conservar].reset_index(drop=True)
+    cargador.datos_df.loc[cargador.datos_df['Nombre'] == renombrada, 'Nombre'] = 'Tienda renombrada'
+    cargador.costo_total_matrix = cargador.costo_total_matrix[np.ix_(conservar, conservar)]
+    cargador.separar_ubicaciones()
+    cargador.asignar_tiendas_a_zonas('proximidad')
+
+    # Orden previo sin las dos tiendas, y la renombrada en su insercion mas barata
+    indice = {nombre: i for i, nombre in enumerate(cargador.datos_df['Nombre'])}
+    ruta = [indice[nombre] for nombre in ruta_zona if nombre not in (retirada, renombrada)]
+    HeuristicasConstructivas.insertar_mas_barato(ruta, indice['Tienda renombrada'], cargador.costo_total_matrix)
+    esperadas = dict(previas)
+    esperadas[ruta_zona[0]] = cargador.datos_df['Nombre'].to_numpy()[ruta].tolist()
+
+    assert optimizar_sin_iteraciones(optimizador, archivos['json'], monkeypatch) == esperadas
@@ -0,0 +1,172 @@
+import sys
+import os
+import json
+import numpy as np
+import pandas as pd
+import pytest
+
+# Agregar el directorio del codigo al path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import data_loader
+import ejecucion_paralela
+from cache_matrices import CacheMatrizCostos
+from config import ARCHIVO_MATRIZ_DISTANCIAS, ARCHIVO_MATRIZ_COMBUSTIBLE, ARCHIVO_CACHE_MATRIZ
+from datos_prueba import generar_matriz, crear_optimizador
+
+NUM_UBICACIONES = 12
+NUM_TIENDAS_RUTAS = 60
+NUM_CENTROS_RUTAS = 2
+
+
+def crear_fuentes(directorio, semilla=0):
+    # Dos archivos fuente y la cache de su suma
+    fuentes = [str(directorio / 'distancias.bin'), str(directorio / 'combustible.bin')]
+    matriz = generar_matriz(NUM_UBICACIONES, semilla)
+    for i, fuente in enumerate(fuentes):
+        np.save(fuente, matriz * (i + 1), allow_pickle=False)
+        os.replace(fuente + '.npy', fuente)
+    cache = CacheMatrizCostos(fuentes, archivo_cache=str(directorio / 'cache.npy'))
+    cache.guardar(matriz * 3)
+    return fuentes, cache, matriz * 3
+
+
+def test_cache_se_reutiliza_sin_cambios(tmp_path):
+    """Con las fuentes sin cambios la cache se carga tal cual, en memoria o mapeada"""
+    print("Probando CacheMatrizCostos...")
+    fuentes, cache, matriz = crear_fuentes(tmp_path)
+
+    assert np.array_equal(cache.cargar(), matriz)
+    mapeada = CacheMatrizCostos(fuentes, archivo_cache=cache.archivo_cache).cargar(memoria_mapeada=True)
+    assert isinstance(mapeada, np.memmap) and np.array_equal(mapeada, matriz)
+    # Escritura atomica: no quedan temporales
+    assert sorted(os.listdir(tmp_path)) == ['cache.npy', 'cache.npy.meta.json', 'combustible.bin', 'distancias.bin']
+    print("Test cache: PASO")
+
+
+def test_cache_invalida_si_cambia_una_fuente(tmp_path):
+    """Otro contenido en una fuente invalida la cache; solo otra fecha no"""
+    fuentes, cache, matriz = crear_fuentes(tmp_path)
+
+    # Misma informacion con otra fecha (copia, checkout): se valida por SHA-256
+    estado = os.stat(fuentes[0])
+    os.utime(fuentes[0], ns=(estado.st_atime_ns, estado.st_mtime_ns + 10 ** 9))
+    assert np.array_equal(cache.cargar(), matriz)
+    with open(cache.archivo_metadatos, encoding='utf-8') as f:
+        assert json.load(f)['fuentes'][fuentes[0]]['modificacion'] == estado.st_mtime_ns + 10 ** 9
+
+    # Mismo tamaño, otro contenido
+    with open(fuentes[1], 'r+b') as f:
+        f.seek(-8, os.SEEK_END)
+        f.write(b'\x01' * 8)
+    assert cache.cargar() is None
+
+
+def test_cache_invalida_si_cambia_el_tipo_de_dato(tmp_path):
+    fuentes, cache, _ = crear_fuentes(tmp_path)
+    assert CacheMatrizCostos(fuentes, archivo_cache=cache.archivo_cache, tipo_dato='float32').cargar() is None
+    assert CacheMatrizCostos(fuentes[:1], archivo_cache=cache.archivo_cache).cargar() is None
+
+
+METADATOS_INVALIDOS = [
+    None,
+    '',
+    '{"tipo_dato": "float64"',
+    '[]',
+    '{"tipo_dato": "float64"}',
+    # Fuentes sin huella
+    lambda fuentes: json.dumps({'tipo_dato': 'float64', 'fuentes': {fuente: {} for fuente in fuentes}})
+]
+
+
+@pytest.mark.parametrize('metadatos', METADATOS_INVALIDOS)
+def test_cache_invalida_sin_metadatos_validos(tmp_path, metadatos):
+    """Metadatos ausentes, corruptos o incompletos obligan a regenerar la cache"""
+    fuentes, cache, _ = crear_fuentes(tmp_path)
+    if metadatos is None:
+        os.remove(cache.archivo_metadatos)
+    else:
+        with open(cache.archivo_metadatos, 'w', encoding='utf-8') as f:
+            f.write(metadatos(fuentes) if callable(metadatos) else metadatos)
+    assert cache.cargar() is None
+
+
+def test_cache_invalida_si_el_npy_esta_danado(tmp_path):
+    _, cache, _ = crear_fuentes(tmp_path)
+    with open(cache.archivo_cache, 'r+b') as f:
+        f.truncate(64)
+    assert cache.cargar() is None
+
+
+def escribir_matrices_xlsx(matriz):
+    pd.DataFrame(matriz / 2).to_excel(ARCHIVO_MATRIZ_DISTANCIAS, index=False)
+    pd.DataFrame(matriz / 2).to_excel(ARCHIVO_MATRIZ_COMBUSTIBLE, index=False)
+
+
+def test_data_loader_reutiliza_y_regenera_la_cache(tmp_path, monkeypatch):
+    """El primer arranque lee los .xlsx y crea la cache; los siguientes no los leen"""
+    monkeypatch.chdir(tmp_path)
+    matriz = generar_matriz(NUM_UBICACIONES, semilla=1)
+    escribir_matrices_xlsx(matriz)
+    cargador = data_loader.DataLoader()
+    assert cargador.cargar_matrices_costos()
+    assert np.allclose(cargador.costo_total_matrix, matriz)
+    assert os.path.exists(ARCHIVO_CACHE_MATRIZ)
+
+    lecturas = []
+    leer_excel = pd.read_excel
+
+    def contar_lecturas(*args, **kwargs):
+        lecturas.append(args[0])
+        return leer_excel(*args, **kwargs)
+
+    monkeypatch.setattr(data_loader.pd, 'read_excel', contar_lecturas)
+    assert cargador.cargar_matrices_costos()
+    assert lecturas == [] and np.allclose(cargador.costo_total_matrix, matriz)
+
+    # Metadatos dañados: se vuelve a leer los .xlsx y se reescribe la cache
+    with open(ARCHIVO_CACHE_MATRIZ + '.meta.json', 'w', encoding='utf-8') as f:
+        f.write('{')
+    assert cargador.cargar_matrices_costos()
+    assert len(lecturas) == 2
+    assert cargador.cargar_matrices_costos()
+    assert len(lecturas) == 2
+
+    # Nueva matriz de distancias: la cache anterior ya no sirve
+    escribir_matrices_xlsx(matriz * 2)
+    assert cargador.cargar_matrices_costos()
+    assert len(lecturas) == 4 and np.allclose(cargador.costo_total_matrix, matriz * 2)
+
+
+@pytest.mark.parametrize('memoria_mapeada', [False, True])
+def test_matriz_mapeada_da_las_mismas_rutas(tmp_path, monkeypatch, memoria_mapeada):
+    """La matriz mapeada desde la cache da las mismas rutas que en memoria, tambien en procesos"""
+    monkeypatch.chdir(tmp_path)
+    referencia = crear_optimizador(NUM_TIENDAS_RUTAS, NUM_CENTROS_RUTAS)
+    matriz = referencia.data_loader.costo_total_matrix
+    esperados, costo_esperado = referencia.optimizar_rutas_por_zonas(semilla=3)
+
+    escribir_matrices_xlsx(matriz)
+    monkeypatch.setattr(data_loader, 'MATRIZ_MEMORIA_MAPEADA', memoria_mapeada)
+    optimizador = crear_optimizador(NUM_TIENDAS_RUTAS, NUM_CENTROS_RUTAS)
+    assert optimizador.data_loader.cargar_matrices_costos()
+    cargada = optimizador.data_loader.costo_total_matrix
+    assert isinstance(cargada, np.memmap) == memoria_mapeada
+
+    # Con la matriz mapeada los procesos abren el archivo: no se crea memoria compartida
+    creadas = []
+    memoria_compartida = ejecucion_paralela.shared_memory.SharedMemory
+
+    def contar_memoria(*args, **kwargs):
+        creadas.append(kwargs.get('create', False))
+        return memoria_compartida(*args, **kwargs)
+
+    monkeypatch.setattr(ejecucion_paralela.shared_memory, 'SharedMemory', contar_memoria)
+    for modo_ejecucion in ('secuencial', 'procesos'):
+        resultados, costo = optimizador.optimizar_rutas_por_zonas(
+            modo_ejecucion=modo_ejecucion, num_procesos=2, semilla=3
+        )
+        assert costo == pytest.approx(costo_esperado)
+        for zona_id, resultado in esperados.items():
+            assert resultados[zona_id]['ruta'] == resultado['ruta'], f"{modo_ejecucion}, zona {zona_id}"
+    assert creadas == ([] if memoria_mapeada else [True])
@@ -0,0 +1,113 @@
+import sys
+import os
+import random
+import itertools
+import numpy as np
+
+# Agregar el directorio del codigo al path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from costos_horarios import CostosPorHora
+from simulated_annealing import CadenaRecocidoHoraria, SimulatedAnnealing
+from solucion_exacta import SolucionExacta
+from movimientos import OPERADORES_MOVIMIENTO
+
+MAX_TIENDAS_FUERZA_BRUTA = 7
+MOVIMIENTOS_EVALUADOS = 3000
+
+
+def crear_costos(tmp_path, tensor, minutos_por_franja, minutos_servicio=5, hora_salida=7.0):
+    archivo = str(tmp_path / 'tensor_horario.npy')
+    np.save(archivo, tensor)
+    return CostosPorHora(archivo, minutos_por_franja=minutos_por_franja, hora_salida=hora_salida,
+                         minutos_servicio=minutos_servicio, franjas_en_memoria=4)
+
+
+def tensor_aleatorio(num_franjas, num_nodos, semilla):
+    # Cada franja asimetrica e independiente de las demas
+    tensor = np.random.default_rng(semilla).uniform(5.0, 40.0, (num_franjas, num_nodos, num_nodos))
+    tensor[:, np.arange(num_nodos), np.arange(num_nodos)] = 0.0
+    return tensor
+
+
+def tensor_fifo(num_nodos, semilla, num_franjas=24):
+    # Tiempos que crecen con la franja: salir antes nunca hace llegar despues
+    # mientras la ruta no pase de la ultima franja del dia
+    base = np.random.default_rng(semilla).uniform(10.0, 60.0, (num_nodos, num_nodos))
+    np.fill_diagonal(base, 0.0)
+    return base[None, :, :] * (1.0 + 0.05 * np.arange(num_franjas))[:, None, None]
+
+
+def test_evaluar_coincide_con_costo_ruta(tmp_path):
+    """El delta de _evaluar y las llegadas de _confirmar coinciden con recalcular la ruta"""
+    print("Probando CadenaRecocidoHoraria._evaluar...")
+    # Franjas cortas: los movimientos desplazan muchas salidas de franja
+    costos = crear_costos(tmp_path, tensor_aleatorio(12, 25, semilla=1), minutos_por_franja=10)
+    random.seed(2)
+    ruta = [0] + random.sample(range(1, 25), 24) + [0]
+    cadena = CadenaRecocidoHoraria(ruta, costos, operadores=list(OPERADORES_MOVIMIENTO))
+    operadores = cadena.selector.operadores
+
+    for _ in range(MOVIMIENTOS_EVALUADOS):
+        operador = random.choice(operadores)
+        movimiento = operador.proponer(cadena.ruta)
+        if movimiento is None:
+            continue
+        delta, inicio, fin, llegadas_nuevas, desplazados, tramo_original = cadena._evaluar(operador, movimiento)
+        costo_real = costos.costo_ruta(cadena.ruta)
+        assert abs(cadena.costo + delta - costo_real) < 1e-6, \
+            f"{operador.__name__} {movimiento}: delta {delta}, real {costo_real - cadena.costo}"
+
+        if random.random() < 0.5:
+            cadena.ruta[inicio:fin + 1] = tramo_original
+        else:
+            cadena._confirmar(inicio, llegadas_nuevas, desplazados)
+            cadena.costo = costo_real
+            esperadas = np.array(costos.llegadas(cadena.ruta))
+            assert np.allclose(cadena.llegada, esperadas, atol=1e-6), \
+                f"{operador.__name__} {movimiento}: llegadas desplazadas incorrectas"
+            # Los margenes se recalculan igual que al asignar la ruta completa
+            nueva = CadenaRecocidoHoraria(cadena.ruta[:], costos, operadores=list(OPERADORES_MOVIMIENTO))
+            assert np.allclose(cadena.margen_abajo, nueva.margen_abajo, atol=1e-6)
+            assert np.allclose(cadena.margen_arriba, nueva.margen_arriba, atol=1e-6)
+    print("Test _evaluar: PASO")
+
+
+def test_ejecutar_nivel_conserva_el_costo(tmp_path):
+    """Tras varios niveles el costo acumulado por deltas es el de la ruta"""
+    costos = crear_costos(tmp_path, tensor_aleatorio(12, 40, semilla=3), minutos_por_franja=15)
+    random.seed(4)
+    ruta = [0] + random.sample(range(1, 40), 39) + [0]
+    cadena = CadenaRecocidoHoraria(ruta, costos)
+    t = 50.0
+    for _ in range(30):
+        cadena.ejecutar_nivel(costos, t, 100)
+        t *= 0.9
+        assert abs(cadena.costo - costos.costo_ruta(cadena.ruta)) < 1e-6
+    assert abs(cadena.costo_mejor - costos.costo_ruta(cadena.ruta_mejor)) < 1e-6
+
+
+def test_held_karp_horario_contra_fuerza_bruta(tmp_path):
+    """Con tiempos FIFO held_karp_horario encuentra la ruta de menor duracion"""
+    print("Probando held_karp_horario...")
+    for num_tiendas in range(1, MAX_TIENDAS_FUERZA_BRUTA + 1):
+        for semilla in range(2):
+            costos = crear_costos(tmp_path, tensor_fifo(num_tiendas + 1, 10 * num_tiendas + semilla),
+                                  minutos_por_franja=60)
+            tiendas = list(range(1, num_tiendas + 1))
+            optimo = min(costos.costo_ruta([0] + list(orden) + [0])
+                         for orden in itertools.permutations(tiendas))
+
+            costo, orden = SolucionExacta.held_karp_horario(
+                costos.subtensor([0] + tiendas), costos.minuto_salida,
+                costos.minutos_por_franja, costos.minutos_servicio
+            )
+            assert abs(costo - optimo) < 1e-6, \
+                f"{num_tiendas} tiendas, semilla {semilla}: held_karp_horario {costo}, optimo {optimo}"
+            assert abs(costos.costo_ruta(orden + [0]) - costo) < 1e-6, \
+                f"{num_tiendas} tiendas: el orden no tiene el costo reportado"
+
+            ruta, costo_ruta = SolucionExacta.resolver(costos, 0, tiendas)
+            assert abs(costo_ruta - optimo) < 1e-6
+            assert abs(SimulatedAnnealing.calcular_costo_ruta(ruta, costos) - costo_ruta) < 1e-6
+    print("Test held_karp_horario: PASO")
@@ -0,0 +1,82 @@
+import sys
+import os
+import random
+from collections import Counter
+import numpy as np
+import pandas as pd
+
+# Agregar el directorio del codigo al path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cvrp import RuteoCapacitado
+from simulated_annealing import SimulatedAnnealing
+from datos_prueba import generar_matriz_puntos
+
+NUM_TIENDAS = 40
+CAPACIDAD = 20000
+
+
+def generar_zona(semilla):
+    # Centro en la fila 0 y tiendas con demandas de 1000 a 9000
+    matriz = generar_matriz_puntos(NUM_TIENDAS + 1, semilla)
+    tiendas_zona = pd.DataFrame(
+        {'Capacidad_Venta': np.random.default_rng(semilla).integers(1, 10, NUM_TIENDAS) * 1000},
+        index=range(1, NUM_TIENDAS + 1)
+    )
+    return matriz, tiendas_zona
+
+
+def optimizar(matriz, tiendas_zona, capacidad=CAPACIDAD):
+    return RuteoCapacitado.optimizar_zona_cvrp(
+        matriz, 0, tiendas_zona, capacidad, temp_inicial=5000, tasa_enfriamiento=0.9,
+        temp_final=0.01, L=30, mostrar_progreso=False
+    )
+
+
+def test_rutas_respetan_capacidad_y_visitan_cada_tienda():
+    """Cada vehiculo cabe en la capacidad y cada tienda se visita exactamente una vez"""
+    print("Probando RuteoCapacitado.optimizar_zona_cvrp...")
+    for semilla in range(3):
+        random.seed(semilla)
+        matriz, tiendas_zona = generar_zona(semilla)
+        demandas = tiendas_zona['Capacidad_Venta'].to_dict()
+        ruta, costo = optimizar(matriz, tiendas_zona)
+
+        rutas = RuteoCapacitado.separar_rutas(ruta, 0)
+        assert ruta[0] == 0 and ruta[-1] == 0, f"La ruta no empieza y termina en el centro: {ruta}"
+        assert RuteoCapacitado.unir_rutas(rutas, 0) == ruta
+        for vehiculo in rutas:
+            carga = sum(demandas[nodo] for nodo in vehiculo[1:-1])
+            assert carga <= CAPACIDAD, f"Semilla {semilla}: vehiculo con carga {carga} > {CAPACIDAD}"
+        visitas = Counter(nodo for nodo in ruta if nodo != 0)
+        assert visitas == Counter(tiendas_zona.index), f"Semilla {semilla}: visitas {visitas}"
+        assert abs(SimulatedAnnealing.calcular_costo_ruta(ruta, matriz) - costo) < 1e-6, \
+            f"Semilla {semilla}: el costo no corresponde a la ruta"
+    print("Test capacidad: PASO")
+
+
+def test_tienda_mayor_que_la_capacidad_va_sola():
+    """Una tienda con demanda mayor a la capacidad se atiende en su propio vehiculo"""
+    random.seed(0)
+    matriz, tiendas_zona = generar_zona(semilla=5)
+    tiendas_zona.loc[7, 'Capacidad_Venta'] = CAPACIDAD + 1000
+    ruta, _ = optimizar(matriz, tiendas_zona)
+
+    assert [0, 7, 0] in RuteoCapacitado.separar_rutas(ruta, 0)
+    assert Counter(nodo for nodo in ruta if nodo != 0) == Counter(tiendas_zona.index)
+
+
+def test_zona_vacia_devuelve_el_centro():
+    """Sin tiendas todos los modos devuelven la ruta cerrada en el centro de la zona"""
+    matriz, tiendas_zona = generar_zona(semilla=0)
+    vacia = tiendas_zona.iloc[:0]
+    centro = 3
+    parametros = {'temp_inicial': 100, 'tasa_enfriamiento': 0.9, 'mostrar_progreso': False}
+
+    assert SimulatedAnnealing.optimizar_zona(matriz, centro, vacia, **parametros) == ([centro, centro], 0)
+    assert SimulatedAnnealing.optimizar_zona_templado_paralelo(
+        matriz, centro, vacia, **parametros
+    ) == ([centro, centro], 0)
+    assert RuteoCapacitado.optimizar_zona_cvrp(
+        matriz, centro, vacia, CAPACIDAD, **parametros
+    ) == ([centro, centro], 0)
@@ -0,0 +1,74 @@
+import sys
+import os
+import numpy as np
+import pytest
+
+# Agregar el directorio del codigo al path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_loader import DataLoader
+from datos_prueba import generar_red, generar_matriz_costos
+
+NUM_TIENDAS = 200
+NUM_CENTROS = 6
+
+
+def crear_cargador(semilla):
+    cargador = DataLoader()
+    cargador.datos_df = generar_red(NUM_TIENDAS, NUM_CENTROS, semilla)
+    cargador.costo_total_matrix = generar_matriz_costos(cargador.datos_df, semilla)
+    cargador.separar_ubicaciones()
+    return cargador
+
+
+def cargas_por_zona(cargador, asignaciones):
+    capacidades = cargador.tiendas['Capacidad_Venta'].to_numpy(dtype=np.float64)
+    return np.bincount(asignaciones, weights=capacidades, minlength=NUM_CENTROS)
+
+
+@pytest.mark.parametrize('tolerancia', [0.0, 0.05, 0.2])
+def test_balanceada_respeta_el_tope(tolerancia):
+    """Cada tienda queda en una zona y ninguna zona pasa del tope (mas una tienda tras la reparacion)"""
+    print("Probando DataLoader.asignar_zonas_balanceadas...")
+    for semilla in range(3):
+        cargador = crear_cargador(semilla)
+        asignaciones = cargador.asignar_zonas_balanceadas(tolerancia)
+
+        assert asignaciones is not None
+        assert asignaciones.shape == (NUM_TIENDAS,)
+        assert ((asignaciones >= 0) & (asignaciones < NUM_CENTROS)).all()
+        capacidades = cargador.tiendas['Capacidad_Venta']
+        tope = capacidades.sum() / NUM_CENTROS * (1 + tolerancia)
+        cargas = cargas_por_zona(cargador, asignaciones)
+        assert cargas.max() <= tope + capacidades.max(), \
+            f"Semilla {semilla}: carga {cargas.max()} > tope {tope} + una tienda"
+    print("Test balanceada: PASO")
+
+
+def test_balanceada_mas_pareja_que_proximidad():
+    """Con tope estricto las cargas quedan mas parejas que con el centro mas cercano"""
+    cargador = crear_cargador(semilla=1)
+    assert cargador.asignar_tiendas_a_zonas('proximidad')
+    cercanas = cargador.tiendas['zona'].to_numpy()
+    assert cargador.asignar_tiendas_a_zonas('balanceada')
+    balanceadas = cargador.tiendas['zona'].to_numpy()
+
+    assert cargas_por_zona(cargador, balanceadas).max() < cargas_por_zona(cargador, cercanas).max()
+
+
+def test_balanceada_sin_tope_es_el_centro_mas_barato():
+    """Con un tope holgado cada tienda va al centro de menor costo real"""
+    cargador = crear_cargador(semilla=2)
+    asignaciones = cargador.asignar_zonas_balanceadas(tolerancia=float(NUM_CENTROS))
+
+    costos = cargador.costo_total_matrix[np.ix_(cargador.tiendas.index, cargador.centros_distribucion.index)]
+    assert np.array_equal(asignaciones, costos.argmin(axis=1))
+
+
+def test_balanceada_sin_matriz():
+    """Sin matriz de costos no hay asignacion balanceada y se usa proximidad"""
+    cargador = crear_cargador(semilla=0)
+    cargador.costo_total_matrix = None
+    assert cargador.asignar_zonas_balanceadas() is None
+    assert cargador.asignar_tiendas_a_zonas('balanceada')
+    assert cargador.tiendas['zona'].between(0, NUM_CENTROS - 1).all()
@@ -0,0 +1,94 @@
+import sys
+import os
+import numpy as np
+import pandas as pd
+
+# Agregar el directorio del codigo al path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ejecucion_paralela import EjecutorZonasParalelo, crear_estrategia, optimizar_zona_con_semilla
+from datos_prueba import generar_matriz_puntos
+
+NUM_CENTROS = 3
+TIENDAS_POR_ZONA = 20
+SEMILLA = 7
+# Recocido corto: basta para que las cadenas hagan miles de movimientos
+PARAMETROS = {
+    'temp_inicial': 100.0,
+    'tasa_enfriamiento': 0.9,
+    'temp_final': 0.01,
+    'L': 30,
+    'heuristica_inicial': 'aleatoria',
+    'brecha_parada': None,
+    'estadisticas': False,
+    'mostrar_progreso': False
+}
+
+
+def generar_zonas(semilla=0):
+    # Centros en las filas 0..NUM_CENTROS-1; cada zona con sus tiendas contiguas
+    matriz = generar_matriz_puntos(NUM_CENTROS * (TIENDAS_POR_ZONA + 1), semilla)
+    tareas = []
+    for zona_id in range(NUM_CENTROS):
+        inicio = NUM_CENTROS + zona_id * TIENDAS_POR_ZONA
+        tiendas_zona = pd.DataFrame(
+            {'Capacidad_Venta': np.full(TIENDAS_POR_ZONA, 1000)},
+            index=range(inicio, inicio + TIENDAS_POR_ZONA)
+        )
+        tareas.append((zona_id, tiendas_zona))
+    return matriz, tareas
+
+
+def comparar_con_secuencial(estrategia):
+    matriz, tareas = generar_zonas()
+    secuencial = {
+        zona_id: optimizar_zona_con_semilla(matriz, zona_id, tiendas_zona, PARAMETROS, estrategia, SEMILLA)[:2]
+        for zona_id, tiendas_zona in tareas
+    }
+    with EjecutorZonasParalelo(matriz, num_procesos=2) as ejecutor:
+        paralelo = ejecutor.ejecutar(tareas, PARAMETROS, estrategia, SEMILLA)
+
+    assert list(paralelo) == [zona_id for zona_id, _ in tareas], f"Zonas fuera de orden: {list(paralelo)}"
+    for zona_id, (ruta, costo) in secuencial.items():
+        assert paralelo[zona_id][0] == ruta, f"Zona {zona_id}: rutas distintas"
+        assert abs(paralelo[zona_id][1] - costo) < 1e-9, \
+            f"Zona {zona_id}: costo paralelo {paralelo[zona_id][1]}, secuencial {costo}"
+
+
+def test_procesos_igual_que_secuencial():
+    """Con la misma semilla el pool de procesos da las mismas rutas que el modo secuencial"""
+    print("Probando EjecutorZonasParalelo.ejecutar...")
+    comparar_con_secuencial(crear_estrategia('simple', 1, 'tsp'))
+    print("Test procesos: PASO")
+
+
+def test_multiarranque_en_procesos_igual_que_secuencial():
+    """Las cadenas de multiarranque repartidas en procesos eligen la misma mejor ruta"""
+    comparar_con_secuencial(crear_estrategia('multiarranque', 3, 'tsp'))
+
+
+def costos_por_zona(estrategia, semilla, matriz, tareas):
+    return [
+        optimizar_zona_con_semilla(matriz, zona_id, tiendas_zona, PARAMETROS, estrategia, semilla)[1]
+        for zona_id, tiendas_zona in tareas
+    ]
+
+
+def test_multiarranque_no_empeora_la_cadena_simple():
+    """La cadena 0 del multiarranque es la cadena simple: el mejor costo nunca es peor"""
+    matriz, tareas = generar_zonas(semilla=1)
+    for semilla in range(3):
+        simples = costos_por_zona(crear_estrategia('simple', 1, 'tsp'), semilla, matriz, tareas)
+        multiarranque = costos_por_zona(crear_estrategia('multiarranque', 3, 'tsp'), semilla, matriz, tareas)
+        assert all(multi <= simple + 1e-9 for multi, simple in zip(multiarranque, simples)), \
+            f"Semilla {semilla}: {multiarranque} > {simples}"
+
+
+def test_templado_paralelo_mejora_la_cadena_simple():
+    """Con el mismo programa de temperatura las replicas encuentran rutas mas cortas en promedio"""
+    matriz, tareas = generar_zonas(semilla=1)
+    simples, templado = [], []
+    for semilla in range(3):
+        simples += costos_por_zona(crear_estrategia('simple', 1, 'tsp'), semilla, matriz, tareas)
+        templado += costos_por_zona(crear_estrategia('templado_paralelo', 4, 'tsp'), semilla, matriz, tareas)
+    assert sum(templado) <= sum(simples), f"Templado {sum(templado):.2f} > simple {sum(simples):.2f}"
@@ -0,0 +1,86 @@
+import sys
+import os
+import json
+import random
+import numpy as np
+import pandas as pd
+import pytest
+
+# Agregar el directorio del codigo al path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simulated_annealing import SimulatedAnnealing
+from estadisticas_recocido import EstadisticasRecocido
+from datos_prueba import generar_matriz_puntos
+
+NUM_TIENDAS = 40
+PARAMETROS = {
+    'temp_inicial': 100.0,
+    'tasa_enfriamiento': 0.9,
+    'temp_final': 0.01,
+    'L': 40,
+    'heuristica_inicial': 'aleatoria',
+    'brecha_parada': None,
+    'mostrar_progreso': False
+}
+
+
+def optimizar_con_estadisticas(muestreo, backend, semilla=5):
+    matriz = generar_matriz_puntos(NUM_TIENDAS + 1, semilla)
+    tiendas_zona = pd.DataFrame(index=range(1, NUM_TIENDAS + 1))
+    estadisticas = EstadisticasRecocido(muestreo)
+    random.seed(semilla)
+    np.random.seed(semilla)
+    ruta, costo = SimulatedAnnealing.optimizar_zona(
+        matriz, 0, tiendas_zona, backend=backend, estadisticas=estadisticas, **PARAMETROS
+    )
+    return ruta, costo, estadisticas
+
+
+@pytest.mark.parametrize('backend', ['python', 'compilado'])
+def test_contadores_consistentes(backend):
+    """Propuestos >= aceptados >= peores aceptados, y las tasas salen de los contadores"""
+    print("Probando EstadisticasRecocido...")
+    _, costo, estadisticas = optimizar_con_estadisticas(muestreo=1, backend=backend)
+
+    assert estadisticas.niveles > 0
+    assert estadisticas.propuestos >= estadisticas.aceptados >= estadisticas.peores_aceptados > 0
+    assert estadisticas.peores_propuestos >= estadisticas.peores_aceptados
+    assert estadisticas.tasa_aceptacion == estadisticas.aceptados / estadisticas.propuestos
+    assert estadisticas.tasa_aceptacion_peores == \
+        estadisticas.peores_aceptados / estadisticas.peores_propuestos
+    assert estadisticas.costo_final == pytest.approx(costo)
+    assert estadisticas.costo_inicial >= estadisticas.costo_final
+
+    # Con muestreo 1 la trayectoria tiene todos los niveles y suma los totales
+    trayectoria = estadisticas.trayectoria
+    assert trayectoria['nivel'] == list(range(1, estadisticas.niveles + 1))
+    for contador in ('propuestos', 'aceptados', 'peores_propuestos', 'peores_aceptados', 'mejoras'):
+        assert sum(trayectoria[contador]) == getattr(estadisticas, contador), contador
+    assert len(estadisticas.segundos_por_nivel) == estadisticas.niveles
+    assert sum(estadisticas.segundos_por_nivel) <= estadisticas.segundos_total
+    print("Test estadisticas: PASO")
+
+
+def test_a_dict_se_guarda_en_json():
+    _, _, estadisticas = optimizar_con_estadisticas(muestreo=3, backend='python')
+    datos = json.loads(json.dumps(estadisticas.a_dict()))
+    assert datos == estadisticas.a_dict()
+    assert datos['tasa_aceptacion'] == estadisticas.tasa_aceptacion
+    assert set(datos['trayectoria']) == set(EstadisticasRecocido.COLUMNAS_TRAYECTORIA)
+
+
+def test_muestreo_solo_adelgaza_la_trayectoria():
+    """El muestreo no cambia la ruta ni los totales, ni los tiempos de cada nivel"""
+    ruta, costo, completa = optimizar_con_estadisticas(muestreo=1, backend='python')
+    for muestreo in (4, 0):
+        ruta_muestreada, costo_muestreado, muestreada = optimizar_con_estadisticas(muestreo, backend='python')
+        assert (ruta_muestreada, costo_muestreado) == (ruta, costo)
+        for total in ('niveles', 'propuestos', 'aceptados', 'peores_aceptados', 'mejoras'):
+            assert getattr(muestreada, total) == getattr(completa, total), total
+        assert len(muestreada.segundos_por_nivel) == completa.niveles
+
+        niveles = list(range(1, completa.niveles + 1, muestreo)) if muestreo else []
+        assert muestreada.trayectoria['nivel'] == niveles
+        for columna in ('temperatura', 'costo', 'costo_mejor', 'propuestos', 'aceptados'):
+            assert muestreada.trayectoria[columna] == [completa.trayectoria[columna][n - 1] for n in niveles]
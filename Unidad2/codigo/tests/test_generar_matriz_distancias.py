@@ -0,0 +1,52 @@
+import sys
+import os
+import numpy as np
+import pytest
+
+# Agregar el directorio del codigo al path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from generar_matriz_distancias import haversine, calcular_matriz_haversine
+
+NUM_UBICACIONES = 37
+# float32 guarda unos 7 digitos: en km de una ciudad el error es de centimetros
+TOLERANCIAS = {'float64': (1e-12, 1e-9), 'float32': (1e-6, 1e-4)}
+
+
+def generar_coordenadas(semilla):
+    # Alrededor de las ubicaciones reales, mas algunos puntos lejanos y uno repetido
+    generador = np.random.default_rng(semilla)
+    latitudes = 24.8 + (generador.random(NUM_UBICACIONES) - 0.5) * 0.4
+    longitudes = -107.4 + (generador.random(NUM_UBICACIONES) - 0.5) * 0.4
+    latitudes[:3] = [-33.45, 51.5, 24.8]
+    longitudes[:3] = [-70.66, -0.12, -107.4]
+    latitudes[-1], longitudes[-1] = latitudes[5], longitudes[5]
+    return latitudes, longitudes
+
+
+@pytest.mark.parametrize('tipo_dato', ['float64', 'float32'])
+@pytest.mark.parametrize('tam_bloque', [None, 5])
+def test_matriz_igual_a_haversine_escalar(tipo_dato, tam_bloque):
+    """La matriz vectorizada coincide con haversine() y es exactamente simetrica"""
+    latitudes, longitudes = generar_coordenadas(semilla=3)
+    matriz = calcular_matriz_haversine(latitudes, longitudes, tipo_dato=tipo_dato, tam_bloque=tam_bloque)
+    esperada = np.array([
+        [haversine(latitudes[i], longitudes[i], latitudes[j], longitudes[j]) for j in range(NUM_UBICACIONES)]
+        for i in range(NUM_UBICACIONES)
+    ])
+
+    assert matriz.dtype == np.dtype(tipo_dato)
+    rtol, atol = TOLERANCIAS[tipo_dato]
+    assert np.allclose(matriz, esperada, rtol=rtol, atol=atol), \
+        f"Diferencia maxima {np.abs(matriz - esperada).max()}"
+    assert np.array_equal(matriz, matriz.T), "La matriz no es exactamente simetrica"
+    assert not np.diagonal(matriz).any()
+    assert matriz[5, -1] == 0.0
+
+
+def test_bloques_iguales_a_un_solo_bloque():
+    """El tamaño de bloque solo cambia la memoria temporal, no el resultado"""
+    latitudes, longitudes = generar_coordenadas(semilla=4)
+    completa = calcular_matriz_haversine(latitudes, longitudes)
+    for tam_bloque in (1, 5, NUM_UBICACIONES - 1, NUM_UBICACIONES + 10):
+        assert np.array_equal(calcular_matriz_haversine(latitudes, longitudes, tam_bloque=tam_bloque), completa)
@@ -0,0 +1,84 @@
+import sys
+import os
+import random
+
+# Agregar el directorio del codigo al path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from movimientos import OPERADORES_MOVIMIENTO, obtener_operadores
+from simulated_annealing import SimulatedAnnealing
+from vecinos_candidatos import calcular_vecinos_candidatos
+from datos_prueba import generar_matriz
+
+NUM_NODOS = 30
+MOVIMIENTOS_POR_OPERADOR = 500
+
+
+def verificar_deltas(simetrica, con_candidatos):
+    matriz = generar_matriz(NUM_NODOS, 1 if simetrica else 2, simetrica)
+    random.seed(3)
+    centro = 0
+    tiendas = list(range(1, NUM_NODOS))
+    candidatos = calcular_vecinos_candidatos(matriz, [centro] + tiendas, 5)
+
+    for operador in obtener_operadores(list(OPERADORES_MOVIMIENTO), simetrica=simetrica):
+        ruta = [centro] + random.sample(tiendas, len(tiendas)) + [centro]
+        costo = SimulatedAnnealing.calcular_costo_ruta(ruta, matriz)
+        probados = 0
+        for _ in range(MOVIMIENTOS_POR_OPERADOR):
+            if con_candidatos:
+                posicion = {nodo: indice for indice, nodo in enumerate(ruta[1:-1], start=1)}
+                movimiento = operador.proponer_con_candidatos(ruta, posicion, candidatos)
+            else:
+                movimiento = operador.proponer(ruta)
+            if movimiento is None:
+                continue
+            delta = operador.calcular_delta(ruta, matriz, movimiento)
+            anterior = ruta[:]
+            operador.aplicar(ruta, movimiento)
+            costo_nuevo = SimulatedAnnealing.calcular_costo_ruta(ruta, matriz)
+
+            assert abs(costo + delta - costo_nuevo) < 1e-9, \
+                f"{operador.__name__} {movimiento}: delta {delta}, real {costo_nuevo - costo}"
+            assert ruta[0] == centro and ruta[-1] == centro, \
+                f"{operador.__name__} {movimiento} movio el centro"
+            assert sorted(ruta[1:-1]) == tiendas, \
+                f"{operador.__name__} {movimiento} perdio o duplico tiendas"
+            cambiadas = {p for p in range(len(ruta)) if ruta[p] != anterior[p]}
+            assert cambiadas <= set(operador.posiciones_afectadas(movimiento)), \
+                f"{operador.__name__} {movimiento}: posiciones afectadas incompletas"
+            costo = costo_nuevo
+            probados += 1
+        assert probados > 0, f"{operador.__name__} no propuso ningun movimiento"
+
+
+def test_deltas_simetricos():
+    """El delta de cada operador coincide con recalcular la ruta completa"""
+    verificar_deltas(simetrica=True, con_candidatos=False)
+
+
+def test_deltas_asimetricos():
+    """Con costos asimetricos '2opt' usa el delta que recorre el tramo invertido"""
+    verificar_deltas(simetrica=False, con_candidatos=False)
+
+
+def test_deltas_con_candidatos_simetricos():
+    verificar_deltas(simetrica=True, con_candidatos=True)
+
+
+def test_deltas_con_candidatos_asimetricos():
+    verificar_deltas(simetrica=False, con_candidatos=True)
+
+
+def test_2opt_asimetrico_vectorizado():
+    """Tramos largos usan la suma vectorizada; debe coincidir con el bucle"""
+    matriz = generar_matriz(NUM_NODOS, semilla=4)
+    operador = obtener_operadores(['2opt'], simetrica=False)[0]
+    ruta = [0] + list(range(1, NUM_NODOS)) + [0]
+    for i, j in [(1, NUM_NODOS - 1), (2, 25), (5, 5 + operador.TRAMO_VECTORIZADO + 1)]:
+        delta = operador.calcular_delta(ruta, matriz, (i, j))
+        invertida = ruta[:]
+        operador.aplicar(invertida, (i, j))
+        real = (SimulatedAnnealing.calcular_costo_ruta(invertida, matriz) -
+                SimulatedAnnealing.calcular_costo_ruta(ruta, matriz))
+        assert abs(delta - real) < 1e-9, f"2opt asimetrico ({i}, {j}): delta {delta}, real {real}"
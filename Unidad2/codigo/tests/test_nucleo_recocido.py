@@ -0,0 +1,73 @@
+import sys
+import os
+import json
+import random
+import subprocess
+import numpy as np
+import pytest
+
+# Agregar el directorio del codigo al path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from nucleo_recocido import CadenaRecocidoCompilada, costo_ruta
+from vecinos_candidatos import calcular_vecinos_candidatos
+from datos_prueba import generar_matriz
+
+NUM_NODOS = 40
+NIVELES = 60
+L = 100
+
+
+def ejecutar_cadena(simetrica, con_candidatos, semilla):
+    # Recocido completo con la cadena compilada; devuelve (ruta mejor, costo mejor, costo actual)
+    matriz = generar_matriz(NUM_NODOS, semilla, simetrica)
+    random.seed(semilla)
+    tiendas = list(range(1, NUM_NODOS))
+    ruta = [0] + random.sample(tiendas, len(tiendas)) + [0]
+    candidatos = calcular_vecinos_candidatos(matriz, ruta[:-1], 5) if con_candidatos else None
+    cadena = CadenaRecocidoCompilada(ruta, matriz, candidatos=candidatos)
+    t = 50.0
+    for _ in range(NIVELES):
+        cadena.ejecutar_nivel(matriz, t, L)
+        t *= 0.9
+    return cadena.ruta_mejor, cadena.costo_mejor, cadena.costo
+
+
+CASOS = [(True, False), (True, True), (False, False), (False, True)]
+
+
+def test_costo_coincide_con_la_ruta():
+    """El costo mejor acumulado por deltas es el costo de la ruta mejor devuelta"""
+    print("Probando CadenaRecocidoCompilada...")
+    for semilla, (simetrica, con_candidatos) in enumerate(CASOS):
+        matriz = generar_matriz(NUM_NODOS, semilla, simetrica)
+        ruta, costo_mejor, _ = ejecutar_cadena(simetrica, con_candidatos, semilla)
+
+        assert ruta[0] == 0 and ruta[-1] == 0 and sorted(ruta[1:-1]) == list(range(1, NUM_NODOS)), \
+            f"Ruta invalida: {ruta}"
+        costo_real = costo_ruta(np.asarray(ruta, dtype=np.int32), matriz)
+        assert abs(costo_real - costo_mejor) < 1e-6, \
+            f"simetrica={simetrica}, candidatos={con_candidatos}: costo {costo_mejor}, real {costo_real}"
+    print("Test costo compilado: PASO")
+
+
+def test_numba_y_python_puro_dan_la_misma_ruta():
+    """Con la misma semilla el nucleo compilado y el de Python puro recorren la misma cadena"""
+    pytest.importorskip('numba')
+    directorio_tests = os.path.dirname(os.path.abspath(__file__))
+    codigo = (
+        "import json, sys; sys.path.insert(0, sys.argv[1]); "
+        "from test_nucleo_recocido import CASOS, ejecutar_cadena; "
+        "print(json.dumps([ejecutar_cadena(s, c, i) for i, (s, c) in enumerate(CASOS)]))"
+    )
+    # NUMBA_DISABLE_JIT deja las funciones sin compilar, igual que sin Numba instalado
+    entorno = dict(os.environ, NUMBA_DISABLE_JIT='1')
+    salida = subprocess.run([sys.executable, '-c', codigo, directorio_tests], env=entorno,
+                            capture_output=True, text=True, check=True).stdout
+    python_puro = json.loads(salida.strip().splitlines()[-1])
+
+    for semilla, (simetrica, con_candidatos) in enumerate(CASOS):
+        ruta, costo_mejor, costo = ejecutar_cadena(simetrica, con_candidatos, semilla)
+        ruta_puro, costo_mejor_puro, costo_puro = python_puro[semilla]
+        assert ruta == ruta_puro, f"simetrica={simetrica}, candidatos={con_candidatos}: rutas distintas"
+        assert abs(costo_mejor - costo_mejor_puro) < 1e-9 and abs(costo - costo_puro) < 1e-9
@@ -0,0 +1,90 @@
+import sys
+import os
+import numpy as np
+
+# Agregar el directorio del codigo al path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from red_vial import RedVial
+from generar_matriz_distancias import calcular_matriz_haversine
+
+# Tres esquinas A (id 10), B (20) y C (30); el nodo 50 no esta en ninguna via
+NODOS = {30: (24.81, -107.39), 10: (24.80, -107.40), 20: (24.80, -107.39), 50: (24.90, -107.30)}
+# (origen, destino, sentido): A-B doble sentido repetido tres veces (una al
+# reves), B -> C de un solo sentido, A-C con sentido -1 (solo C -> A) y un
+# tramo de C al nodo 99, que no viene en el extracto
+TRAMOS = [(10, 20, 0), (20, 10, 0), (10, 20, 0), (20, 30, 1), (10, 30, -1), (30, 99, 0)]
+
+OSM = """<?xml version="1.0" encoding="UTF-8"?>
+<osm version="0.6">
+ <node id="30" lat="24.81" lon="-107.39"/>
+ <node id="10" lat="24.80" lon="-107.40"/>
+ <node id="20" lat="24.80" lon="-107.39"/>
+ <node id="50" lat="24.90" lon="-107.30"/>
+ <way id="1"><nd ref="10"/><nd ref="20"/><tag k="highway" v="residential"/></way>
+ <way id="2"><nd ref="20"/><nd ref="10"/><tag k="highway" v="residential"/></way>
+ <way id="3"><nd ref="10"/><nd ref="20"/><tag k="highway" v="service"/></way>
+ <way id="4"><nd ref="20"/><nd ref="30"/><tag k="highway" v="primary"/><tag k="oneway" v="yes"/></way>
+ <way id="5"><nd ref="10"/><nd ref="30"/><tag k="highway" v="tertiary"/><tag k="oneway" v="-1"/></way>
+ <way id="6"><nd ref="30"/><nd ref="99"/><tag k="highway" v="residential"/></way>
+ <way id="7"><nd ref="30"/><nd ref="20"/><tag k="highway" v="footway"/></way>
+</osm>
+"""
+
+
+def construir_red():
+    ids = np.array(list(NODOS), dtype=np.int64)
+    latitudes = np.array([NODOS[i][0] for i in ids])
+    longitudes = np.array([NODOS[i][1] for i in ids])
+    origenes, destinos, sentido = (np.array(columna) for columna in zip(*TRAMOS))
+    return RedVial._construir(ids, latitudes, longitudes, origenes.astype(np.int64),
+                              destinos.astype(np.int64), sentido.astype(np.int8))
+
+
+def distancias_esquinas():
+    # Haversine entre A, B y C (nodos 0, 1 y 2 del grafo, en orden de id)
+    latitudes = [NODOS[i][0] for i in (10, 20, 30)]
+    longitudes = [NODOS[i][1] for i in (10, 20, 30)]
+    return latitudes, longitudes, calcular_matriz_haversine(latitudes, longitudes)
+
+
+def test_construir_sentidos_duplicados_y_nodos_faltantes():
+    """Aristas en el sentido de cada via, sin sumar repetidas y sin nodos fuera del extracto"""
+    print("Probando RedVial._construir...")
+    red = construir_red()
+    _, _, d = distancias_esquinas()
+    grafo = red.grafo.toarray()
+
+    assert red.num_nodos == 3, f"Nodos del grafo: {red.num_nodos}"
+    assert red.grafo.nnz == 4, f"Aristas: {red.grafo.nnz}"
+    assert np.isclose(grafo[0, 1], d[0, 1]) and np.isclose(grafo[1, 0], d[0, 1]), \
+        "El tramo A-B repetido no tiene su longitud"
+    assert np.isclose(grafo[1, 2], d[1, 2]) and grafo[2, 1] == 0, "B -> C debe ser de un solo sentido"
+    assert np.isclose(grafo[2, 0], d[0, 2]) and grafo[0, 2] == 0, "A-C con sentido -1 debe ir de C a A"
+    print("Test construir: PASO")
+
+
+def test_matriz_distancias_asimetrica():
+    """Los caminos mas cortos siguen los sentidos de las vias"""
+    red = construir_red()
+    latitudes, longitudes, d = distancias_esquinas()
+    matriz = red.matriz_distancias(latitudes, longitudes, num_procesos=1)
+
+    esperada = np.array([
+        [0.0, d[0, 1], d[0, 1] + d[1, 2]],
+        [d[0, 1], 0.0, d[1, 2]],
+        [d[0, 2], d[0, 2] + d[0, 1], 0.0]
+    ])
+    assert np.allclose(matriz, esperada), f"Matriz:\n{matriz}\nesperada:\n{esperada}"
+
+
+def test_desde_osm_igual_que_construir(tmp_path):
+    """La lectura del XML filtra las vias por tipo y lee los sentidos igual que los tramos a mano"""
+    archivo = tmp_path / 'red.osm'
+    archivo.write_text(OSM, encoding='utf-8')
+    red = RedVial.desde_osm(str(archivo))
+    esperada = construir_red()
+
+    assert red.num_nodos == esperada.num_nodos
+    assert (red.grafo != esperada.grafo).nnz == 0
+    assert np.allclose(red.latitudes, esperada.latitudes) and np.allclose(red.longitudes, esperada.longitudes)
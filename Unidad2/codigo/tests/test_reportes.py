@@ -0,0 +1,197 @@
+import sys
+import os
+import re
+import json
+import pytest
+import pandas as pd
+
+# Agregar el directorio del codigo al path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import ARCHIVO_RESULTADOS
+from utils import ResultadosManager
+from arranque_caliente import ArranqueCaliente
+
+
+def generar_resultados():
+    # Dos centros (filas 0 y 1) y cinco tiendas. La primera zona lleva todas
+    # las lineas opcionales del reporte y la segunda ninguna
+    datos_df = pd.DataFrame({
+        'Tipo': ['Centro de Distribución'] * 2 + ['Tienda'] * 5,
+        'Nombre': ['Centro de Distribución 1', 'Centro de Distribución 2'] +
+                  [f'Tienda {i}' for i in range(1, 6)],
+        'Capacidad_Venta': [0, 0, 12000, 8000, 15000, 9000, 11000]
+    })
+    resultados_zonas = {
+        0: {
+            'centro': 'Centro de Distribución 1',
+            'ruta': [0, 4, 2, 3, 0],
+            'costo': 41.5,
+            'costo_inicial': 55.25,
+            'tiendas_count': 3,
+            'capacidad_total': 35000,
+            'cota_inferior': 40.0
+        },
+        1: {
+            'centro': 'Centro de Distribución 2',
+            'ruta': [1, 6, 5, 1],
+            'costo': 18.75,
+            'costo_inicial': None,
+            'tiendas_count': 2,
+            'capacidad_total': 20000,
+            'cota_inferior': None
+        }
+    }
+    return datos_df, resultados_zonas
+
+
+def guardar_reporte(directorio):
+    datos_df, resultados_zonas = generar_resultados()
+    archivo = str(directorio / ARCHIVO_RESULTADOS)
+    ResultadosManager.guardar_resultados_archivo(
+        resultados_zonas, 60.25, datos_df, archivo=archivo,
+        archivo_json=str(directorio / 'resultados.json')
+    )
+    return archivo, datos_df, resultados_zonas
+
+
+def test_arranque_caliente_lee_el_reporte_de_texto(tmp_path):
+    """Las rutas del reporte de texto se recuperan completas y en orden"""
+    archivo, datos_df, resultados_zonas = guardar_reporte(tmp_path)
+    rutas = ArranqueCaliente.leer_rutas_archivo(archivo)
+
+    nombres = datos_df['Nombre'].to_numpy()
+    esperadas = {resultado['centro']: nombres[resultado['ruta']].tolist()
+                 for resultado in resultados_zonas.values()}
+    assert rutas == esperadas, f"Rutas leidas: {rutas}"
+
+
+def test_mapa_lee_el_reporte_de_texto(tmp_path, monkeypatch):
+    """El mapa sin JSON de resultados reconstruye cada zona desde el reporte"""
+    pytest.importorskip('folium')
+    from generar_mapa_rutas_optimizadas import GeneradorMapaRutasOptimizadas
+
+    _, datos_df, resultados_zonas = guardar_reporte(tmp_path)
+    monkeypatch.chdir(tmp_path)
+    generador = GeneradorMapaRutasOptimizadas()
+    generador.datos_df = datos_df
+    generador.centros_distribucion = datos_df.iloc[:2]
+    assert generador.parsear_resultados_texto()
+
+    assert generador.costo_total == 60.25
+    assert sorted(generador.rutas_optimizadas) == sorted(resultados_zonas)
+    for zona_id, resultado in resultados_zonas.items():
+        ruta = generador.rutas_optimizadas[zona_id]
+        assert ruta['centro'] == resultado['centro']
+        assert ruta['num_tiendas'] == resultado['tiendas_count']
+        assert ruta['costo'] == resultado['costo']
+        assert ruta['capacidad'] == resultado['capacidad_total']
+        assert ruta['nodos'] == resultado['ruta'][1:-1]
+
+
+def crear_generador(datos_df, directorio, monkeypatch):
+    pytest.importorskip('folium')
+    import config
+    from generar_mapa_rutas_optimizadas import GeneradorMapaRutasOptimizadas
+
+    monkeypatch.chdir(directorio)
+    monkeypatch.setattr(config, 'ARCHIVO_RESULTADOS_JSON', str(directorio / 'resultados.json'))
+    generador = GeneradorMapaRutasOptimizadas()
+    generador.datos_df = datos_df
+    generador.centros_distribucion = datos_df[datos_df['Tipo'] == 'Centro de Distribución'].reset_index(drop=True)
+    return generador
+
+
+def test_mapa_dibuja_un_recorrido_por_vehiculo(tmp_path, monkeypatch):
+    """Una zona CVRP se dibuja como un recorrido cerrado por cada vehiculo"""
+    datos_df, resultados_zonas = generar_resultados()
+    resultados_zonas[0]['ruta'] = [0, 4, 2, 0, 3, 0]
+    resultados_zonas[0]['rutas_vehiculos'] = [[0, 4, 2, 0], [0, 3, 0]]
+    ResultadosManager.guardar_resultados_json(
+        resultados_zonas, 60.25, datos_df, archivo=str(tmp_path / 'resultados.json')
+    )
+    generador = crear_generador(datos_df, tmp_path, monkeypatch)
+    assert generador.cargar_resultados_json()
+
+    assert generador.rutas_optimizadas[0]['recorridos'] == [[4, 2], [3]]
+    assert generador.rutas_optimizadas[0]['nodos'] == [4, 2, 3]
+    assert generador.rutas_optimizadas[1]['recorridos'] == [[6, 5]]
+
+    # El reporte de texto lleva la misma ruta unida y se separa en el centro
+    ResultadosManager.guardar_resultados_archivo(
+        resultados_zonas, 60.25, datos_df, archivo=str(tmp_path / ARCHIVO_RESULTADOS),
+        archivo_json=str(tmp_path / 'resultados.json')
+    )
+    generador.rutas_optimizadas = {}
+    assert generador.parsear_resultados_texto()
+    assert generador.rutas_optimizadas[0]['recorridos'] == [[4, 2], [3]]
+
+    # En modo escalable cada vehiculo tiene su linea por rango de zoom
+    datos_df['Latitud_WGS84'] = [-33.40, -33.50, -33.41, -33.42, -33.39, -33.51, -33.52]
+    datos_df['Longitud_WGS84'] = [-70.60, -70.70, -70.61, -70.59, -70.62, -70.71, -70.69]
+    datos_df['Nivel_Tienda'] = ['Centro'] * 2 + ['A'] * 5
+    generador.centros_distribucion = datos_df.iloc[:2]
+    generador.modo_mapa = 'escalable'
+    generador.crear_mapa_base()
+    generador.agregar_tiendas_y_rutas()
+    lineas = [len(capa.data['features']) for grupo in generador.mapa._children.values()
+              for capa in grupo._children.values() if type(capa).__name__ == 'GeoJson']
+    assert lineas == [2 * len(generador.rangos_zoom()), len(generador.rangos_zoom())]
+
+
+def test_mapa_resuelve_el_json_por_nombre_si_cambian_los_datos(tmp_path, monkeypatch):
+    """Si las filas de los datos cambiaron, las rutas del JSON se ubican por nombre"""
+    datos_df, resultados_zonas = guardar_reporte(tmp_path)[1:]
+    # Se agrega una tienda al inicio: todas las filas se corren en uno
+    nueva = pd.DataFrame({'Tipo': ['Tienda'], 'Nombre': ['Tienda nueva'], 'Capacidad_Venta': [5000]})
+    datos_nuevos = pd.concat([nueva, datos_df], ignore_index=True)
+    generador = crear_generador(datos_nuevos, tmp_path, monkeypatch)
+    assert generador.cargar_resultados_json()
+
+    for zona_id, resultado in resultados_zonas.items():
+        assert generador.rutas_optimizadas[zona_id]['nodos'] == [nodo + 1 for nodo in resultado['ruta'][1:-1]]
+
+
+def test_mapa_usa_el_reporte_de_texto_si_falta_una_tienda_del_json(tmp_path, monkeypatch):
+    """Con una tienda del JSON ausente en los datos no se usan sus indices"""
+    _, datos_df, _ = guardar_reporte(tmp_path)
+    datos_df.loc[3, 'Nombre'] = 'Tienda renombrada'
+    generador = crear_generador(datos_df, tmp_path, monkeypatch)
+    assert not generador.cargar_resultados_json()
+    assert generador.rutas_optimizadas == {}
+
+    assert generador.parsear_resultados_optimizacion()
+    assert 3 not in generador.rutas_optimizadas[0]['nodos']
+
+
+def test_mapa_escalable_tiene_una_capa_por_zona(tmp_path):
+    """El HTML escalable lleva un grupo por zona en el control de capas, con su ruta y sus tiendas"""
+    pytest.importorskip('folium')
+    from generar_mapa_rutas_optimizadas import GeneradorMapaRutasOptimizadas
+    from benchmark_mapa import generar_rutas
+    from benchmark_optimizacion import generar_red
+
+    num_centros = 4
+    datos_df = generar_red(300, num_centros)
+    generador = GeneradorMapaRutasOptimizadas('escalable')
+    generador.datos_df = datos_df
+    generador.centros_distribucion = datos_df.iloc[:num_centros]
+    generador.tiendas = datos_df.iloc[num_centros:]
+    generador.rutas_optimizadas = generar_rutas(datos_df, num_centros)
+    generador.construir_mapa()
+    archivo = tmp_path / 'mapa.html'
+    generador.mapa.save(str(archivo))
+    html = archivo.read_text(encoding='utf-8')
+
+    nombres = [f"Zona {zona + 1}: {datos_df['Nombre'].iloc[zona]}" for zona in range(num_centros)]
+    # Nombres de las capas del control (el HTML los escribe como cadenas JSON)
+    capas = [json.loads(nombre) for nombre in re.findall(r'("[^"]*") : feature_group_', html)]
+    assert capas == nombres
+    assert len(re.findall(r'L\.featureGroup\(', html)) == num_centros
+
+    grupos = [hijo for hijo in generador.mapa._children.values() if type(hijo).__name__ == 'FeatureGroup']
+    assert [grupo.layer_name for grupo in grupos] == nombres
+    for zona, grupo in enumerate(grupos):
+        capas_grupo = {type(capa).__name__: capa for capa in grupo._children.values()}
+        assert {'GeoJson', 'FastMarkerCluster'} <= set(capas_grupo)
+        assert len(capas_grupo['FastMarkerCluster'].data) == generador.rutas_optimizadas[zona]['num_tiendas']
@@ -0,0 +1,90 @@
+import sys
+import os
+import time
+import pandas as pd
+import pytest
+
+# Agregar el directorio del codigo al path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ejecucion_paralela import repartir_tiempo, NotificadorProgreso
+from datos_prueba import crear_optimizador, verificar_rutas
+
+NUM_TIENDAS = 150
+NUM_CENTROS = 3
+
+
+def tareas_de_tamanos(tamanos):
+    return [(zona_id, pd.DataFrame(index=range(tamano))) for zona_id, tamano in enumerate(tamanos)]
+
+
+def test_repartir_tiempo_proporcional_a_las_tiendas():
+    """El tiempo total se reparte en proporcion a las tiendas, sin pasar del tope por zona"""
+    tareas = tareas_de_tamanos([10, 20, 30])
+    assert repartir_tiempo(tareas, 1, tiempo_limite=60) == pytest.approx({0: 10, 1: 20, 2: 30})
+    # Con dos procesos hay el doble de computo, pero ninguna zona pasa del tiempo total
+    assert repartir_tiempo(tareas, 1, tiempo_limite=60, procesos=2) == pytest.approx({0: 20, 1: 40, 2: 60})
+    # Cada cadena de multiarranque recibe su parte
+    assert repartir_tiempo(tareas, 2, tiempo_limite=60) == pytest.approx({0: 5, 1: 10, 2: 15})
+    assert repartir_tiempo(tareas, 1, tiempo_limite=60, tiempo_limite_zona=15) == \
+        pytest.approx({0: 10, 1: 15, 2: 15})
+    assert repartir_tiempo(tareas, 1, tiempo_limite_zona=15) == {0: 15, 1: 15, 2: 15}
+    assert repartir_tiempo(tareas, 1) == {}
+
+
+def test_notificador_solo_envia_mejoras():
+    """NotificadorProgreso reenvia solo las mejoras, y no mas seguido que su intervalo"""
+    eventos = []
+    notificador = NotificadorProgreso(eventos.append, zona_id=2, cadena=1, intervalo=0)
+    for costo in [50, 50, 40, 45, 30, 30]:
+        notificador(costo, temperatura=1.0)
+    assert [evento['costo_mejor'] for evento in eventos] == [50, 40, 30]
+    assert all(evento['zona'] == 2 and evento['cadena'] == 1 and not evento['terminada'] for evento in eventos)
+
+    eventos.clear()
+    notificador = NotificadorProgreso(eventos.append, zona_id=0, intervalo=3600)
+    for costo in [50, 40, 30]:
+        notificador(costo, temperatura=1.0)
+    assert [evento['costo_mejor'] for evento in eventos] == [50]
+
+
+@pytest.mark.parametrize('tiempo_limite', [0, 0.05])
+def test_tiempo_limite_minimo_devuelve_rutas_validas(tiempo_limite):
+    """Con el plazo vencido cada zona devuelve su mejor ruta, completa y cerrada"""
+    optimizador = crear_optimizador(NUM_TIENDAS, NUM_CENTROS)
+    inicio = time.monotonic()
+    resultados, costo_total = optimizador.optimizar_rutas_por_zonas(tiempo_limite=tiempo_limite, semilla=1)
+    segundos = time.monotonic() - inicio
+
+    assert sorted(resultados) == list(range(NUM_CENTROS))
+    verificar_rutas(optimizador)
+    assert abs(costo_total - sum(resultado['costo'] for resultado in resultados.values())) < 1e-6
+    # Sin plazo el recocido de estas zonas toma unos 3 s
+    assert segundos < 1.0, f"El plazo de {tiempo_limite} s no detuvo el recocido ({segundos:.2f} s)"
+
+
+@pytest.mark.parametrize('modo_ejecucion', ['secuencial', 'procesos'])
+def test_callback_progreso(modo_ejecucion):
+    """El callback recibe mejoras con costo decreciente por cadena y un evento final por zona"""
+    optimizador = crear_optimizador(NUM_TIENDAS, NUM_CENTROS)
+    eventos = []
+    resultados, _ = optimizador.optimizar_rutas_por_zonas(
+        modo_ejecucion=modo_ejecucion, num_procesos=2, tiempo_limite=1.5,
+        callback_progreso=eventos.append, semilla=1
+    )
+
+    assert all('segundos' in evento and evento['segundos'] >= 0 for evento in eventos)
+    finales = {evento['zona']: evento for evento in eventos if evento['terminada']}
+    assert sorted(finales) == sorted(resultados)
+    for zona_id, resultado in resultados.items():
+        mejoras = [evento['costo_mejor'] for evento in eventos
+                   if evento['zona'] == zona_id and not evento['terminada']]
+        assert mejoras, f"Zona {zona_id}: sin eventos de progreso"
+        assert all(b < a for a, b in zip(mejoras, mejoras[1:])), f"Zona {zona_id}: costos {mejoras}"
+        assert finales[zona_id]['costo_mejor'] == pytest.approx(resultado['costo'])
+        assert mejoras[-1] >= resultado['costo'] - 1e-6
+        # El evento final llega despues de las mejoras de su zona
+        assert eventos.index(finales[zona_id]) > max(
+            indice for indice, evento in enumerate(eventos)
+            if evento['zona'] == zona_id and not evento['terminada']
+        )
@@ -0,0 +1,122 @@
+import sys
+import os
+import random
+import pandas as pd
+import pytest
+
+# Agregar el directorio del codigo al path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simulated_annealing import SimulatedAnnealing, ProgramaEnfriamiento
+from estadisticas_recocido import EstadisticasRecocido
+from datos_prueba import generar_matriz_puntos
+
+NUM_TIENDAS = 40
+# Enfriamiento muy lento: sin detector de estancamiento recorre miles de niveles
+PARAMETROS_LENTOS = {
+    'temp_inicial': 100.0,
+    'tasa_enfriamiento': 0.995,
+    'temp_final': 1e-6,
+    'L': 40,
+    'heuristica_inicial': 'aleatoria',
+    'brecha_parada': None,
+    'mostrar_progreso': False
+}
+
+
+def optimizar(semilla=0, muestreo=0, **parametros):
+    matriz = generar_matriz_puntos(NUM_TIENDAS + 1, semilla)
+    tiendas_zona = pd.DataFrame(index=range(1, NUM_TIENDAS + 1))
+    estadisticas = EstadisticasRecocido(muestreo)
+    random.seed(semilla)
+    ruta, costo = SimulatedAnnealing.optimizar_zona(
+        matriz, 0, tiendas_zona, estadisticas=estadisticas, **{**PARAMETROS_LENTOS, **parametros}
+    )
+    return ruta, costo, estadisticas
+
+
+def test_estancamiento_termina_antes():
+    """Con el detector la zona termina tras N niveles frios sin mejora, mucho antes de temp_final"""
+    print("Probando ProgramaEnfriamiento (estancamiento)...")
+    _, costo_completo, completo = optimizar(pasos_sin_mejora_max=0)
+    _, costo_estancado, estancado = optimizar(pasos_sin_mejora_max=50)
+
+    assert completo.razon == "temperatura minima alcanzada"
+    assert estancado.razon == "estancamiento tras 50 niveles sin mejora"
+    assert estancado.niveles < completo.niveles / 2, f"{estancado.niveles} de {completo.niveles} niveles"
+    # Lo que se corta es la cola fria, donde ya no habia mejoras
+    assert costo_estancado <= costo_completo * 1.05
+    print("Test estancamiento: PASO")
+
+
+def test_estancamiento_solo_cuenta_niveles_frios():
+    programa = ProgramaEnfriamiento(10.0, 0.9, 1e-9, adaptativo=False, pasos_sin_mejora_max=3,
+                                    aceptacion_baja=0.02)
+    # En caliente la cadena se aleja de la mejor solucion a proposito
+    for _ in range(10):
+        programa.enfriar(tasa_aceptacion=0.5, hubo_mejora=False)
+    assert programa.niveles_sin_mejora == 0 and programa.continuar()
+
+    programa.enfriar(tasa_aceptacion=0.01, hubo_mejora=False)
+    programa.enfriar(tasa_aceptacion=0.01, hubo_mejora=False)
+    programa.enfriar(tasa_aceptacion=0.01, hubo_mejora=True)
+    assert programa.niveles_sin_mejora == 0 and programa.continuar()
+    for _ in range(3):
+        programa.enfriar(tasa_aceptacion=0.01, hubo_mejora=False)
+    assert programa.estancado and not programa.continuar()
+
+
+@pytest.mark.parametrize('aceptacion, exponente', [(0.9, 4), (0.3, 0.5), (0.01, 1)])
+def test_enfriamiento_adaptativo(aceptacion, exponente):
+    """Rapido en caminata aleatoria, lento en la zona productiva y normal si esta congelada"""
+    programa = ProgramaEnfriamiento(10.0, 0.9, adaptativo=True, aceptacion_alta=0.8, aceptacion_baja=0.02,
+                                    factor_rapido=4, factor_lento=0.5)
+    programa.enfriar(aceptacion, hubo_mejora=True)
+    assert programa.t == pytest.approx(10.0 * 0.9 ** exponente)
+
+    fijo = ProgramaEnfriamiento(10.0, 0.9, adaptativo=False)
+    fijo.enfriar(aceptacion, hubo_mejora=True)
+    assert fijo.t == pytest.approx(9.0)
+
+
+def test_calibracion_sigue_la_aceptacion_objetivo():
+    """Un objetivo de aceptacion mayor da una temperatura inicial mayor y acepta mas movimientos que empeoran"""
+    resultados = []
+    for objetivo in (0.2, 0.8):
+        _, _, estadisticas = optimizar(calibrar_temperatura=True, aceptacion_inicial=objetivo,
+                                       pasos_sin_mejora_max=50, muestreo=1)
+        trayectoria = estadisticas.trayectoria
+        aceptacion = trayectoria['peores_aceptados'][0] / trayectoria['peores_propuestos'][0]
+        resultados.append((estadisticas.temperatura_inicial, aceptacion))
+
+    (t_baja, aceptacion_baja), (t_alta, aceptacion_alta) = resultados
+    assert PARAMETROS_LENTOS['temp_inicial'] not in (t_baja, t_alta)
+    assert t_baja < t_alta
+    assert aceptacion_baja < aceptacion_alta
+
+
+@pytest.mark.parametrize('backend', ['python', 'compilado'])
+def test_mejor_ruta_sobrevive_a_movimientos_que_empeoran(backend):
+    """La mejor ruta (copiada solo al empeorar) es siempre la de menor costo por la que paso la cadena"""
+    matriz = generar_matriz_puntos(NUM_TIENDAS + 1, semilla=3)
+    random.seed(3)
+    ruta_inicial = [0] + random.sample(range(1, NUM_TIENDAS + 1), NUM_TIENDAS) + [0]
+    cadena = SimulatedAnnealing.crear_cadena(backend, list(ruta_inicial), matriz)
+    mejor_costo, mejor_ruta = cadena.costo, ruta_inicial
+    empeoro_tras_mejora = False
+
+    # Un movimiento por nivel, alternando tramos frios (mejoras) y calientes (empeora)
+    for nivel in range(600):
+        cadena.ejecutar_nivel(matriz, 0.5 if (nivel // 50) % 2 == 0 else 50.0, 1)
+        actual = list(cadena.ruta)
+        if cadena.costo < mejor_costo:
+            mejor_costo, mejor_ruta = cadena.costo, actual
+        elif cadena.costo > mejor_costo and mejor_ruta is not ruta_inicial:
+            empeoro_tras_mejora = True
+        assert cadena.costo_mejor == mejor_costo, f"Nivel {nivel}"
+        if nivel % 97 == 0:
+            assert cadena.ruta_mejor == mejor_ruta, f"Nivel {nivel}"
+
+    assert empeoro_tras_mejora and cadena.costo > cadena.costo_mejor
+    assert cadena.ruta_mejor == mejor_ruta
+    assert SimulatedAnnealing.calcular_costo_ruta(cadena.ruta_mejor, matriz) == pytest.approx(cadena.costo_mejor)
@@ -0,0 +1,70 @@
+import sys
+import os
+import itertools
+import numpy as np
+
+# Agregar el directorio del codigo al path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from solucion_exacta import SolucionExacta
+from cota_inferior import CotaInferior
+from datos_prueba import generar_matriz
+
+MAX_TIENDAS = 8
+MATRICES_POR_TAMANO = 3
+
+
+def costo_orden(matriz, orden):
+    ruta = list(orden) + [orden[0]]
+    return float(matriz[ruta[:-1], ruta[1:]].sum())
+
+
+def fuerza_bruta(matriz):
+    # Menor costo entre todos los ordenes de visita que salen del centro (0)
+    tiendas = range(1, len(matriz))
+    return min(costo_orden(matriz, (0,) + orden) for orden in itertools.permutations(tiendas))
+
+
+def test_held_karp_contra_fuerza_bruta():
+    """Held-Karp devuelve el costo optimo y una ruta que lo alcanza"""
+    print("Probando held_karp...")
+    for num_tiendas in range(1, MAX_TIENDAS + 1):
+        for semilla in range(MATRICES_POR_TAMANO):
+            matriz = generar_matriz(num_tiendas + 1, semilla)
+            costo, orden = SolucionExacta.held_karp(matriz)
+            optimo = fuerza_bruta(matriz)
+
+            assert abs(costo - optimo) < 1e-9, \
+                f"{num_tiendas} tiendas, semilla {semilla}: held_karp {costo}, optimo {optimo}"
+            assert orden[0] == 0 and sorted(orden) == list(range(num_tiendas + 1)), \
+                f"{num_tiendas} tiendas: orden invalido {orden}"
+            assert abs(costo_orden(matriz, orden) - costo) < 1e-9, \
+                f"{num_tiendas} tiendas: el orden no tiene el costo reportado"
+    print("Test held_karp: PASO")
+
+
+def test_resolver_con_indices_de_la_red():
+    """resolver traduce el orden local a los nodos de la matriz completa"""
+    matriz = generar_matriz(12, semilla=5)
+    centro, tiendas = 4, [9, 1, 7, 2, 11]
+    ruta, costo = SolucionExacta.resolver(matriz, centro, tiendas)
+
+    assert ruta[0] == centro and ruta[-1] == centro, f"La ruta no empieza y termina en el centro: {ruta}"
+    assert sorted(ruta[1:-1]) == sorted(tiendas), f"La ruta no visita las tiendas: {ruta}"
+    assert abs(float(matriz[ruta[:-1], ruta[1:]].sum()) - costo) < 1e-9
+    assert abs(costo - fuerza_bruta(matriz[np.ix_([centro] + tiendas, [centro] + tiendas)])) < 1e-9
+
+
+def test_cota_inferior_no_supera_el_optimo():
+    """La cota inferior (tsp y cvrp) nunca pasa del costo optimo de la zona"""
+    print("Probando CotaInferior.calcular...")
+    for num_tiendas in range(1, MAX_TIENDAS + 1):
+        for semilla in range(MATRICES_POR_TAMANO):
+            matriz = generar_matriz(num_tiendas + 1, 100 + semilla)
+            optimo = fuerza_bruta(matriz)
+            tiendas = list(range(1, num_tiendas + 1))
+            for modo_ruteo in ('tsp', 'cvrp'):
+                cota = CotaInferior.calcular(matriz, 0, tiendas, modo_ruteo)
+                assert cota <= optimo + 1e-9, \
+                    f"{modo_ruteo}, {num_tiendas} tiendas, semilla {semilla}: cota {cota} > optimo {optimo}"
+    print("Test cota inferior: PASO")
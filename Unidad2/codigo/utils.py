@@ -1,5 +1,7 @@
 import os
-from config import ARCHIVO_RESULTADOS, ENCODING_ARCHIVO
+import json
+from cota_inferior import CotaInferior
+from config import ARCHIVO_RESULTADOS, ARCHIVO_RESULTADOS_JSON, ENCODING_ARCHIVO
 
 class ResultadosManager:
     
@@ -9,23 +11,32 @@ class ResultadosManager:
         print("RESULTADOS FINALES DE OPTIMIZACIÓN")
         print("="*70)
         
+        nombres = datos_df['Nombre'].to_numpy()
         for zona_id, resultado in resultados_zonas.items():
             print(f"\n{resultado['centro']}")
             print(f"   Tiendas: {resultado['tiendas_count']}")
+            if resultado.get('costo_inicial') is not None:
+                print(f"   Costo inicial: {ResultadosManager.formatear_costo_inicial(resultado)}")
             print(f"   Costo optimizado: {resultado['costo']:.2f}")
+            if resultado.get('cota_inferior') is not None:
+                print(f"   Cota inferior: {ResultadosManager.formatear_cota(resultado)}")
             print(f"   Capacidad total de zona: {resultado['capacidad_total']:,}")
+            if 'rutas_vehiculos' in resultado:
+                print(f"   Vehículos: {len(resultado['rutas_vehiculos'])}")
             
             # Mostrar ruta con nombres
-            ruta_nombres = [datos_df.iloc[nodo]['Nombre'] for nodo in resultado['ruta']]
-            ruta_str = ' - '.join(ruta_nombres)
+            ruta_str = ' - '.join(nombres[resultado['ruta']])
             print(f"   Ruta: {ruta_str}")
         
         print(f"\n COSTO TOTAL OPTIMIZADO: {costo_total:.2f}")
         print(f" Rutas optimizadas para {len(resultados_zonas)} zonas")
     
     @staticmethod
-    def guardar_resultados_archivo(resultados_zonas, costo_total, datos_df, archivo=None):
+    def guardar_resultados_archivo(resultados_zonas, costo_total, datos_df, archivo=None,
+                                   archivo_json=None, segundos_total=None):
+        # Escribe el reporte de texto y, junto a el, los mismos resultados en JSON
         archivo = archivo or ARCHIVO_RESULTADOS
+        nombres = datos_df['Nombre'].to_numpy()
         
         try:
             with open(archivo, 'w', encoding=ENCODING_ARCHIVO) as f:
@@ -35,23 +46,110 @@ class ResultadosManager:
                 for zona_id, resultado in resultados_zonas.items():
                     f.write(f"ZONA: {resultado['centro']}\n")
                     f.write(f"Tiendas: {resultado['tiendas_count']}\n")
+                    if resultado.get('costo_inicial') is not None:
+                        f.write(f"Costo inicial: {ResultadosManager.formatear_costo_inicial(resultado)}\n")
                     f.write(f"Costo: {resultado['costo']:.2f}\n")
+                    if resultado.get('cota_inferior') is not None:
+                        f.write(f"Cota inferior: {ResultadosManager.formatear_cota(resultado)}\n")
                     f.write(f"Capacidad: {resultado['capacidad_total']:,}\n")
                     
                     # Escribir ruta con nombres
-                    ruta_nombres = [datos_df.iloc[nodo]['Nombre'] for nodo in resultado['ruta']]
-                    ruta_str = ' → '.join(ruta_nombres)
+                    ruta_str = ' → '.join(nombres[resultado['ruta']])
                     f.write(f"Ruta: {ruta_str}\n")
                     f.write("-" * 50 + "\n")
                 
                 f.write(f"\nCOSTO TOTAL: {costo_total:.2f}\n")
             
             print(f"\n Resultados guardados en: '{archivo}'")
-            return archivo
             
         except Exception as e:
             print(f" Error al guardar resultados: {e}")
             return None
+        
+        ResultadosManager.guardar_resultados_json(
+            resultados_zonas, costo_total, datos_df, archivo_json, segundos_total
+        )
+        return archivo
+    
+    @staticmethod
+    def formatear_costo_inicial(resultado):
+        # "inicial (mejora x%)" con la mejora (inicial - costo) / inicial de la zona
+        costo_inicial = resultado['costo_inicial']
+        texto = f"{costo_inicial:.2f}"
+        if costo_inicial <= 0:
+            return texto
+        return f"{texto} (mejora {(costo_inicial - resultado['costo']) / costo_inicial:.2%})"
+    
+    @staticmethod
+    def formatear_cota(resultado):
+        # "cota (brecha x%)" con la brecha (costo - cota) / cota de la zona
+        brecha = CotaInferior.brecha(resultado['costo'], resultado['cota_inferior'])
+        texto = f"{resultado['cota_inferior']:.2f}"
+        return texto if brecha is None else f"{texto} (brecha {brecha:.2%})"
+    
+    @staticmethod
+    def resultados_a_dict(resultados_zonas, costo_total, datos_df, segundos_total=None):
+        # Estructura serializable: rutas como indices de nodo (filas de datos_df)
+        # y tambien con nombres, que sobreviven a cambios en la red
+        nombres = datos_df['Nombre'].to_numpy()
+        zonas = []
+        for zona_id, resultado in resultados_zonas.items():
+            ruta = [int(nodo) for nodo in resultado['ruta']]
+            zona = {
+                'zona_id': int(zona_id),
+                'centro': resultado['centro'],
+                'centro_id': ruta[0],
+                'tiendas': int(resultado['tiendas_count']),
+                'costo': float(resultado['costo']),
+                'costo_inicial': resultado.get('costo_inicial'),
+                'capacidad': int(resultado['capacidad_total']),
+                'segundos': resultado.get('segundos'),
+                'cota_inferior': resultado.get('cota_inferior'),
+                'brecha': CotaInferior.brecha(resultado['costo'], resultado.get('cota_inferior')),
+                'ruta': ruta,
+                'ruta_nombres': nombres[ruta].tolist()
+            }
+            if 'estadisticas' in resultado:
+                zona['estadisticas'] = resultado['estadisticas'].a_dict()
+            if 'rutas_vehiculos' in resultado:
+                zona['rutas_vehiculos'] = [
+                    [int(nodo) for nodo in ruta_vehiculo] for ruta_vehiculo in resultado['rutas_vehiculos']
+                ]
+            zonas.append(zona)
+        return {
+            'costo_total': float(costo_total),
+            'segundos_total': segundos_total,
+            'zonas': zonas
+        }
+    
+    @staticmethod
+    def guardar_resultados_json(resultados_zonas, costo_total, datos_df, archivo=None,
+                                segundos_total=None):
+        archivo = archivo or ARCHIVO_RESULTADOS_JSON
+        try:
+            datos = ResultadosManager.resultados_a_dict(
+                resultados_zonas, costo_total, datos_df, segundos_total
+            )
+            with open(archivo, 'w', encoding=ENCODING_ARCHIVO) as f:
+                json.dump(datos, f, ensure_ascii=False, indent=1)
+            print(f" Resultados estructurados guardados en: '{archivo}'")
+            return archivo
+        except Exception as e:
+            print(f" Error al guardar resultados JSON: {e}")
+            return None
+    
+    @staticmethod
+    def cargar_resultados_json(archivo=None):
+        # Devuelve el dict de resultados_a_dict, o None si no existe o no se puede leer
+        archivo = archivo or ARCHIVO_RESULTADOS_JSON
+        try:
+            with open(archivo, 'r', encoding=ENCODING_ARCHIVO) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (ValueError, OSError) as e:
+            print(f" Error al leer resultados JSON '{archivo}': {e}")
+            return None
     
     @staticmethod
     def mostrar_resumen_estadisticas(resumen):
@@ -66,6 +164,10 @@ class ResultadosManager:
         print(f"Total de tiendas: {resumen['total_tiendas']}")
         print(f"Capacidad total: {resumen['total_capacidad']:,}")
         print(f"Costo total: {resumen['costo_total']:.2f}")
+        if resumen.get('cota_inferior_total') is not None:
+            brecha = CotaInferior.brecha(resumen['costo_total'], resumen['cota_inferior_total'])
+            print(f"Cota inferior total: {resumen['cota_inferior_total']:.2f}"
+                  + ("" if brecha is None else f" (brecha {brecha:.2%})"))
         print(f"Costo promedio por zona: {resumen['costo_promedio_por_zona']:.2f}")
 
 
@@ -0,0 +1,32 @@
+import numpy as np
+
+# Filas de la matriz que se procesan a la vez al buscar vecinos, para acotar
+# la memoria temporal en zonas muy grandes
+TAM_BLOQUE_CANDIDATOS = 1024
+
+
+def calcular_vecinos_candidatos(matriz_costos, nodos, k):
+    # Para cada nodo de la zona devuelve sus k vecinos de menor costo dentro
+    # de la misma zona: {nodo: [vecino_mas_cercano, ...]}
+    nodos = np.asarray(nodos)
+    k = min(k, len(nodos) - 1)
+    candidatos = {}
+    if k <= 0:
+        return candidatos
+
+    for inicio in range(0, len(nodos), TAM_BLOQUE_CANDIDATOS):
+        bloque = nodos[inicio:inicio + TAM_BLOQUE_CANDIDATOS]
+        costos = np.array(matriz_costos[np.ix_(bloque, nodos)], dtype=np.float64)
+
+        # Un nodo no es candidato de si mismo
+        filas = np.arange(len(bloque))
+        costos[filas, filas + inicio] = np.inf
+
+        cercanos = np.argpartition(costos, k - 1, axis=1)[:, :k]
+        orden = np.argsort(np.take_along_axis(costos, cercanos, axis=1), axis=1)
+        cercanos = np.take_along_axis(cercanos, orden, axis=1)
+
+        for fila, nodo in enumerate(bloque.tolist()):
+            candidatos[nodo] = nodos[cercanos[fila]].tolist()
+
+    return candidatos